@@ -0,0 +1,251 @@
+"""
+Inverses Problem: maximal zulässige ERP pro Antenne bzw. Frequenzband.
+
+Aus dem Feldcache einer Analyse (physics.field_cache) gilt an jedem Punkt p
+
+    E_p² = a_p · Σ_i ERP_i · u_pi,   a_p = 10^(-Dämpfung_p/10)
+
+Wird die ERP einer Antennengruppe g mit dem Faktor s skaliert, bleibt
+E_p < T genau dann, wenn
+
+    s · a_p · Σ_{i∈g} ERP_i · u_pi  <  T² − a_p · Σ_{i∉g} ERP_i · u_pi
+
+Der grösste zulässige Faktor ist das Minimum dieser Schranke über alle
+Punkte (vektorisiert über die (N, A)-Matrix). Der Punkt, an dem das
+Minimum angenommen wird, ist der massgebende Punkt.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+import csv
+import numpy as np
+
+from ..physics.field_cache import FIELD_CACHE_FILENAME, FieldCache
+
+
+@dataclass
+class MaxErpResult:
+    """Maximal zulässige ERP einer Antennengruppe"""
+    group: str  # z.B. "Antenne 3" oder "Band 3600"
+    antenna_ids: List[int]
+    erp_watts: float  # Aktuelle ERP der Gruppe (Summe) [W]
+    max_scale: float  # Grösster zulässiger Skalierungsfaktor (inf = unbegrenzt)
+    binding_index: int  # Massgebender Punkt (-1 = keiner)
+    binding_building_id: str
+    binding_xyz: Optional[np.ndarray]  # (3,) [E, N, H]
+    e_field_vm: float  # Aktuelle Feldstärke am massgebenden Punkt [V/m]
+
+    @property
+    def max_erp_watts(self) -> float:
+        """Maximal zulässige ERP der Gruppe (Summe) [W]"""
+        return self.max_scale * self.erp_watts
+
+    @property
+    def headroom_db(self) -> float:
+        """Reserve gegenüber der aktuellen ERP [dB] (negativ = überschritten)"""
+        if self.max_scale <= 0:
+            return -np.inf
+        return 10.0 * np.log10(self.max_scale)
+
+
+def antenna_groups(cache: FieldCache, per: str = "antenna") -> Dict[str, List[int]]:
+    """
+    Gruppiert die Antennen des Caches.
+
+    Args:
+        per: "antenna" (jede Antenne einzeln), "band" (gemeinsam pro
+             Frequenzband) oder "all" (alle Antennen gemeinsam)
+    """
+    antenna_ids = cache.antenna_ids.tolist()
+
+    if per == "antenna":
+        return {f"Antenne {ant_id}": [ant_id] for ant_id in antenna_ids}
+    if per == "all":
+        return {"Alle Antennen": antenna_ids}
+    if per == "band":
+        groups: Dict[str, List[int]] = {}
+        for ant_id, type_band in zip(antenna_ids, cache.antenna_types):
+            band = type_band.split("|", 1)[-1]
+            groups.setdefault(f"Band {band}", []).append(ant_id)
+        return groups
+
+    raise ValueError(f"Unbekannte Gruppierung: {per}")
+
+
+def solve_max_erp(
+    cache: FieldCache,
+    groups: Dict[str, List[int]],
+    threshold_vm: Optional[float] = None,
+) -> List[MaxErpResult]:
+    """
+    Grösster ERP-Faktor pro Gruppe, bei dem kein Punkt threshold_vm erreicht.
+
+    Die übrigen Antennen behalten ihre ERP. Punkte ohne LOS-Prüfung gelten
+    als ungedämpft (wie im what-if-Szenario).
+
+    Args:
+        cache: Feldcache einer Analyse
+        groups: Gruppenname -> Antennen-IDs (siehe antenna_groups())
+        threshold_vm: Schwellwert [V/m] (None = Schwellwert der Analyse)
+
+    Returns:
+        MaxErpResult pro Gruppe
+    """
+    threshold_vm = cache.threshold_vm if threshold_vm is None else threshold_vm
+
+    # Dämpfungsfaktor a_pi = 10^(-dB/10) auf E² pro Antenne (nur für Dämpfung > 0)
+    attenuation_db = cache.building_atten
+    factor = np.where(attenuation_db > 0, 10.0 ** (-attenuation_db / 10.0), 1.0)
+
+    # Gedämpfte E²-Beiträge bei aktueller ERP: (N, A)
+    e2_contrib = cache.e2_unit * cache.erp_watts * factor
+    e2_total = e2_contrib.sum(axis=1)
+    column = {ant_id: col for col, ant_id in enumerate(cache.antenna_ids.tolist())}
+
+    solutions = []
+    for name, antenna_ids in groups.items():
+        cols = [column[ant_id] for ant_id in antenna_ids]
+        group_erp = float(cache.erp_watts[cols].sum())
+
+        # Für Gruppen ohne ERP (alle 0 W) wird je 1 W pro Antenne angesetzt
+        if group_erp > 0:
+            group_e2 = e2_contrib[:, cols].sum(axis=1)
+        else:
+            group_e2 = (cache.e2_unit[:, cols] * factor[:, cols]).sum(axis=1)
+            group_erp = float(len(cols))
+
+        rest_e2 = e2_total - e2_contrib[:, cols].sum(axis=1)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bound = np.where(
+                group_e2 > 0,
+                (threshold_vm**2 - rest_e2) / group_e2,
+                np.inf,
+            )
+
+        if len(bound) and np.isfinite(bound).any():
+            binding = int(np.argmin(bound))
+            scale = max(float(bound[binding]), 0.0)
+            solutions.append(MaxErpResult(
+                group=name,
+                antenna_ids=list(antenna_ids),
+                erp_watts=group_erp,
+                max_scale=scale,
+                binding_index=binding,
+                binding_building_id=cache.building_ids[cache.building_index[binding]],
+                binding_xyz=cache.xyz[binding],
+                e_field_vm=float(np.sqrt(e2_total[binding])),
+            ))
+        else:
+            solutions.append(MaxErpResult(
+                group=name,
+                antenna_ids=list(antenna_ids),
+                erp_watts=group_erp,
+                max_scale=np.inf,
+                binding_index=-1,
+                binding_building_id="",
+                binding_xyz=None,
+                e_field_vm=0.0,
+            ))
+
+    return solutions
+
+
+def export_max_erp_csv(solutions: List[MaxErpResult], output_path: Path) -> None:
+    """Exportiert die maximal zulässigen ERP-Werte als CSV."""
+    fieldnames = [
+        "group",
+        "antenna_ids",
+        "erp_watts",
+        "max_scale",
+        "max_erp_watts",
+        "headroom_db",
+        "binding_building_id",
+        "binding_x",
+        "binding_y",
+        "binding_z",
+        "binding_e_field_vm",
+    ]
+
+    with open(output_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+
+        for s in solutions:
+            x, y, z = s.binding_xyz.tolist() if s.binding_xyz is not None else ("", "", "")
+            writer.writerow({
+                "group": s.group,
+                "antenna_ids": " ".join(str(ant_id) for ant_id in s.antenna_ids),
+                "erp_watts": f"{s.erp_watts:.1f}",
+                "max_scale": f"{s.max_scale:.4f}",
+                "max_erp_watts": f"{s.max_erp_watts:.1f}",
+                "headroom_db": f"{s.headroom_db:.2f}",
+                "binding_building_id": s.binding_building_id,
+                "binding_x": f"{x:.2f}" if x != "" else "",
+                "binding_y": f"{y:.2f}" if y != "" else "",
+                "binding_z": f"{z:.2f}" if z != "" else "",
+                "binding_e_field_vm": f"{s.e_field_vm:.4f}",
+            })
+
+    print(f"Max-ERP exportiert: {output_path}")
+
+
+def main(argv: Optional[List[str]] = None):
+    """CLI-Einstiegspunkt für 'max-erp'."""
+    import argparse
+    from ..utils import error_and_exit
+
+    parser = argparse.ArgumentParser(
+        prog="emf_hotspot max-erp",
+        description="Maximal zulässige ERP pro Antenne/Band aus dem Feldcache einer Analyse",
+    )
+    parser.add_argument(
+        "analysis_dir",
+        type=Path,
+        help=f"Ausgabeverzeichnis einer Analyse (enthält {FIELD_CACHE_FILENAME})",
+    )
+    parser.add_argument(
+        "--per",
+        choices=["antenna", "band", "all"],
+        default="antenna",
+        help="antenna: jede Antenne einzeln (default); band: gemeinsam pro Frequenzband; all: alle gemeinsam",
+    )
+    parser.add_argument(
+        "-t", "--threshold",
+        type=float,
+        default=None,
+        help="Schwellwert in V/m (default: wie Analyse)",
+    )
+
+    args = parser.parse_args(argv)
+
+    cache_file = args.analysis_dir / FIELD_CACHE_FILENAME
+    if not cache_file.exists():
+        error_and_exit(
+            f"Kein Feldcache gefunden: {cache_file}\n"
+            f"Bitte zuerst eine vollständige Analyse für diesen Standort ausführen."
+        )
+
+    cache = FieldCache.load(cache_file)
+    threshold_vm = cache.threshold_vm if args.threshold is None else args.threshold
+    solutions = solve_max_erp(cache, antenna_groups(cache, args.per), threshold_vm)
+
+    print(f"\nMaximal zulässige ERP (E < {threshold_vm} V/m an allen {len(cache)} Punkten):")
+    print(f"  {'Gruppe':<16} {'ERP [W]':>9} {'max. ERP [W]':>13} {'Reserve':>9}  Massgebender Punkt")
+    for s in solutions:
+        if s.binding_index < 0:
+            print(f"  {s.group:<16} {s.erp_watts:>9.1f} {'unbegrenzt':>13}")
+            continue
+        x, y, z = s.binding_xyz.tolist()
+        print(
+            f"  {s.group:<16} {s.erp_watts:>9.1f} {s.max_erp_watts:>13.1f} {s.headroom_db:>7.2f}dB"
+            f"  {s.binding_building_id} ({x:.1f}, {y:.1f}, {z:.1f}), E={s.e_field_vm:.2f} V/m"
+        )
+        if s.max_scale <= 0:
+            print(f"  {'':<16} WARNUNG: Schwellwert auch ohne diese Gruppe überschritten")
+
+    if any(s.binding_index >= 0 and not cache.los_checked[s.binding_index] for s in solutions):
+        print("  Hinweis: Massgebende Punkte ohne LOS-Prüfung gelten als ungedämpft (konservativ).")
+
+    export_max_erp_csv(solutions, args.analysis_dir / f"max_erp_{args.per}.csv")
@@ -18,6 +18,50 @@ E_FIELD_CONSTANT = 49.0  # Schweizer NISV-Standard
 DEFAULT_RESOLUTION_M = 1.0  # Fassaden-Raster in Metern (von 0.5m erhöht für bessere Performance)
 DEFAULT_RADIUS_M = 200.0  # Suchradius um Antenne (von 100m erhöht für mehr Gebäude)
 MIN_DISTANCE_M = 0.1  # Minimaler Abstand (verhindert Division durch 0)
+ANTENNA_POSITION_TOLERANCE_M = 0.01  # Antennen näher als dies teilen Abstand/Winkel zu den Punkten
+
+# Antennendiagramm-Lookup-Tabellen (periodisches Winkelraster 0-360°)
+PATTERN_LUT_RESOLUTION_DEG = 0.1
+
+# Worst-Case-Tilt-Suche
+TILT_STEP_DEG = 1.0  # Schrittweite im Tilt-Bereich (< 1° = Sub-Grad-Suche)
+TILT_ENVELOPE_RESOLUTION_DEG = 0.05  # Elevationsraster der vorberechneten Tilt-Hüllkurve
+
+# Worst-Case-Azimut-Suche (nur Antennen mit Azimut-Bereich in der StDB)
+AZIMUTH_STEP_DEG = 1.0  # Schrittweite im Azimut-Bereich
+AZIMUTH_ENVELOPE_RESOLUTION_DEG = 0.1  # Azimutraster der vorberechneten H-Hüllkurve
+
+# Strahlschwenk adaptiver Antennen (--beam-sweep, nur is_adaptive=True)
+ADAPTIVE_SCAN_AZIMUTH_DEG = 60.0  # Schwenkbereich ± um die Hauptstrahlrichtung (ohne Azimut-Bereich)
+ADAPTIVE_STEER_STEP_DEG = 1.0  # Schrittweite der Schwenkrichtungen
+ADAPTIVE_ENVELOPE_RESOLUTION_DEG = 0.5  # Azimut- und Elevationsraster der 2D-Hüllkurve
+ADAPTIVE_ELEMENT_BEAMWIDTH_DEG = 0.0  # 3dB-Breite Einzelelement für Scanverlust (0 = ohne, konservativ)
+ADAPTIVE_ELEMENT_MAX_ATTENUATION_DB = 30.0  # Maximaler Scanverlust
+
+# Volumen-Modus (3D-Feldgitter um den Standort)
+VOLUME_RESOLUTION_M = 2.0  # Gitterabstand
+VOLUME_HEIGHT_M = 50.0  # Vertikale Ausdehnung ab Basishöhe
+VOLUME_BLOCK_SIZE = 250_000  # Gitterpunkte pro Berechnungsblock
+
+# Adaptive Fassaden-Abtastung (Verfeinerung um den Grenzwert)
+ADAPTIVE_COARSE_RESOLUTION_M = 4.0  # Blockgrösse der gröbsten Ebene
+ADAPTIVE_REFINE_BAND = 1.0  # Verfeinern ab Obergrenze >= Band × Schwellwert (<= 1: exakt)
+
+# Gebäude-Screening (Obergrenze pro Gebäude vor der Feldberechnung)
+SCREENING_FRACTION = 0.5  # Gebäude mit Obergrenze < Anteil × Schwellwert gelten als unkritisch
+
+# Sichtlinien (LOS) über BVH der Gebäudedreiecke
+LOS_BVH_LEAF_SIZE = 8  # Dreiecke pro Blatt
+LOS_RAY_CHUNK = 4096  # Sichtlinien pro Abfrageblock (begrenzt Kandidaten-Arrays)
+LOS_PAIR_CHUNK = 1_000_000  # Paare (Sichtlinie, Dreieck) pro Block im dichten Schnitttest
+LOS_BUFFER_RESOLUTION_DEG = 0.25  # Zellgrösse des Tiefenpuffers (los_mode="buffer")
+LOS_BUFFER_DEPTH_TOLERANCE_M = 0.5  # Flächen näher als dies am Punkt → exakte Prüfung über die BVH
+LOS_DSM_RESOLUTION_M = 0.5  # Zellgrösse des Oberflächenrasters (los_mode="dsm")
+LOS_PARALLEL_MIN_RAYS = 20_000  # Darunter werden die Sichtlinien seriell geprüft (Pool-Overhead)
+
+# Terrain-Abschattung (swissALTI3D, --terrain-los)
+TERRAIN_LOS_ATTENUATION_DB = 20.0  # Dämpfung einer durch das Gelände abgeschatteten Sichtlinie [dB]
+TERRAIN_LOS_MARGIN_M = 4.0  # Horizontaler Abstand zu Antenne/Punkt ohne Terrainprüfung [m]
 
 
 # swissBUILDINGS3D API
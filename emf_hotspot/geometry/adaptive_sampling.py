@@ -0,0 +1,314 @@
+"""
+Adaptive Fassaden-Abtastung um den Grenzwert.
+
+Die Fassaden werden auf demselben Raster wie in facade_sampling.py
+aufgespannt (gleiche Punkte, gleiche Reihenfolge), aber nicht alle
+Rasterpunkte werden berechnet. Stattdessen:
+
+1. Das Raster jeder Fläche wird in Blöcke von 2^k × 2^k Rasterzellen
+   (≈ Grobauflösung, z.B. 4 m) zerlegt; pro Block wird ein Rasterpunkt
+   nahe der Blockmitte berechnet.
+2. Für jeden Block wird eine konservative Obergrenze der Feldstärke
+   bestimmt (physics.field_bounds). Nur Blöcke, deren Grenze
+   band × min(Schwellwert, bisheriges Maximum) erreicht, werden geviertelt.
+3. Schritt 1-2 wird ebenenweise (breadth-first) bis zur Zielauflösung
+   wiederholt; die Punkte jeder Ebene werden in einem Batch berechnet.
+
+Mit band <= 1 wird jeder Punkt ≥ Schwellwert und der Maximalpunkt auf
+der feinsten Ebene berechnet: Hotspot-Anzahl und Maximum entsprechen
+dem dichten Raster.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+from ..config import ADAPTIVE_COARSE_RESOLUTION_M, ADAPTIVE_REFINE_BAND, AGW_LIMIT_VM
+from ..models import (
+    AntennaPattern,
+    AntennaSystem,
+    FacadePointArray,
+    WallSurface,
+    SURFACE_ROOF,
+    SURFACE_WALL,
+)
+from ..physics.field_bounds import FieldUpperBound
+from ..physics.field_engine import FieldBatch, calculate_field_batch
+from ..physics.tilt_envelope import build_tilt_envelopes
+from ..physics.adaptive_envelope import AdaptiveEnvelope
+from .facade_sampling import _surface_lattice
+
+
+@dataclass
+class FacadeLattice:
+    """Rasterpunkte mit ihrer Position im Flächenraster"""
+    points: FacadePointArray  # Alle Rasterpunkte (wie beim dichten Sampling)
+    surface_index: np.ndarray  # (N,) int32 laufende Flächennummer
+    lattice_u: np.ndarray  # (N,) int32 Rasterindex entlang u (horizontal)
+    lattice_v: np.ndarray  # (N,) int32 Rasterindex entlang v (vertikal)
+
+    @classmethod
+    def empty(cls) -> "FacadeLattice":
+        empty_index = np.zeros(0, dtype=np.int32)
+        return cls(FacadePointArray.empty(), empty_index, empty_index, empty_index)
+
+    @classmethod
+    def from_points(cls, points: FacadePointArray) -> "FacadeLattice":
+        """Einzelpunkte ohne Flächenraster (jeder Punkt ist eine eigene Fläche)"""
+        n_points = len(points)
+        return cls(
+            points=points,
+            surface_index=np.arange(n_points, dtype=np.int32),
+            lattice_u=np.zeros(n_points, dtype=np.int32),
+            lattice_v=np.zeros(n_points, dtype=np.int32),
+        )
+
+    @classmethod
+    def concatenate(cls, lattices: List["FacadeLattice"]) -> "FacadeLattice":
+        """Fügt Raster zusammen (Flächennummern werden fortlaufend verschoben)"""
+        lattices = [lattice for lattice in lattices if len(lattice) > 0]
+        if not lattices:
+            return cls.empty()
+
+        surface_index = []
+        offset = 0
+        for lattice in lattices:
+            surface_index.append(lattice.surface_index + offset)
+            offset += int(lattice.surface_index.max()) + 1
+
+        return cls(
+            points=FacadePointArray.concatenate([lattice.points for lattice in lattices]),
+            surface_index=np.concatenate(surface_index).astype(np.int32),
+            lattice_u=np.concatenate([lattice.lattice_u for lattice in lattices]),
+            lattice_v=np.concatenate([lattice.lattice_v for lattice in lattices]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def __getitem__(self, key) -> "FacadeLattice":
+        """Boolesche Maske / Indexarray -> gefiltertes Raster"""
+        return FacadeLattice(
+            points=self.points[key],
+            surface_index=self.surface_index[key],
+            lattice_u=self.lattice_u[key],
+            lattice_v=self.lattice_v[key],
+        )
+
+
+@dataclass
+class AdaptiveFieldResult:
+    """Ergebnis der adaptiven Berechnung"""
+    points: FacadePointArray  # Berechnete Rasterpunkte (Teilmenge, Rasterreihenfolge)
+    batch: FieldBatch  # Feldstärken der berechneten Punkte
+    n_lattice_points: int  # Anzahl Punkte des dichten Rasters
+    n_levels: int  # Anzahl Verfeinerungsebenen
+
+
+def _lattice_surfaces(
+    surfaces: List[WallSurface],
+    resolution: float,
+    building_id: str,
+    surface_kind: int,
+) -> FacadeLattice:
+    """Raster aller Flächen eines Typs (eine Flächennummer pro Fläche)"""
+    lattices = []
+
+    for surface in surfaces:
+        sampled = _surface_lattice(surface, resolution, skip_horizontal=(surface_kind == SURFACE_WALL))
+        if sampled is None:
+            continue
+
+        xyz, normal, lattice_u, lattice_v = sampled
+        lattices.append(FacadeLattice(
+            points=FacadePointArray.from_surface(xyz, normal, building_id, surface_kind),
+            surface_index=np.zeros(len(xyz), dtype=np.int32),
+            lattice_u=lattice_u,
+            lattice_v=lattice_v,
+        ))
+
+    return FacadeLattice.concatenate(lattices)
+
+
+def lattice_all_facades(
+    wall_surfaces: List[WallSurface],
+    resolution: float = 0.5,
+    building_id: str = "",
+) -> FacadeLattice:
+    """
+    Raster aller Fassaden eines Gebäudes (Punkte wie sample_all_facades()).
+    """
+    return _lattice_surfaces(wall_surfaces, resolution, building_id, SURFACE_WALL)
+
+
+def lattice_all_roofs(
+    roof_surfaces: List[WallSurface],
+    resolution: float = 0.5,
+    building_id: str = "",
+) -> FacadeLattice:
+    """
+    Raster aller Dachflächen eines Gebäudes (Punkte wie sample_all_roofs()).
+    """
+    return _lattice_surfaces(roof_surfaces, resolution, building_id, SURFACE_ROOF)
+
+
+def filter_lattice_by_distance(
+    lattice: FacadeLattice,
+    center_e: float,
+    center_n: float,
+    max_distance: float,
+) -> FacadeLattice:
+    """
+    Filtert Rasterpunkte nach horizontalem Abstand zum Zentrum.
+    """
+    points = lattice.points
+    dist = np.sqrt((points.x - center_e) ** 2 + (points.y - center_n) ** 2)
+    return lattice[dist <= max_distance]
+
+
+def _block_groups(
+    lattice: FacadeLattice,
+    indices: np.ndarray,
+    block_size: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Gruppiert Rasterpunkte in Blöcke von block_size × block_size Zellen.
+
+    Returns:
+        (order, starts, representatives):
+        - order: indices nach Block sortiert
+        - starts: Beginn jedes Blocks in order
+        - representatives: Rasterpunkt nächst der Blockmitte pro Block
+    """
+    surface = lattice.surface_index[indices].astype(np.int64)
+    lattice_u = lattice.lattice_u[indices].astype(np.int64)
+    lattice_v = lattice.lattice_v[indices].astype(np.int64)
+
+    block_u = lattice_u // block_size
+    block_v = lattice_v // block_size
+
+    # Abstand zur Blockmitte in Rasterzellen (Gleichstand: kleinster Index)
+    center = (block_size - 1) / 2.0
+    to_center = (
+        np.abs(lattice_u - block_u * block_size - center)
+        + np.abs(lattice_v - block_v * block_size - center)
+    )
+
+    order = np.lexsort((indices, to_center, block_v, block_u, surface))
+    sorted_keys = np.stack([surface[order], block_u[order], block_v[order]], axis=1)
+    new_block = np.ones(len(order), dtype=bool)
+    new_block[1:] = np.any(sorted_keys[1:] != sorted_keys[:-1], axis=1)
+    starts = np.flatnonzero(new_block)
+
+    order = indices[order]
+    return order, starts, order[starts]
+
+
+def calculate_field_adaptive(
+    lattice: FacadeLattice,
+    antenna_system: AntennaSystem,
+    patterns: dict[Tuple[str, str], AntennaPattern],
+    resolution_m: float,
+    threshold_vm: float = AGW_LIMIT_VM,
+    coarse_resolution_m: float = ADAPTIVE_COARSE_RESOLUTION_M,
+    refine_band: float = ADAPTIVE_REFINE_BAND,
+    parallel: bool = False,
+    n_workers: Optional[int] = None,
+    adaptive_envelopes: Optional[Dict[int, AdaptiveEnvelope]] = None,
+) -> AdaptiveFieldResult:
+    """
+    Berechnet das Feld adaptiv auf einem Fassadenraster.
+
+    Args:
+        lattice: Raster aus lattice_all_facades()/lattice_all_roofs()
+        antenna_system: System mit allen Antennen
+        patterns: Dictionary der Antennendiagramme
+        resolution_m: Auflösung des Rasters (feinste Ebene) [m]
+        threshold_vm: Schwellwert [V/m]
+        coarse_resolution_m: Blockgrösse der gröbsten Ebene [m]
+        refine_band: Blöcke mit Obergrenze >= band × min(Schwellwert, Maximum)
+                     werden verfeinert (<= 1 erhält Hotspots und Maximum exakt)
+        parallel: Ebenen mit calculate_field_batch_parallel() rechnen
+        n_workers: Anzahl Worker (None = CPU-Kerne)
+        adaptive_envelopes: Strahlschwenk-Hüllkurven adaptiver Antennen (None = kein Strahlschwenk)
+
+    Returns:
+        AdaptiveFieldResult mit den berechneten Punkten und ihrem FieldBatch
+    """
+    n_lattice = len(lattice)
+    tilt_envelopes = build_tilt_envelopes(antenna_system, patterns)
+
+    if parallel:
+        from ..physics.summation_parallel import calculate_field_batch_parallel
+
+    def evaluate(xyz: np.ndarray) -> FieldBatch:
+        if parallel:
+            return calculate_field_batch_parallel(
+                xyz, antenna_system, patterns,
+                n_workers=n_workers, tilt_envelopes=tilt_envelopes,
+                adaptive_envelopes=adaptive_envelopes,
+            )
+        return calculate_field_batch(
+            xyz, antenna_system, patterns, tilt_envelopes=tilt_envelopes,
+            adaptive_envelopes=adaptive_envelopes,
+        )
+
+    if n_lattice == 0:
+        return AdaptiveFieldResult(lattice.points, evaluate(lattice.points.xyz), 0, 0)
+
+    upper_bound = FieldUpperBound(antenna_system, patterns, tilt_envelopes, adaptive_envelopes)
+
+    # Blockgrössen 2^k, ..., 2, 1 (Rasterzellen pro Blockkante)
+    levels = max(0, int(round(np.log2(max(coarse_resolution_m / resolution_m, 1.0)))))
+    block_sizes = [1 << level for level in range(levels, -1, -1)]
+
+    xyz = lattice.points.xyz
+    e_values = np.zeros(n_lattice)
+    evaluated = np.zeros(n_lattice, dtype=bool)
+    evaluated_indices = []
+    batches = []
+    running_max = 0.0
+
+    active = np.arange(n_lattice)
+
+    for block_size in block_sizes:
+        order, starts, representatives = _block_groups(lattice, active, block_size)
+
+        # Repräsentanten dieser Ebene berechnen (bereits berechnete wiederverwenden)
+        new = representatives[~evaluated[representatives]]
+        if len(new):
+            batch = evaluate(xyz[new])
+            e_values[new] = batch.e_total
+            evaluated[new] = True
+            evaluated_indices.append(new)
+            batches.append(batch)
+
+        running_max = max(running_max, float(e_values[representatives].max()))
+
+        if block_size == 1:
+            break
+
+        # Obergrenze pro Block über die Bounding-Box seiner Rasterpunkte
+        block_xyz = xyz[order]
+        box_min = np.minimum.reduceat(block_xyz, starts, axis=0)
+        box_max = np.maximum.reduceat(block_xyz, starts, axis=0)
+        bound = upper_bound.for_boxes(box_min, box_max)
+
+        points_per_block = np.diff(np.append(starts, len(order)))
+        refine = (bound >= refine_band * min(threshold_vm, running_max)) & (points_per_block > 1)
+
+        active = order[np.repeat(refine, points_per_block)]
+        if len(active) == 0:
+            break
+
+    # Berechnete Punkte in Rasterreihenfolge
+    evaluated_indices = np.concatenate(evaluated_indices)
+    batch = FieldBatch.concatenate(batches)
+    sort = np.argsort(evaluated_indices)
+
+    return AdaptiveFieldResult(
+        points=lattice.points[evaluated_indices[sort]],
+        batch=batch.take(sort),
+        n_lattice_points=n_lattice,
+        n_levels=len(block_sizes),
+    )
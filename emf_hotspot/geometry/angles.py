@@ -106,6 +106,44 @@ def calculate_relative_angles(
     return distance_3d, rel_azimuth, rel_elevation
 
 
+def calculate_point_angles_batch(
+    antenna_pos: LV95Coordinate,
+    points_xyz: np.ndarray,  # (N, 3) [E, N, H]
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vektorisierte Variante für viele Punkte: Distanz, absoluter Azimut und
+    absolute Elevation aller Punkte von einer Antennenposition aus.
+
+    Gleiche Konventionen wie calculate_azimuth() / calculate_elevation().
+
+    Args:
+        antenna_pos: Position der Antenne (LV95)
+        points_xyz: Array (N, 3) der Zielpunkte [E, N, H]
+
+    Returns:
+        Tuple von Arrays (N,):
+        - distance_3d: 3D-Abstand [m]
+        - azimuth: Absoluter Azimut [0, 360)°
+        - elevation: Elevation [-90, 90]°
+    """
+    dx = points_xyz[:, 0] - antenna_pos.e
+    dy = points_xyz[:, 1] - antenna_pos.n
+    dz = points_xyz[:, 2] - antenna_pos.h
+
+    horizontal_distance = np.sqrt(dx**2 + dy**2)
+    distance_3d = np.sqrt(dx**2 + dy**2 + dz**2)
+
+    azimuth = np.degrees(np.arctan2(dx, dy)) % 360.0
+
+    # Zu nahe Punkte (senkrecht über/unter der Antenne): ±90° bzw. 0°
+    elevation = np.degrees(np.arctan2(dz, horizontal_distance))
+    too_close = horizontal_distance < 0.001
+    if np.any(too_close):
+        elevation = np.where(too_close, 90.0 * np.sign(dz), elevation)
+
+    return distance_3d, azimuth, elevation
+
+
 def normalize_azimuth(angle: float) -> float:
     """Normalisiert Azimut auf [0, 360)."""
     return angle % 360.0
@@ -0,0 +1,297 @@
+"""
+Bounding Volume Hierarchy (BVH) über die Gebäudedreiecke für LOS-Abfragen.
+
+check_line_of_sight_3d() prüft pro Sichtlinie jede Wand jedes Gebäudes
+und trianguliert die Wandpolygone bei jedem Aufruf neu. Die BVH wird
+einmal pro Lauf aus allen Wand- (optional Dach-) Dreiecken aufgebaut;
+jedes Dreieck trägt den Index seines Gebäudes. Abfragen laufen
+vektorisiert über viele Sichtlinien gleichzeitig: Paare (Sichtlinie,
+Knoten) werden ebenenweise gegen die Knoten-Boxen getestet, bis nur noch
+Paare (Sichtlinie, Dreieck) übrig sind. Erst diese Kandidaten werden
+exakt (vektorisiert, Möller-Trumbore aus ray_triangle.py) geprüft.
+
+Konventionen wie check_line_of_sight_3d(): Fan-Triangulation um den
+ersten Polygon-Vertex, Treffer bei 1e-6 < t <= Länge der Sichtlinie,
+ein Gebäude zählt einmal, egal wie viele seiner Dreiecke getroffen werden.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+
+from ..config import LOS_BVH_LEAF_SIZE, LOS_RAY_CHUNK
+from ..models import Building
+from .ray_triangle import building_triangles, segment_triangle_hits
+
+
+# Toleranz der Box-Tests [m] (konservativ: lieber ein Kandidat zu viel)
+_BOX_MARGIN_M = 1e-6
+
+
+@dataclass
+class TriangleBVH:
+    """Flache BVH (Arrays) über Gebäudedreiecke"""
+    triangles: np.ndarray  # (T, 3, 3) Dreiecks-Vertices, nach Blättern sortiert
+    triangle_building: np.ndarray  # (T,) Index in buildings
+    buildings: List[Building]  # Gebäude in Indexreihenfolge
+    building_key: np.ndarray  # (B,) Code der Gebäude-ID (gleiche ID = gleicher Code)
+    node_min: np.ndarray  # (K, 3) Untere Box-Ecke pro Knoten
+    node_max: np.ndarray  # (K, 3) Obere Box-Ecke pro Knoten
+    node_left: np.ndarray  # (K,) Linkes Kind (-1 = Blatt)
+    node_right: np.ndarray  # (K,) Rechtes Kind (-1 = Blatt)
+    node_start: np.ndarray  # (K,) Erstes Dreieck eines Blatts
+    node_count: np.ndarray  # (K,) Anzahl Dreiecke eines Blatts (0 = innerer Knoten)
+    include_roofs: bool = False  # Dachflächen als Hindernis enthalten
+
+    def __len__(self) -> int:
+        return len(self.triangles)
+
+    @classmethod
+    def from_buildings(
+        cls,
+        buildings: Sequence[Building],
+        include_roofs: bool = False,
+        leaf_size: int = LOS_BVH_LEAF_SIZE,
+    ) -> "TriangleBVH":
+        """
+        Baut die BVH aus den Wandflächen (optional auch Dachflächen) der Gebäude.
+
+        Args:
+            buildings: Gebäude (Index = Position in der Liste)
+            include_roofs: Dachflächen ebenfalls als Hindernis aufnehmen
+                           (check_line_of_sight_3d prüft nur Wände)
+            leaf_size: Maximale Anzahl Dreiecke pro Blatt
+
+        Returns:
+            TriangleBVH
+        """
+        buildings = list(buildings)
+        triangles, owner = building_triangles(buildings, include_roofs)
+
+        building_key = building_keys(buildings)
+
+        order, nodes = _build_nodes(triangles, leaf_size)
+
+        return cls(
+            triangles=triangles[order],
+            triangle_building=owner[order],
+            buildings=buildings,
+            building_key=building_key,
+            include_roofs=include_roofs,
+            **nodes,
+        )
+
+    def candidate_pairs(
+        self,
+        origins: np.ndarray,
+        ends: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Paare (Sichtlinie, Dreieck), deren Blatt-Box die Sichtlinie schneidet.
+
+        Args:
+            origins: (M, 3) Startpunkte
+            ends: (M, 3) Endpunkte
+
+        Returns:
+            (ray_index, triangle_index) - Kandidaten für den exakten Test
+        """
+        origins = np.asarray(origins, dtype=float).reshape(-1, 3)
+        ends = np.asarray(ends, dtype=float).reshape(-1, 3)
+
+        if len(self) == 0 or len(origins) == 0:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+
+        # Segment-Parameter s in [0, 1]; Achsen ohne Ausdehnung über ±inf
+        direction = ends - origins
+        safe = np.where(direction == 0.0, 1e-300, direction)
+        inverse = 1.0 / safe
+
+        ray_parts = []
+        triangle_parts = []
+
+        rays = np.arange(len(origins), dtype=np.intp)
+        nodes = np.zeros(len(origins), dtype=np.intp)
+
+        while len(rays):
+            with np.errstate(over="ignore", invalid="ignore"):
+                t_low = (self.node_min[nodes] - _BOX_MARGIN_M - origins[rays]) * inverse[rays]
+                t_high = (self.node_max[nodes] + _BOX_MARGIN_M - origins[rays]) * inverse[rays]
+            t_enter = np.minimum(t_low, t_high).max(axis=1)
+            t_exit = np.maximum(t_low, t_high).min(axis=1)
+            hit = (t_enter <= t_exit) & (t_exit >= 0.0) & (t_enter <= 1.0)
+
+            rays, nodes = rays[hit], nodes[hit]
+            leaf = self.node_count[nodes] > 0
+
+            # Blätter: alle Dreiecke des Blatts als Kandidaten
+            leaf_rays, leaf_nodes = rays[leaf], nodes[leaf]
+            counts = self.node_count[leaf_nodes]
+            if len(counts):
+                starts = np.repeat(self.node_start[leaf_nodes], counts)
+                offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+                ray_parts.append(np.repeat(leaf_rays, counts))
+                triangle_parts.append(starts + offsets)
+
+            # Innere Knoten: beide Kinder in die nächste Ebene
+            inner_rays, inner_nodes = rays[~leaf], nodes[~leaf]
+            rays = np.concatenate([inner_rays, inner_rays])
+            nodes = np.concatenate([self.node_left[inner_nodes], self.node_right[inner_nodes]])
+
+        if not ray_parts:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+
+        return np.concatenate(ray_parts), np.concatenate(triangle_parts)
+
+    def blocking_pairs(
+        self,
+        origins: np.ndarray,
+        ends: np.ndarray,
+        exclude_building_ids: Optional[Sequence[str]] = None,
+        ray_chunk: int = LOS_RAY_CHUNK,
+        exclude_key: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Blockierende Gebäude pro Sichtlinie.
+
+        Args:
+            origins: (M, 3) oder (3,) Startpunkte (z.B. Antennenposition)
+            ends: (M, 3) Endpunkte (Messpunkte)
+            exclude_building_ids: (M,) Gebäude-ID pro Sichtlinie, deren Flächen
+                                  nicht zählen (eigenes Gebäude des Messpunkts)
+            ray_chunk: Sichtlinien pro Block
+            exclude_key: (M,) Gebäude-Code pro Sichtlinie statt exclude_building_ids
+                         (siehe id_keys(), -1 = nichts ausschliessen)
+
+        Returns:
+            (ray_index, building_index) - eindeutige Paare, sortiert nach Sichtlinie
+        """
+        ends = np.asarray(ends, dtype=float).reshape(-1, 3)
+        origins = np.broadcast_to(np.asarray(origins, dtype=float).reshape(-1, 3), ends.shape)
+
+        if exclude_key is None:
+            exclude_key = self._exclude_keys(exclude_building_ids, len(origins))
+
+        ray_parts = []
+        building_parts = []
+
+        for start in range(0, len(origins), max(1, ray_chunk)):
+            stop = min(start + ray_chunk, len(origins))
+            chunk_origins = origins[start:stop]
+            chunk_ends = ends[start:stop]
+
+            # Wie check_line_of_sight_3d: Punkte (fast) senkrecht über/unter
+            # dem Startpunkt gelten als frei
+            horizontal = np.linalg.norm(chunk_ends[:, :2] - chunk_origins[:, :2], axis=1)
+            active = np.flatnonzero(horizontal >= 0.01)
+
+            rays, triangles = self.candidate_pairs(chunk_origins[active], chunk_ends[active])
+            rays = active[rays]
+
+            buildings = self.triangle_building[triangles]
+            keep = self.building_key[buildings] != exclude_key[start + rays]
+            rays, triangles, buildings = rays[keep], triangles[keep], buildings[keep]
+
+            hit = segment_triangle_hits(chunk_origins[rays], chunk_ends[rays], self.triangles[triangles])
+
+            pairs = np.unique(np.stack([rays[hit] + start, buildings[hit]], axis=1), axis=0)
+            ray_parts.append(pairs[:, 0])
+            building_parts.append(pairs[:, 1])
+
+        if not ray_parts:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+
+        return np.concatenate(ray_parts), np.concatenate(building_parts)
+
+    def _exclude_keys(self, building_ids: Optional[Sequence[str]], n_rays: int) -> np.ndarray:
+        """(M,) Gebäude-Code pro Sichtlinie (-1 = nichts ausschliessen)"""
+        return exclude_keys(self.buildings, self.building_key, building_ids, n_rays)
+
+
+def building_keys(buildings: Sequence[Building]) -> np.ndarray:
+    """(B,) Code der Gebäude-ID pro Gebäude (gleiche ID = gleicher Code)"""
+    _, building_key = np.unique([b.id for b in buildings], return_inverse=True)
+    return np.asarray(building_key, dtype=np.intp).reshape(-1)
+
+
+def exclude_keys(
+    buildings: Sequence[Building],
+    building_key: np.ndarray,
+    building_ids: Optional[Sequence[str]],
+    n_rays: int,
+) -> np.ndarray:
+    """(M,) Gebäude-Code der auszuschliessenden Gebäude-ID pro Sichtlinie (-1 = keine)"""
+    if building_ids is None:
+        return np.full(n_rays, -1, dtype=np.intp)
+
+    return id_keys(buildings, building_key, building_ids)
+
+
+def id_keys(
+    buildings: Sequence[Building],
+    building_key: np.ndarray,
+    building_ids: Sequence[str],
+) -> np.ndarray:
+    """
+    Gebäude-Code pro Gebäude-ID (-1 = nicht in buildings).
+
+    Mit einer ID-Tabelle (z.B. ResultTable.building_ids) und dem Index pro
+    Punkt ergibt id_keys(...)[building_index] den Code pro Sichtlinie, ohne
+    pro Punkt nach der ID zu suchen.
+    """
+    key_by_id = {b.id: int(key) for b, key in zip(buildings, building_key)}
+    return np.array([key_by_id.get(b_id, -1) for b_id in building_ids], dtype=np.intp).reshape(-1)
+
+
+def _build_nodes(triangles: np.ndarray, leaf_size: int) -> Tuple[np.ndarray, dict]:
+    """
+    Top-down-Aufbau: Median-Teilung entlang der längsten Achse der Schwerpunkte.
+
+    Returns:
+        (Dreiecks-Reihenfolge, Knoten-Arrays für TriangleBVH)
+    """
+    n_triangles = len(triangles)
+    order = np.arange(n_triangles, dtype=np.intp)
+    centroids = triangles.mean(axis=1) if n_triangles else np.zeros((0, 3))
+    tri_min = triangles.min(axis=1) if n_triangles else np.zeros((0, 3))
+    tri_max = triangles.max(axis=1) if n_triangles else np.zeros((0, 3))
+
+    node_min, node_max = [], []
+    node_left, node_right, node_start, node_count = [], [], [], []
+
+    def new_node(start: int, stop: int) -> int:
+        indices = order[start:stop]
+        node_min.append(tri_min[indices].min(axis=0) if len(indices) else np.zeros(3))
+        node_max.append(tri_max[indices].max(axis=0) if len(indices) else np.zeros(3))
+        node_left.append(-1)
+        node_right.append(-1)
+        node_start.append(start)
+        node_count.append(stop - start)
+        return len(node_min) - 1
+
+    stack = [(new_node(0, n_triangles), 0, n_triangles)]
+    while stack:
+        node, start, stop = stack.pop()
+        if stop - start <= leaf_size:
+            continue
+
+        indices = order[start:stop]
+        extent = centroids[indices].max(axis=0) - centroids[indices].min(axis=0)
+        axis = int(np.argmax(extent))
+        middle = (stop - start) // 2
+        split = np.argpartition(centroids[indices, axis], middle)
+        order[start:stop] = indices[split]
+
+        left = new_node(start, start + middle)
+        right = new_node(start + middle, stop)
+        node_left[node], node_right[node], node_count[node] = left, right, 0
+        stack.extend([(left, start, start + middle), (right, start + middle, stop)])
+
+    return order, dict(
+        node_min=np.array(node_min, dtype=float).reshape(-1, 3),
+        node_max=np.array(node_max, dtype=float).reshape(-1, 3),
+        node_left=np.array(node_left, dtype=np.intp),
+        node_right=np.array(node_right, dtype=np.intp),
+        node_start=np.array(node_start, dtype=np.intp),
+        node_count=np.array(node_count, dtype=np.intp),
+    )
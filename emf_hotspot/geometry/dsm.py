@@ -0,0 +1,273 @@
+"""
+2.5D-Oberflächenmodell (DSM) für schnelle LOS-Abfragen (los_mode="dsm").
+
+Die Gebäude werden als Prismen in ein E/N-Raster gebrannt: pro Zelle die
+Oberflächenhöhe (Dach bzw. Gebäudeoberkante) und das Gebäude. Eine
+Sichtlinie wird in Schritten von einer halben Zellgrösse abgetastet; jede Stichprobe unter der Oberfläche einer Gebäudezelle zählt
+dieses Gebäude als blockierend (jedes Gebäude einmal, wie bei
+calculate_building_attenuation()).
+
+Genauigkeit: Überhänge, Durchgänge und Wände zwischen zwei Stichproben
+werden nicht aufgelöst, und die Zellen direkt an Start- und Endpunkt
+werden übersprungen (Antenne/Messpunkt liegen an einer Fassade). Dafür
+kostet eine Sichtlinie nur O(Länge / Zellgrösse) Rasterzugriffe,
+unabhängig von der Anzahl Gebäudeflächen.
+
+Die Terrain-Abschattung ist unabhängig vom Verfahren (terrain.TerrainGrid).
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+
+from ..config import LOS_DSM_RESOLUTION_M, LOS_PAIR_CHUNK
+from ..models import Building
+from .bvh import building_keys, exclude_keys
+from .ray_triangle import fan_triangles, item_blocks
+
+
+@dataclass
+class BuildingDSM:
+    """Rasterisiertes Oberflächenmodell der Gebäude"""
+    origin: np.ndarray  # (2,) E, N der unteren linken Rasterecke
+    cell_size_m: float  # Zellgrösse [m]
+    surface: np.ndarray  # (ny, nx) Gebäudeoberkante [m ü.M.] (-inf = kein Gebäude)
+    building: np.ndarray  # (ny, nx) Gebäudeindex (-1 = kein Gebäude)
+    buildings: List[Building]  # Gebäude in Indexreihenfolge
+    building_key: np.ndarray  # (B,) Code der Gebäude-ID (gleiche ID = gleicher Code)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.surface.shape
+
+    @classmethod
+    def from_buildings(
+        cls,
+        buildings: Sequence[Building],
+        cell_size_m: float = LOS_DSM_RESOLUTION_M,
+        pair_chunk: int = LOS_PAIR_CHUNK,
+    ) -> "BuildingDSM":
+        """
+        Brennt die Gebäude in ein Raster über ihre Ausdehnung.
+
+        Gebäude mit Dachflächen werden über die projizierten Dachdreiecke
+        gerastert (Höhe linear interpoliert), Gebäude ohne Dach (z.B.
+        virtuelle Gebäude) über den Grundriss mit der maximalen Wandhöhe.
+
+        Args:
+            buildings: Gebäude (Index = Position in der Liste)
+            cell_size_m: Zellgrösse [m]
+            pair_chunk: Maximale Anzahl Paare (Dreieck, Zelle) pro Block
+
+        Returns:
+            BuildingDSM
+        """
+        buildings = list(buildings)
+        building_key = building_keys(buildings)
+
+        # Prismen als Dreiecke im Grundriss (Höhe pro Ecke)
+        triangles, owner = _prism_triangles(buildings)
+
+        if len(triangles):
+            low = triangles[..., :2].reshape(-1, 2).min(axis=0) - cell_size_m
+            high = triangles[..., :2].reshape(-1, 2).max(axis=0) + cell_size_m
+        else:
+            low = high = np.zeros(2)
+        nx, ny = np.maximum(np.ceil((high - low) / cell_size_m).astype(int), 1)
+
+        surface = np.full((ny, nx), -np.inf)
+        building = np.full((ny, nx), -1, dtype=np.intp)
+
+        cells, heights, owners = _rasterize_triangles(triangles, owner, low, cell_size_m, nx, ny, pair_chunk)
+
+        # Höchstes Gebäude pro Zelle
+        order = np.lexsort((heights, cells))
+        cells, heights, owners = cells[order], heights[order], owners[order]
+        last = np.r_[cells[1:] != cells[:-1], True] if len(cells) else np.zeros(0, dtype=bool)
+        surface.flat[cells[last]] = heights[last]
+        building.flat[cells[last]] = owners[last]
+
+        return cls(
+            origin=low,
+            cell_size_m=float(cell_size_m),
+            surface=surface,
+            building=building,
+            buildings=buildings,
+            building_key=building_key,
+        )
+
+    def blocking_pairs(
+        self,
+        origins: np.ndarray,
+        ends: np.ndarray,
+        exclude_building_ids: Optional[Sequence[str]] = None,
+        pair_chunk: int = LOS_PAIR_CHUNK,
+        exclude_key: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Blockierende Gebäude pro Sichtlinie durch Abtasten des Rasters.
+
+        Args:
+            origins: (M, 3) oder (3,) Startpunkte (z.B. Antennenposition)
+            ends: (M, 3) Endpunkte (Messpunkte)
+            exclude_building_ids: (M,) Gebäude-ID pro Sichtlinie, die nicht zählt
+            pair_chunk: Maximale Anzahl Stichproben pro Block
+            exclude_key: (M,) Gebäude-Code pro Sichtlinie statt exclude_building_ids
+
+        Returns:
+            (ray_index, building_index) - eindeutige Paare, sortiert nach Sichtlinie
+        """
+        ends = np.asarray(ends, dtype=float).reshape(-1, 3)
+        origins = np.broadcast_to(np.asarray(origins, dtype=float).reshape(-1, 3), ends.shape)
+        if exclude_key is None:
+            exclude_key = exclude_keys(self.buildings, self.building_key, exclude_building_ids, len(ends))
+
+        horizontal = np.linalg.norm(ends[:, :2] - origins[:, :2], axis=1)
+
+        # Start und Richtung in Zelleinheiten
+        grid_start = (origins[:, :2] - self.origin) / self.cell_size_m
+        grid_delta = (ends[:, :2] - origins[:, :2]) / self.cell_size_m
+        z_start = origins[:, 2]
+        z_delta = ends[:, 2] - origins[:, 2]
+
+        # Stichproben bei s = (k + 0.5) / n, höchstens eine halbe Zelle
+        # auseinander; Zellen an Start und Ende auslassen, senkrechte
+        # Sichtlinien (wie check_line_of_sight_3d) frei
+        n_samples = np.where(horizontal >= 0.01, np.ceil(2.0 * horizontal / self.cell_size_m), 0)
+        margin = np.where(n_samples > 0, self.cell_size_m * n_samples / np.maximum(horizontal, 0.01), 0.0)
+        k_first = np.floor(margin - 0.5).astype(np.intp) + 1
+        k_last = (n_samples - 1 - k_first).astype(np.intp)
+        n_samples = n_samples.astype(np.intp)
+        counts = np.maximum(k_last - k_first + 1, 0)
+
+        surface = self.surface.ravel()
+        building_flat = self.building.ravel()
+        n_buildings = max(len(self.building_key), 1)
+        ny, nx = self.shape
+        ray_parts, building_parts = [], []
+
+        for block in item_blocks(counts, pair_chunk):
+            block_counts = counts[block]
+            ray = np.repeat(block, block_counts)
+            k = np.arange(block_counts.sum()) - np.repeat(np.cumsum(block_counts) - block_counts, block_counts)
+            s = (k + k_first[ray] + 0.5) / n_samples[ray]
+
+            ix = np.floor(grid_start[ray, 0] + s * grid_delta[ray, 0]).astype(np.intp)
+            iy = np.floor(grid_start[ray, 1] + s * grid_delta[ray, 1]).astype(np.intp)
+            inside = (ix >= 0) & (ix < nx) & (iy >= 0) & (iy < ny)
+            cell = np.where(inside, iy * nx + ix, 0)
+
+            # Höhe nur für Stichproben in Gebäudezellen prüfen
+            candidate = np.flatnonzero(inside & (building_flat[cell] >= 0))
+            ray, s, cell = ray[candidate], s[candidate], cell[candidate]
+            building = building_flat[cell]
+            below = (
+                (z_start[ray] + s * z_delta[ray] < surface[cell])
+                & (self.building_key[building] != exclude_key[ray])
+            )
+
+            pair_key = np.unique(ray[below].astype(np.int64) * n_buildings + building[below])
+            rays, buildings = np.divmod(pair_key, n_buildings)
+            ray_parts.append(rays.astype(np.intp))
+            building_parts.append(buildings.astype(np.intp))
+
+        if not ray_parts:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+
+        return np.concatenate(ray_parts), np.concatenate(building_parts)
+
+
+def _prism_triangles(buildings: Sequence[Building]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Grundriss-Dreiecke mit Höhe pro Ecke: Dachflächen bzw. Grundriss auf Wandoberkante.
+
+    Returns:
+        (triangles (T, 3, 3), triangle_building (T,))
+    """
+    from .line_of_sight import _extract_building_footprint
+
+    parts = []
+    owners = []
+
+    for index, building in enumerate(buildings):
+        roofs = [r.vertices for r in building.roof_surfaces if r.vertices is not None and len(r.vertices) >= 3]
+
+        if roofs:
+            triangles = np.concatenate([fan_triangles(vertices) for vertices in roofs])
+        else:
+            footprint = _extract_building_footprint(building)
+            if not footprint:
+                continue
+            top = max(float(np.max(w.vertices[:, 2])) for w in building.wall_surfaces if w.vertices is not None and len(w.vertices))
+            vertices = np.column_stack([np.asarray(footprint, dtype=float), np.full(len(footprint), top)])
+            triangles = fan_triangles(vertices)
+
+        parts.append(triangles)
+        owners.append(np.full(len(triangles), index, dtype=np.intp))
+
+    if not parts:
+        return np.zeros((0, 3, 3)), np.zeros(0, dtype=np.intp)
+
+    return np.concatenate(parts), np.concatenate(owners)
+
+
+def _rasterize_triangles(
+    triangles: np.ndarray,
+    owner: np.ndarray,
+    low: np.ndarray,
+    cell_size_m: float,
+    nx: int,
+    ny: int,
+    pair_chunk: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Zellmitten innerhalb der projizierten Dreiecke mit interpolierter Höhe.
+
+    Returns:
+        (cell (P,) flacher Zellindex, height (P,), building (P,))
+    """
+    if len(triangles) == 0:
+        return np.zeros(0, dtype=np.intp), np.zeros(0), np.zeros(0, dtype=np.intp)
+
+    # Zellbereich pro Dreieck (Mitten im Grundriss-Rechteck)
+    xy = triangles[..., :2]
+    i_from = np.maximum(np.ceil((xy[..., 0].min(axis=1) - low[0]) / cell_size_m - 0.5), 0).astype(np.intp)
+    i_to = np.minimum(np.floor((xy[..., 0].max(axis=1) - low[0]) / cell_size_m - 0.5), nx - 1).astype(np.intp)
+    j_from = np.maximum(np.ceil((xy[..., 1].min(axis=1) - low[1]) / cell_size_m - 0.5), 0).astype(np.intp)
+    j_to = np.minimum(np.floor((xy[..., 1].max(axis=1) - low[1]) / cell_size_m - 0.5), ny - 1).astype(np.intp)
+    n_i = np.maximum(i_to - i_from + 1, 0)
+    n_j = np.maximum(j_to - j_from + 1, 0)
+
+    # Projiziert entartete Dreiecke (z.B. senkrechte Dachteile) tragen nichts bei
+    e1 = xy[:, 1] - xy[:, 0]
+    e2 = xy[:, 2] - xy[:, 0]
+    det = e1[:, 0] * e2[:, 1] - e1[:, 1] * e2[:, 0]
+    n_pairs = np.where(np.abs(det) > 1e-12, n_i * n_j, 0)
+
+    cell_parts, height_parts, owner_parts = [], [], []
+
+    for block in item_blocks(n_pairs, pair_chunk):
+        counts = n_pairs[block]
+        tri = np.repeat(block, counts)
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        i = i_from[tri] + local % n_i[tri]
+        j = j_from[tri] + local // n_i[tri]
+
+        # Baryzentrische Koordinaten der Zellmitte
+        px = low[0] + (i + 0.5) * cell_size_m - xy[tri, 0, 0]
+        py = low[1] + (j + 0.5) * cell_size_m - xy[tri, 0, 1]
+        u = (px * e2[tri, 1] - py * e2[tri, 0]) / det[tri]
+        v = (py * e1[tri, 0] - px * e1[tri, 1]) / det[tri]
+        inside = (u >= 0.0) & (v >= 0.0) & (u + v <= 1.0)
+
+        z = triangles[tri, :, 2]
+        height = z[:, 0] + u * (z[:, 1] - z[:, 0]) + v * (z[:, 2] - z[:, 0])
+
+        cell_parts.append((j * nx + i)[inside])
+        height_parts.append(height[inside])
+        owner_parts.append(owner[tri[inside]])
+
+    if not cell_parts:
+        return np.zeros(0, dtype=np.intp), np.zeros(0), np.zeros(0, dtype=np.intp)
+
+    return np.concatenate(cell_parts), np.concatenate(height_parts), np.concatenate(owner_parts)
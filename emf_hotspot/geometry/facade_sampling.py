@@ -2,17 +2,24 @@
 Fassaden-Sampling: Erzeugt Rasterpunkte auf Gebäudefassaden
 """
 
-from typing import List
+from typing import List, Optional, Tuple, Union
 import numpy as np
 
-from ..models import FacadePoint, WallSurface
+from ..models import (
+    FacadePoint,
+    FacadePointArray,
+    WallSurface,
+    SURFACE_OMEN,
+    SURFACE_ROOF,
+    SURFACE_WALL,
+)
 
 
 def sample_facade_polygon(
     wall_surface: WallSurface,
     resolution: float = 0.5,
     building_id: str = "",
-) -> List[FacadePoint]:
+) -> FacadePointArray:
     """
     Erzeugt Raster-Punkte auf einer Fassaden-Polygon.
 
@@ -22,67 +29,21 @@ def sample_facade_polygon(
         building_id: Gebäude-ID für die erzeugten Punkte
 
     Returns:
-        Liste von FacadePoint
+        FacadePointArray (Flächentyp SURFACE_WALL)
     """
-    vertices = wall_surface.vertices
+    sampled = _surface_lattice(wall_surface, resolution, skip_horizontal=True)
+    if sampled is None:
+        return FacadePointArray.empty()
 
-    if len(vertices) < 3:
-        return []
-
-    # Flächennormale berechnen
-    normal = _calculate_normal(vertices)
-    if normal is None:
-        return []
-
-    # Prüfen ob Fassade vertikal genug ist (nicht Dach)
-    # |normal.z| > 0.7 bedeutet zu horizontal (Dach oder Boden)
-    if abs(normal[2]) > 0.7:
-        return []
-
-    # Lokales Koordinatensystem der Fassade
-    u, v = _create_local_coordinate_system(normal)
-
-    # Projektion auf lokale Ebene
-    origin = vertices[0]
-    local_coords = np.array([
-        [np.dot(vtx - origin, u), np.dot(vtx - origin, v)]
-        for vtx in vertices
-    ])
-
-    # Bounding-Box in lokalen Koordinaten
-    min_u, max_u = local_coords[:, 0].min(), local_coords[:, 0].max()
-    min_v, max_v = local_coords[:, 1].min(), local_coords[:, 1].max()
-
-    # Raster erstellen
-    points = []
-    u_coords = np.arange(min_u + resolution / 2, max_u, resolution)
-    v_coords = np.arange(min_v + resolution / 2, max_v, resolution)
-
-    for u_val in u_coords:
-        for v_val in v_coords:
-            local_pt = np.array([u_val, v_val])
-
-            # Point-in-Polygon Test
-            if _point_in_polygon(local_pt, local_coords):
-                # Zurück in 3D transformieren
-                world_pt = origin + u_val * u + v_val * v
-
-                points.append(FacadePoint(
-                    building_id=building_id,
-                    x=world_pt[0],
-                    y=world_pt[1],
-                    z=world_pt[2],
-                    normal=normal.copy(),
-                ))
-
-    return points
+    xyz, normal, _, _ = sampled
+    return FacadePointArray.from_surface(xyz, normal, building_id, SURFACE_WALL)
 
 
 def sample_roof_polygon(
     roof_surface: WallSurface,
     resolution: float = 0.5,
     building_id: str = "",
-) -> List[FacadePoint]:
+) -> FacadePointArray:
     """
     Erzeugt Raster-Punkte auf einer Dachfläche.
 
@@ -92,24 +53,57 @@ def sample_roof_polygon(
         building_id: Gebäude-ID für die erzeugten Punkte
 
     Returns:
-        Liste von FacadePoint
+        FacadePointArray (Flächentyp SURFACE_ROOF)
     """
-    vertices = roof_surface.vertices
+    # WICHTIG: Keine Vertikalitätsprüfung mehr!
+    # Giebelwände können fälschlicherweise als RoofSurface klassifiziert sein,
+    # sind aber vertikal → müssen trotzdem gesamplet werden (Dachgeschosswohnungen!)
+    # Wir samplen ALLE als "Roof" markierten Flächen, egal ob vertikal oder horizontal.
+    sampled = _surface_lattice(roof_surface, resolution, skip_horizontal=False)
+    if sampled is None:
+        return FacadePointArray.empty()
+
+    xyz, normal, _, _ = sampled
+    return FacadePointArray.from_surface(xyz, normal, building_id, SURFACE_ROOF)
+
+
+def _surface_lattice(
+    surface: WallSurface,
+    resolution: float,
+    skip_horizontal: bool,
+) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Rasterpunkte einer Fläche (Rastermitten innerhalb des Polygons).
+
+    Das ganze (u, v)-Raster der Fläche wird auf einmal aufgespannt, gegen alle
+    Polygonkanten getestet und zurück nach LV95 transformiert (gleiche
+    Rechenreihenfolge wie die frühere Schleife pro Rasterzelle, d.h.
+    bitgleiche Punkte).
+
+    Args:
+        surface: Fläche mit Polygon-Vertices
+        resolution: Rasterweite in Metern
+        skip_horizontal: Zu horizontale Flächen (|normal.z| > 0.7) überspringen
+
+    Returns:
+        (xyz (K, 3), normal (3,), lattice_u (K,), lattice_v (K,)) oder None ohne Punkte
+    """
+    vertices = surface.vertices
 
     if len(vertices) < 3:
-        return []
+        return None
 
     # Flächennormale berechnen
     normal = _calculate_normal(vertices)
     if normal is None:
-        return []
+        return None
 
-    # WICHTIG: Keine Vertikalitätsprüfung mehr!
-    # Giebelwände können fälschlicherweise als RoofSurface klassifiziert sein,
-    # sind aber vertikal → müssen trotzdem gesamplet werden (Dachgeschosswohnungen!)
-    # Wir samplen ALLE als "Roof" markierten Flächen, egal ob vertikal oder horizontal.
+    # Prüfen ob Fassade vertikal genug ist (nicht Dach)
+    # |normal.z| > 0.7 bedeutet zu horizontal (Dach oder Boden)
+    if skip_horizontal and abs(normal[2]) > 0.7:
+        return None
 
-    # Verwende gleichen Algorithmus wie für Fassaden
+    # Lokales Koordinatensystem der Fläche
     u, v = _create_local_coordinate_system(normal)
 
     # Projektion auf lokale Ebene
@@ -123,59 +117,55 @@ def sample_roof_polygon(
     min_u, max_u = local_coords[:, 0].min(), local_coords[:, 0].max()
     min_v, max_v = local_coords[:, 1].min(), local_coords[:, 1].max()
 
-    # Raster erstellen
-    points = []
     u_coords = np.arange(min_u + resolution / 2, max_u, resolution)
     v_coords = np.arange(min_v + resolution / 2, max_v, resolution)
 
-    for u_val in u_coords:
-        for v_val in v_coords:
-            local_pt = np.array([u_val, v_val])
+    # Raster in Reihenfolge u aussen, v innen
+    lattice_u, lattice_v = np.meshgrid(
+        np.arange(len(u_coords)), np.arange(len(v_coords)), indexing="ij"
+    )
+    lattice_u = lattice_u.ravel()
+    lattice_v = lattice_v.ravel()
+    local_points = np.column_stack([u_coords[lattice_u], v_coords[lattice_v]])
 
-            # Point-in-Polygon Test
-            if _point_in_polygon(local_pt, local_coords):
-                # Zurück in 3D transformieren
-                world_pt = origin + u_val * u + v_val * v
+    inside = _points_in_polygon(local_points, local_coords)
+    if not inside.any():
+        return None
 
-                points.append(FacadePoint(
-                    building_id=building_id,
-                    x=world_pt[0],
-                    y=world_pt[1],
-                    z=world_pt[2],
-                    normal=normal.copy(),
-                ))
+    # Zurück in 3D transformieren (origin + u_val * u + v_val * v)
+    u_values = local_points[inside, 0:1]
+    v_values = local_points[inside, 1:2]
+    xyz = origin + u_values * u + v_values * v
 
-    return points
+    return xyz, normal, lattice_u[inside].astype(np.int32), lattice_v[inside].astype(np.int32)
 
 
 def sample_all_facades(
     wall_surfaces: List[WallSurface],
     resolution: float = 0.5,
     building_id: str = "",
-) -> List[FacadePoint]:
+) -> FacadePointArray:
     """
     Erzeugt Rasterpunkte auf allen Fassaden eines Gebäudes.
     """
-    all_points = []
-    for wall in wall_surfaces:
-        points = sample_facade_polygon(wall, resolution, building_id)
-        all_points.extend(points)
-    return all_points
+    return FacadePointArray.concatenate([
+        sample_facade_polygon(wall, resolution, building_id)
+        for wall in wall_surfaces
+    ])
 
 
 def sample_all_roofs(
     roof_surfaces: List[WallSurface],
     resolution: float = 0.5,
     building_id: str = "",
-) -> List[FacadePoint]:
+) -> FacadePointArray:
     """
     Erzeugt Rasterpunkte auf allen Dachflächen eines Gebäudes.
     """
-    all_points = []
-    for roof in roof_surfaces:
-        points = sample_roof_polygon(roof, resolution, building_id)
-        all_points.extend(points)
-    return all_points
+    return FacadePointArray.concatenate([
+        sample_roof_polygon(roof, resolution, building_id)
+        for roof in roof_surfaces
+    ])
 
 
 def _calculate_normal(vertices: np.ndarray) -> np.ndarray:
@@ -224,56 +214,56 @@ def _create_local_coordinate_system(normal: np.ndarray) -> tuple[np.ndarray, np.
     return u, v
 
 
-def _point_in_polygon(point: np.ndarray, polygon: np.ndarray) -> bool:
+def _points_in_polygon(points: np.ndarray, polygon: np.ndarray) -> np.ndarray:
     """
-    Ray-Casting-Algorithmus für Point-in-Polygon-Test.
+    Ray-Casting-Algorithmus (gerade/ungerade Kreuzungen) für viele Punkte.
+
+    Pro Kante werden alle Punkte gleichzeitig getestet (Zwischenarrays der
+    Grösse K statt K × N, auch bei Dachflächen mit vielen Kanten).
 
     Args:
-        point: 2D-Punkt [x, y]
+        points: (K, 2) 2D-Punkte [x, y]
         polygon: Array von 2D-Polygon-Vertices (N, 2)
 
     Returns:
-        True wenn Punkt innerhalb des Polygons liegt
+        (K,) bool - True wenn Punkt innerhalb des Polygons liegt
     """
-    n = len(polygon)
-    inside = False
+    px = points[:, 0]
+    py = points[:, 1]
+    inside = np.zeros(len(points), dtype=bool)
 
-    j = n - 1
-    for i in range(n):
+    j = len(polygon) - 1
+    for i in range(len(polygon)):
         yi, yj = polygon[i, 1], polygon[j, 1]
         xi, xj = polygon[i, 0], polygon[j, 0]
 
-        if ((yi > point[1]) != (yj > point[1])) and (
-            point[0] < (xj - xi) * (point[1] - yi) / (yj - yi + 1e-10) + xi
-        ):
-            inside = not inside
+        inside ^= ((yi > py) != (yj > py)) & (
+            px < (xj - xi) * (py - yi) / (yj - yi + 1e-10) + xi
+        )
         j = i
 
     return inside
 
 
 def filter_points_by_distance(
-    points: List[FacadePoint],
+    points: Union[FacadePointArray, List[FacadePoint]],
     center_e: float,
     center_n: float,
     max_distance: float,
-) -> List[FacadePoint]:
+) -> FacadePointArray:
     """
     Filtert Punkte nach horizontalem Abstand zum Zentrum.
     """
-    filtered = []
-    for p in points:
-        dist = np.sqrt((p.x - center_e) ** 2 + (p.y - center_n) ** 2)
-        if dist <= max_distance:
-            filtered.append(p)
-    return filtered
+    points = FacadePointArray.from_points(points)
+    dist = np.sqrt((points.x - center_e) ** 2 + (points.y - center_n) ** 2)
+    return points[dist <= max_distance]
 
 
 def create_virtual_omen_points(
     omen_locations: list,
     buildings: list,
     resolution_m: float = 1.0,
-) -> List[FacadePoint]:
+) -> FacadePointArray:
     """
     Erstellt virtuelle Messpunkte für Bauplatz-OMENs (OMENs ohne Gebäudezuordnung).
 
@@ -289,10 +279,10 @@ def create_virtual_omen_points(
         resolution_m: Abstand zwischen Messpunkten (für mehrere Höhen)
 
     Returns:
-        Liste von FacadePoint für nicht zugeordnete OMENs
+        FacadePointArray (Flächentyp SURFACE_OMEN) für nicht zugeordnete OMENs
     """
     if not omen_locations:
-        return []
+        return FacadePointArray.empty()
 
     # Building-Map für schnellen Zugriff
     building_map = {}
@@ -359,27 +349,26 @@ def create_virtual_omen_points(
             unassigned_omens.append(omen)
 
     # Erstelle virtuelle Messpunkte für nicht zugeordnete OMENs
+    # Messpunkte in verschiedenen Richtungen (N, E, S, W)
+    # für konservative Worst-Case-Abschätzung
+    normals = np.array([
+        [0.0, 1.0, 0.0],  # Nord
+        [1.0, 0.0, 0.0],  # Ost
+        [0.0, -1.0, 0.0],  # Süd
+        [-1.0, 0.0, 0.0],  # West
+    ])
+
     virtual_points = []
 
     for omen in unassigned_omens:
-        # Erstelle Messpunkte in verschiedenen Richtungen (N, E, S, W)
-        # für konservative Worst-Case-Abschätzung
-        normals = [
-            np.array([0.0, 1.0, 0.0]),  # Nord
-            np.array([1.0, 0.0, 0.0]),  # Ost
-            np.array([0.0, -1.0, 0.0]),  # Süd
-            np.array([-1.0, 0.0, 0.0]),  # West
-        ]
-
         # Erstelle Punkte an der OMEN-Höhe (direkt aus StDB)
         # Diese Höhe ist bereits die geplante Messpunkthöhe
-        for normal in normals:
-            virtual_points.append(FacadePoint(
-                building_id=f"BAUPLATZ_OMEN_O{omen.nr}",
-                x=omen.position.e,
-                y=omen.position.n,
-                z=omen.position.h,  # Direkt aus StDB
-                normal=normal,
-            ))
-
-    return virtual_points
+        position = [omen.position.e, omen.position.n, omen.position.h]
+        virtual_points.append(FacadePointArray.from_surface(
+            np.tile(position, (len(normals), 1)),
+            normals,
+            f"BAUPLATZ_OMEN_O{omen.nr}",
+            SURFACE_OMEN,
+        ))
+
+    return FacadePointArray.concatenate(virtual_points)
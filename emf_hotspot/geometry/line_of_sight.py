@@ -5,10 +5,25 @@ Prüft ob Gebäude zwischen Antenne und Messpunkt stehen und
 berechnet die resultierende Gebäudedämpfung.
 """
 
+from pathlib import Path
 from typing import List, Tuple, Optional
+import multiprocessing as mp
 import numpy as np
 
-from ..models import Building, LV95Coordinate
+from ..config import LOS_PARALLEL_MIN_RAYS, TERRAIN_LOS_ATTENUATION_DB
+from ..models import AntennaSystem, Building, LV95Coordinate, ResultTable
+from ..physics.field_engine import group_antennas_by_position
+from .bvh import TriangleBVH, id_keys
+from .dsm import BuildingDSM
+from .los_cache import LOSCache, los_cache_key, point_keys
+from .los_parallel import count_blocking_origins, count_blocking_parallel
+from .occlusion_buffer import OcclusionBuffer
+from .ray_triangle import building_triangles, segment_building_hits
+from .terrain import TerrainGrid
+
+
+# Verfahren für add_los_info_to_results()
+LOS_MODES = ("bvh", "buffer", "dsm")
 
 
 def check_line_of_sight_3d(
@@ -48,25 +63,17 @@ def check_line_of_sight_3d(
     if total_dist < 0.01:  # Start == End
         return True, [], 0.0
 
-    blocking_buildings = []
-
-    # Prüfe jedes Gebäude ob die Sichtlinie eine der Wandflächen schneidet (3D-Ansatz)
-    for building in buildings:
-        if not building.wall_surfaces:
-            continue
+    # Prüfe alle Wanddreiecke aller Gebäude gleichzeitig (3D-Ansatz, Möller-Trumbore)
+    triangles, triangle_building = building_triangles(buildings)
+    hits = segment_building_hits(
+        start.to_array(), end.to_array(), triangles, triangle_building, len(buildings)
+    )[0]
 
-        # Prüfe jede Wandfläche des Gebäudes
-        for wall in building.wall_surfaces:
-            if wall.vertices is None or len(wall.vertices) < 3:
-                continue
+    blocking_buildings = [b for b, hit in zip(buildings, hits) if hit]
 
-            # Prüfe ob die 3D-Sichtlinie dieses Wand-Polygon schneidet
-            if _ray_intersects_polygon_3d(start, end, wall.vertices, margin, debug=debug):
-                # Gebäude blockiert die Sichtlinie!
-                if debug:
-                    print(f"      [BLOCKING] Gebäude: {building.id[:40]}...")
-                blocking_buildings.append(building)
-                break  # Ein Treffer reicht, nächstes Gebäude
+    if debug:
+        for building in blocking_buildings:
+            print(f"      [BLOCKING] Gebäude: {building.id[:40]}...")
 
 
     # Berechne Gesamtdämpfung
@@ -116,67 +123,215 @@ def calculate_building_attenuation(buildings: List[Building]) -> float:
 
 
 def add_los_info_to_results(
-    results: List,
-    antenna_position: LV95Coordinate,
+    results: ResultTable,
+    antenna_system: AntennaSystem,
     buildings: List[Building],
-    mast_height_offset: float = 0.0,
+    bvh: Optional[TriangleBVH] = None,
+    los_mode: str = "bvh",
+    dsm: Optional[BuildingDSM] = None,
+    check_all: bool = False,
+    parallel: bool = False,
+    n_workers: Optional[int] = None,
+    use_cache: bool = False,
+    cache_dir: Optional[Path] = None,
+    terrain: Optional[TerrainGrid] = None,
 ) -> None:
     """
-    Fügt LOS-Information zu allen HotspotResults hinzu (in-place).
+    Fügt LOS-Information zur ResultTable hinzu (in-place).
 
-    OPTIMIERUNG: Nur Punkte die das Limit überschreiten werden analysiert,
-    da nur diese potenzielle Hotspots sind.
+    Sichtlinien werden von jeder Antennenposition aus geprüft; Antennen an
+    gleicher Position (group_antennas_by_position) teilen sich die
+    Sichtlinien, die Laufzeit wächst also mit der Anzahl Masten, nicht
+    Antennen. BVH bzw. DSM werden für alle Positionen gemeinsam genutzt.
 
-    Args:
-        results: Liste von HotspotResult-Objekten
-        antenna_position: Position der Antenne
-        buildings: Liste aller Gebäude
-    """
+    Mit terrain werden die Sichtlinien zusätzlich durch das Höhengitter
+    geführt; eine durch das Gelände abgeschattete Sichtlinie gilt als
+    blockiert und erhält TERRAIN_LOS_ATTENUATION_DB zusätzlich zur
+    Gebäudedämpfung.
 
-    # Filtere nur Punkte die Schwellwert überschreiten (potenzielle Hotspots)
-    results_to_check = [r for r in results if r.exceeds_limit]
+    Setzt has_los (frei zu allen Positionen, weder Gebäude noch Terrain),
+    num_buildings_blocking (Maximum über die Positionen) und building_atten
+    (N, A) - die Dämpfung pro Antenne. Die Dämpfung der Beiträge vor der
+    Leistungsaddition erfolgt separat über
+    ResultTable.apply_building_attenuation(results.building_atten).
 
-    print(f"    Prüfe LOS für {len(results_to_check)} potenzielle Hotspots (von {len(results)} Punkten)")
+    OPTIMIERUNG: Standardmässig werden nur Punkte analysiert, die das Limit
+    überschreiten, da nur diese potenzielle Hotspots sind (check_all=True
+    prüft alle Punkte). Alle Sichtlinien werden gemeinsam über die BVH der
+    Gebäudedreiecke geprüft (gleiche Regeln wie check_line_of_sight_3d()).
 
-    # Wende Mast-Offset an für LOS-Prüfung
-    actual_antenna_height = antenna_position.h + mast_height_offset
-    antenna_los_pos = LV95Coordinate(
-        e=antenna_position.e,
-        n=antenna_position.n,
-        h=actual_antenna_height
-    )
-
-    if mast_height_offset > 0:
-        print(f"    Antenne: Basis H={antenna_position.h:.2f}m, mit Mast H={actual_antenna_height:.2f}m (+{mast_height_offset:.2f}m)")
+    Args:
+        results: ResultTable aller Punkte
+        antenna_system: Antennensystem (Antennen wie results.antenna_ids)
+        buildings: Liste aller Gebäude
+        bvh: Vorab gebaute BVH über buildings (None = hier aufbauen)
+        los_mode: "bvh" (jede Sichtlinie durch die BVH) oder "buffer"
+                  (sphärischer Tiefenpuffer pro Antennenposition, exakte
+                  BVH-Prüfung nur an Kanten) oder "dsm" (Sichtlinien auf
+                  dem 2.5D-Gebäuderaster abtasten, genähert)
+        dsm: Vorab gebautes Raster für los_mode="dsm" (z.B. andere
+             Zellgrösse; None = hier aus buildings aufbauen)
+        check_all: LOS für alle Punkte statt nur über dem Schwellwert
+        parallel: Sichtlinien auf mehrere Prozesse verteilen (ab
+                  LOS_PARALLEL_MIN_RAYS Sichtlinien)
+        n_workers: Anzahl paralleler Worker (None = CPU-Kerne)
+        use_cache: Ergebnisse im persistenten LOS-Cache nachschlagen und
+                   neu geprüfte Punkte dort ablegen (siehe los_cache.py)
+        cache_dir: Verzeichnis des LOS-Caches (None = ~/.cache/emf_hotspot/los)
+        terrain: Optional Terrain-Höhengitter (swissALTI3D, None = ohne Terrain)
+    """
+    if los_mode not in LOS_MODES:
+        raise ValueError(f"Unbekannter LOS-Modus: {los_mode} (erlaubt: {', '.join(LOS_MODES)})")
+
+    if check_all:
+        indices_to_check = np.arange(len(results))
+        print(f"    Prüfe LOS für alle {len(results)} Punkte")
+    else:
+        # Filtere nur Punkte die Schwellwert überschreiten (potenzielle Hotspots)
+        indices_to_check = np.flatnonzero(results.exceeds_limit)
+        print(f"    Prüfe LOS für {len(indices_to_check)} potenzielle Hotspots (von {len(results)} Punkten)")
+
+    # Antennen in Spaltenreihenfolge, gruppiert nach Position (ein Ursprung pro Gruppe)
+    antenna_by_id = {ant.id: ant for ant in antenna_system.antennas}
+    antennas = [antenna_by_id[ant_id] for ant_id in np.asarray(results.antenna_ids).tolist()]
+    position_groups = group_antennas_by_position(antennas)
+    origins = np.array(
+        [antennas[group[0]].position.to_array() for group in position_groups], dtype=float
+    ).reshape(-1, 3)
+    group_of_antenna = np.empty(len(antennas), dtype=np.intp)
+    for g, group in enumerate(position_groups):
+        group_of_antenna[group] = g
+
+    print(f"    {len(origins)} Antennenpositionen für {len(antennas)} Antennen")
 
     # WICHTIG: Antennengebäude wird NICHT mehr excludiert!
     # Begründung: Obere Stockwerke können durch Oberlichter belastet sein.
     # Die Betondecke dämpft nur wenn geschlossen (keine Fenster/Oberlichter).
     # → Konservative Annahme: Prüfe alle Gebäude
 
-    for result in results_to_check:
-        # Erstelle LV95Coordinate für Result-Position
-        result_pos = LV95Coordinate(e=result.x, n=result.y, h=result.z)
+    has_los_column = results.has_los.copy()
+    blocking_column = results.num_buildings_blocking.copy()
+    attenuation_matrix = results.contrib_building_attenuation.copy()
+
+    if bvh is None and los_mode != "dsm":
+        bvh = TriangleBVH.from_buildings(buildings)
+
+    if los_mode == "dsm":
+        if dsm is None:
+            dsm = BuildingDSM.from_buildings(buildings)
+        engine = dsm
+        indexed_buildings, indexed_key = dsm.buildings, dsm.building_key
+        ny, nx = dsm.shape
+        print(f"    DSM: {nx}×{ny} Zellen ({dsm.cell_size_m:g} m)")
+    else:
+        engine = bvh
+        indexed_buildings, indexed_key = bvh.buildings, bvh.building_key
+
+    # Prüfe LOS - WICHTIG: Exclude nur das eigene Gebäude (wo der Messpunkt liegt),
+    # Gebäude-Code über die ID-Tabelle der Punkte statt Suche pro Punkt
+    exclude_key = id_keys(indexed_buildings, indexed_key, results.building_ids)[
+        results.building_index[indices_to_check]
+    ]
+
+    # Dämpfung pro Gebäude (additiv über alle blockierenden Gebäude)
+    building_attenuation_db = np.array(
+        [calculate_building_attenuation([b]) for b in indexed_buildings], dtype=float
+    )
+
+    ends = results.xyz[indices_to_check]
+    n_origins, n_rays = len(origins), len(indices_to_check)
+    num_blocking = np.zeros((n_origins, n_rays), dtype=np.int64)
+    attenuation = np.zeros((n_origins, n_rays))
+    terrain_blocked = np.zeros((n_origins, n_rays), dtype=bool)
+
+    # Bereits geprüfte Punkte aus dem LOS-Cache (pro Antennenposition);
+    # der Schlüssel enthält die Parameter, die das Ergebnis des Verfahrens bestimmen
+    caches = []
+    if los_mode == "dsm":
+        engine_params = dict(cell_size_m=dsm.cell_size_m)
+    else:
+        engine_params = dict(include_roofs=bvh.include_roofs)
+    cast_origin, cast_ray = [np.zeros(0, dtype=np.intp)], [np.zeros(0, dtype=np.intp)]
+    keys = point_keys(ends, exclude_key) if use_cache else None
+    for g, origin in enumerate(origins):
+        to_cast = np.arange(n_rays)
+        if use_cache:
+            los_cache = LOSCache.open(
+                los_cache_key(
+                    indexed_buildings, building_attenuation_db, origin, los_mode, terrain, **engine_params
+                ),
+                cache_dir,
+            )
+            cached_at = los_cache.lookup(keys)
+            cached = cached_at >= 0
+            num_blocking[g, cached] = los_cache.num_buildings_blocking[cached_at[cached]]
+            attenuation[g, cached] = los_cache.building_attenuation_db[cached_at[cached]]
+            terrain_blocked[g, cached] = los_cache.terrain_blocked[cached_at[cached]]
+            to_cast = np.flatnonzero(~cached)
+            caches.append(los_cache)
+        cast_origin.append(np.full(len(to_cast), g, dtype=np.intp))
+        cast_ray.append(to_cast)
+
+    cast_origin = np.concatenate(cast_origin)
+    cast_ray = np.concatenate(cast_ray)
+    if use_cache:
+        print(f"    LOS-Cache: {n_origins * n_rays - len(cast_ray)} von {n_origins * n_rays} "
+              f"Sichtlinien bereits geprüft ({caches[0].path.parent})")
+
+    if n_workers is None:
+        n_workers = mp.cpu_count()
+
+    if len(cast_ray):
+        if los_mode == "buffer":
+            # Ein Tiefenpuffer pro Position mit offenen Sichtlinien
+            cast_origins = set(np.unique(cast_origin).tolist())
+            engines = [
+                OcclusionBuffer.from_bvh(bvh, origin) if g in cast_origins else None
+                for g, origin in enumerate(origins)
+            ]
+        else:
+            engines = [engine] * n_origins
+
+        if parallel and n_workers > 1 and len(cast_ray) >= LOS_PARALLEL_MIN_RAYS:
+            print(f"    Parallele LOS-Prüfung mit {n_workers} Workern...")
+            cast_blocking, cast_attenuation, exact, cast_terrain = count_blocking_parallel(
+                engines, los_mode, origins, cast_origin, ends[cast_ray], exclude_key[cast_ray],
+                building_attenuation_db, terrain, n_workers=n_workers,
+            )
+        else:
+            cast_blocking, cast_attenuation, exact, cast_terrain = count_blocking_origins(
+                engines, los_mode, origins, cast_origin, ends[cast_ray], exclude_key[cast_ray],
+                building_attenuation_db, terrain,
+            )
+
+        if los_mode == "buffer":
+            buffers = [e for e in engines if e is not None]
+            print(f"    Tiefenpuffer: {len(buffers)}× {buffers[0].n_azimuth}×{buffers[0].n_elevation} "
+                  f"Zellen ({buffers[0].resolution_deg:g}°), {sum(b.n_hits for b in buffers)} Treffer, "
+                  f"{int(exact.sum())} Sichtlinien exakt nachgeprüft")
 
-        # Prüfe LOS - WICHTIG: Exclude nur das eigene Gebäude (wo der Messpunkt liegt)
-        buildings_to_check = [
-            b for b in buildings
-            if b.id != result.building_id  # Nur eigenes Gebäude excludieren
-        ]
+        num_blocking[cast_origin, cast_ray] = cast_blocking
+        attenuation[cast_origin, cast_ray] = cast_attenuation
+        terrain_blocked[cast_origin, cast_ray] = cast_terrain
 
-        has_los, blocking, attenuation_db = check_line_of_sight_3d(
-            antenna_los_pos,  # Mit Mast-Offset!
-            result_pos,
-            buildings_to_check,
-        )
+        for g, los_cache in enumerate(caches):
+            new = cast_origin == g
+            if new.any():
+                los_cache.add(keys[cast_ray[new]], cast_blocking[new], cast_attenuation[new], cast_terrain[new])
+                los_cache.save()
 
-        # Füge als Attribute hinzu
-        result.has_los = has_los
-        result.num_buildings_blocking = len(blocking)
-        result.building_attenuation_db = attenuation_db
+    if terrain is not None:
+        print(f"    Terrain: {int(terrain_blocked.sum())} von {terrain_blocked.size} Sichtlinien "
+              f"durch das Gelände abgeschattet")
+        attenuation = attenuation + TERRAIN_LOS_ATTENUATION_DB * terrain_blocked
 
-        # Optional: Liste der blockierenden Gebäude-IDs
-        result.blocking_building_ids = [b.id for b in blocking] if blocking else []
+    has_los_column[indices_to_check] = ((num_blocking == 0) & ~terrain_blocked).all(axis=0)
+    blocking_column[indices_to_check] = num_blocking.max(axis=0, initial=0)
+    attenuation_matrix[indices_to_check] = attenuation[group_of_antenna].T
+
+    results.has_los = has_los_column
+    results.num_buildings_blocking = blocking_column
+    results.building_atten = attenuation_matrix
 
 
 def _extract_building_footprint(building) -> List:
@@ -291,122 +446,6 @@ def _get_building_height_range(building) -> Tuple[float, float]:
     return float(np.min(all_z)), float(np.max(all_z))
 
 
-def _ray_intersects_polygon_3d(
-    start: LV95Coordinate,
-    end: LV95Coordinate,
-    polygon_vertices: np.ndarray,
-    margin: float = 0.0,
-    debug: bool = False,
-) -> bool:
-    """
-    Prüft ob ein 3D-Ray (Sichtlinie) ein 3D-Polygon schneidet.
-
-    Verwendet Möller-Trumbore Ray-Triangle-Intersection-Algorithmus.
-    Das Polygon wird in Dreiecke zerlegt (Fan-Triangulation).
-
-    Args:
-        start: Startpunkt der Sichtlinie (Antenne)
-        end: Endpunkt der Sichtlinie (Messpunkt)
-        polygon_vertices: numpy array (N, 3) der Polygon-Vertices
-        margin: Sicherheitsabstand (nicht verwendet bei 3D)
-        debug: Debug-Ausgaben aktivieren
-
-    Returns:
-        True wenn die Sichtlinie das Polygon schneidet
-    """
-    if len(polygon_vertices) < 3:
-        return False
-
-    # Strahlrichtung und -länge
-    ray_origin = start.to_array()
-    ray_end = end.to_array()
-    ray_direction = ray_end - ray_origin
-    ray_length = np.linalg.norm(ray_direction)
-
-    if ray_length < 0.01:
-        return False  # Start == End
-
-    ray_direction = ray_direction / ray_length  # Normalisieren
-
-    # Trianguliere das Polygon (Fan-Triangulation um ersten Vertex)
-    v0 = polygon_vertices[0]
-
-    for i in range(1, len(polygon_vertices) - 1):
-        v1 = polygon_vertices[i]
-        v2 = polygon_vertices[i + 1]
-
-        # Möller-Trumbore Ray-Triangle-Intersection
-        t = _ray_triangle_intersection(ray_origin, ray_direction, v0, v1, v2)
-
-        if t is not None and 0 <= t <= ray_length:
-            # DEBUG: Zeige Schnittpunkt-Details
-            if debug:
-                intersection_point = ray_origin + t * ray_direction
-                print(f"        [HIT] t={t:.2f}m (ray_length={ray_length:.2f}m)")
-                print(f"              Intersection: E={intersection_point[0]:.2f}, N={intersection_point[1]:.2f}, H={intersection_point[2]:.2f}")
-                print(f"              Start: E={start.e:.2f}, N={start.n:.2f}, H={start.h:.2f}")
-                print(f"              End:   E={end.e:.2f}, N={end.n:.2f}, H={end.h:.2f}")
-                print(f"              Wall Z-range: {polygon_vertices[:, 2].min():.2f} - {polygon_vertices[:, 2].max():.2f}")
-            # Schnittpunkt liegt auf dem Strahl zwischen Start und End
-            return True
-
-    return False
-
-
-def _ray_triangle_intersection(
-    ray_origin: np.ndarray,
-    ray_direction: np.ndarray,
-    v0: np.ndarray,
-    v1: np.ndarray,
-    v2: np.ndarray,
-) -> Optional[float]:
-    """
-    Möller-Trumbore Ray-Triangle-Intersection-Algorithmus.
-
-    Args:
-        ray_origin: Startpunkt des Strahls (3D)
-        ray_direction: Richtung des Strahls (normalisiert)
-        v0, v1, v2: Dreieck-Vertices (3D)
-
-    Returns:
-        Distanz t entlang des Strahls zum Schnittpunkt, oder None
-    """
-    epsilon = 1e-6
-
-    # Kanten des Dreiecks
-    edge1 = v1 - v0
-    edge2 = v2 - v0
-
-    # Berechne Determinante
-    h = np.cross(ray_direction, edge2)
-    a = np.dot(edge1, h)
-
-    if abs(a) < epsilon:
-        # Strahl ist parallel zum Dreieck
-        return None
-
-    f = 1.0 / a
-    s = ray_origin - v0
-    u = f * np.dot(s, h)
-
-    if u < 0.0 or u > 1.0:
-        return None
-
-    q = np.cross(s, edge1)
-    v = f * np.dot(ray_direction, q)
-
-    if v < 0.0 or u + v > 1.0:
-        return None
-
-    # Berechne t um den Schnittpunkt zu finden
-    t = f * np.dot(edge2, q)
-
-    if t > epsilon:
-        return t
-
-    return None
-
-
 def _line_intersects_polygon_2d(
     line_start: np.ndarray,
     line_end: np.ndarray,
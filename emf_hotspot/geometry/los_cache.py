@@ -0,0 +1,175 @@
+"""
+Persistenter LOS-Cache pro Gebäudegeometrie und Antennenposition.
+
+Das LOS-Ergebnis eines Punkts hängt nur von der Gebäudegeometrie, der
+Antennenposition, dem Verfahren und seinen Parametern (DSM-Zellgrösse,
+Dächer in der BVH, Terrain-Randabstand), dem optionalen Terrain-Höhengitter
+und dem Punkt selbst
+(Koordinaten, eigenes Gebäude) ab - nicht von ERP, Diagrammen oder
+Schwellwert. Der Cache liegt neben dem Gebäudekachel-Cache in
+~/.cache/emf_hotspot/los/, eine Datei pro Schlüssel (Hash über Gebäude,
+Dämpfung pro Gebäude, Antennenposition, Verfahren mit Parametern und
+Terrain). Bei einem erneuten
+Lauf werden nur Punkte geprüft, die noch nicht im Cache sind.
+"""
+
+import hashlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Sequence
+import numpy as np
+
+from ..config import TERRAIN_LOS_MARGIN_M
+from ..models import Building
+from .terrain import TerrainGrid
+
+
+# Standardverzeichnis (neben dem Gebäudekachel-Cache)
+DEFAULT_LOS_CACHE_DIR = Path.home() / ".cache" / "emf_hotspot" / "los"
+
+# Bei Änderungen an den LOS-Regeln erhöhen (alte Einträge werden ungültig)
+_CACHE_VERSION = 3
+
+# Auflösung der Punkt-Schlüssel [m]
+_POINT_RESOLUTION_M = 0.001
+
+
+def los_cache_key(
+    buildings: Sequence[Building],
+    building_attenuation_db: np.ndarray,
+    origin: np.ndarray,
+    los_mode: str,
+    terrain: Optional[TerrainGrid] = None,
+    cell_size_m: Optional[float] = None,
+    include_roofs: bool = False,
+    terrain_margin_m: float = TERRAIN_LOS_MARGIN_M,
+) -> str:
+    """
+    Schlüssel (SHA-256, hex) über Gebäudegeometrie, Dämpfung pro Gebäude,
+    Antennenposition, LOS-Verfahren mit seinen Parametern und
+    Terrain-Höhengitter (falls geprüft).
+
+    Args:
+        buildings: Gebäude in Indexreihenfolge des LOS-Verfahrens
+        building_attenuation_db: (B,) Dämpfung pro Gebäude [dB]
+        origin: (3,) Antennenposition
+        los_mode: LOS-Verfahren
+        terrain: Optional Terrain-Höhengitter
+        cell_size_m: Zellgrösse des DSM-Rasters (los_mode="dsm", sonst None)
+        include_roofs: BVH enthält Dachflächen (los_mode="bvh"/"buffer")
+        terrain_margin_m: Randabstand der Terrainprüfung (nur mit terrain)
+    """
+    digest = hashlib.sha256()
+    digest.update(
+        f"los-v{_CACHE_VERSION}|{los_mode}|cell={cell_size_m!r}|roofs={int(include_roofs)}|".encode()
+    )
+    digest.update(np.round(np.asarray(origin, dtype=float) / _POINT_RESOLUTION_M).astype(np.int64).tobytes())
+
+    for building, attenuation in zip(buildings, np.asarray(building_attenuation_db, dtype=float)):
+        digest.update(f"|{building.id}|{attenuation!r}".encode())
+        for surfaces, tag in ((building.wall_surfaces, b"W"), (building.roof_surfaces, b"R")):
+            for surface in surfaces:
+                if surface.vertices is None:
+                    continue
+                digest.update(tag)
+                digest.update(np.ascontiguousarray(surface.vertices, dtype=float).tobytes())
+
+    if terrain is not None:
+        digest.update(f"|terrain|{terrain.cell_size_m!r}|{terrain.shape}|{terrain_margin_m!r}|".encode())
+        digest.update(np.asarray(terrain.origin, dtype=float).tobytes())
+        digest.update(np.ascontiguousarray(terrain.heights, dtype=np.float32).tobytes())
+
+    return digest.hexdigest()
+
+
+def point_keys(xyz: np.ndarray, exclude_key: np.ndarray) -> np.ndarray:
+    """(M, 4) int64 Schlüssel pro Punkt: Koordinaten [mm] und Code des eigenen Gebäudes"""
+    quantized = np.round(np.asarray(xyz, dtype=float).reshape(-1, 3) / _POINT_RESOLUTION_M).astype(np.int64)
+    return np.column_stack([quantized, np.asarray(exclude_key, dtype=np.int64)])
+
+
+@dataclass
+class LOSCache:
+    """Bereits geprüfte Punkte eines Schlüssels (siehe los_cache_key())"""
+    path: Path
+    point_key: np.ndarray  # (K, 4) int64, siehe point_keys()
+    num_buildings_blocking: np.ndarray  # (K,) Anzahl blockierender Gebäude
+    building_attenuation_db: np.ndarray  # (K,) Gebäudedämpfung [dB]
+    terrain_blocked: np.ndarray  # (K,) Sichtlinie durch das Terrain abgeschattet
+
+    def __len__(self) -> int:
+        return len(self.point_key)
+
+    @classmethod
+    def open(cls, key: str, cache_dir: Optional[Path] = None) -> "LOSCache":
+        """Lädt den Cache zum Schlüssel (leer, falls noch keiner existiert oder er unlesbar ist)"""
+        if cache_dir is None:
+            cache_dir = DEFAULT_LOS_CACHE_DIR
+        path = Path(cache_dir) / f"los_{key[:32]}.npz"
+
+        if path.exists():
+            try:
+                with np.load(path, allow_pickle=False) as data:
+                    return cls(
+                        path=path,
+                        point_key=data["point_key"],
+                        num_buildings_blocking=data["num_buildings_blocking"],
+                        building_attenuation_db=data["building_attenuation_db"],
+                        terrain_blocked=data["terrain_blocked"],
+                    )
+            except (OSError, KeyError, ValueError) as e:
+                print(f"    WARNUNG: LOS-Cache {path.name} unlesbar ({e}), wird neu aufgebaut")
+
+        return cls(
+            path=path,
+            point_key=np.zeros((0, 4), dtype=np.int64),
+            num_buildings_blocking=np.zeros(0, dtype=np.int64),
+            building_attenuation_db=np.zeros(0, dtype=float),
+            terrain_blocked=np.zeros(0, dtype=bool),
+        )
+
+    def lookup(self, point_key: np.ndarray) -> np.ndarray:
+        """(M,) Index im Cache pro Punkt (-1 = nicht im Cache)"""
+        n_cached = len(self.point_key)
+        if n_cached == 0 or len(point_key) == 0:
+            return np.full(len(point_key), -1, dtype=np.intp)
+
+        # Schlüssel als Byte-Blöcke vergleichen (eine Sortierung für alle Punkte)
+        both = np.ascontiguousarray(np.concatenate([self.point_key, point_key]), dtype=np.int64)
+        _, inverse = np.unique(both.view(np.dtype((np.void, both.itemsize * 4))).ravel(), return_inverse=True)
+        inverse = inverse.reshape(-1)
+
+        cached_at = np.full(inverse.max() + 1, -1, dtype=np.intp)
+        cached_at[inverse[:n_cached]] = np.arange(n_cached)
+        return cached_at[inverse[n_cached:]]
+
+    def add(
+        self,
+        point_key: np.ndarray,
+        num_buildings_blocking: np.ndarray,
+        building_attenuation_db: np.ndarray,
+        terrain_blocked: np.ndarray,
+    ) -> None:
+        """Fügt neu geprüfte Punkte hinzu (nicht bereits enthaltene Schlüssel)"""
+        self.point_key = np.concatenate([self.point_key, np.asarray(point_key, dtype=np.int64)])
+        self.num_buildings_blocking = np.concatenate(
+            [self.num_buildings_blocking, np.asarray(num_buildings_blocking, dtype=np.int64)]
+        )
+        self.building_attenuation_db = np.concatenate(
+            [self.building_attenuation_db, np.asarray(building_attenuation_db, dtype=float)]
+        )
+        self.terrain_blocked = np.concatenate([self.terrain_blocked, np.asarray(terrain_blocked, dtype=bool)])
+
+    def save(self) -> None:
+        """Schreibt den Cache (über eine temporäre Datei, kein halber Cache bei Abbruch)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.stem}.{os.getpid()}.tmp.npz")
+        np.savez(
+            tmp_path,
+            point_key=self.point_key,
+            num_buildings_blocking=self.num_buildings_blocking,
+            building_attenuation_db=self.building_attenuation_db,
+            terrain_blocked=self.terrain_blocked,
+        )
+        os.replace(tmp_path, self.path)
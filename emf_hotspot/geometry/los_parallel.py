@@ -0,0 +1,351 @@
+"""
+Parallele LOS-Prüfung mit multiprocessing und Shared Memory.
+
+Gleiches Schema wie physics/summation_parallel.py: Die Arrays der
+LOS-Verfahren (BVH, Tiefenpuffer oder DSM-Raster; gleiche Objekte für
+mehrere Antennenpositionen nur einmal), die Ursprünge, Endpunkte,
+Gebäude-Codes pro Sichtlinie und die Dämpfung pro Gebäude liegen in einem
+multiprocessing.shared_memory-Block, den jeder Worker einmalig im
+Pool-Initializer einbindet. Daraus entstehen pro Worker leichte Objekte
+ohne Gebäudeliste (Ausschluss über Gebäude-Codes); ein optionales
+Terrain-Höhengitter liegt im selben Block. Die Worker bearbeiten
+Indexbereiche und schreiben Anzahl blockierender Gebäude, Dämpfung,
+exakt nachgeprüfte und durch das Terrain abgeschattete Sichtlinien direkt
+in gemeinsame Ausgabe-Arrays. Pro Aufgabe wird nur (start, stop) übertragen.
+"""
+
+from dataclasses import fields, is_dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+import multiprocessing as mp
+import numpy as np
+
+from ..config import LOS_RAY_CHUNK
+from ..physics.summation_parallel import _SharedArrays
+from .terrain import TerrainGrid
+
+
+# Ausgabe-Spalten (je (M,)) mit dtype
+_OUTPUT_COLUMNS = {
+    "num_buildings_blocking": "int64",
+    "building_attenuation_db": "float64",
+    "exact": "bool",
+    "terrain_blocked": "bool",
+}
+
+# Zustand pro Worker-Prozess (gesetzt durch _init_los_worker)
+_los_worker_state: Dict[str, object] = {}
+
+
+def query_blocking_pairs(
+    engine,
+    los_mode: str,
+    origin: np.ndarray,
+    ends: np.ndarray,
+    exclude_key: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Blockierende Paare (Sichtlinie, Gebäudeindex) mit dem Verfahren los_mode.
+
+    Args:
+        engine: TriangleBVH ("bvh"), OcclusionBuffer ("buffer", Ursprung
+                bereits enthalten) oder BuildingDSM ("dsm")
+        los_mode: Verfahren (siehe line_of_sight.LOS_MODES)
+        origin: (3,) Antennenposition
+        ends: (M, 3) Endpunkte der Sichtlinien
+        exclude_key: (M,) Gebäude-Code pro Sichtlinie, der nicht zählt
+
+    Returns:
+        (rays, buildings, (M,) Maske der exakt nachgeprüften Sichtlinien)
+    """
+    if los_mode == "buffer":
+        return engine.blocking_pairs(ends, exclude_key=exclude_key)
+    rays, blocking = engine.blocking_pairs(origin, ends, exclude_key=exclude_key)
+    return rays, blocking, np.zeros(len(ends), dtype=bool)
+
+
+def count_blocking(
+    engine,
+    los_mode: str,
+    origin: np.ndarray,
+    ends: np.ndarray,
+    exclude_key: np.ndarray,
+    building_attenuation_db: np.ndarray,
+    terrain: Optional[TerrainGrid] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Anzahl blockierender Gebäude, Gebäudedämpfung und Terrain-Abschattung
+    pro Sichtlinie.
+
+    Args:
+        engine, los_mode, origin, ends, exclude_key: wie query_blocking_pairs()
+        building_attenuation_db: (B,) Dämpfung pro Gebäudeindex [dB]
+        terrain: Optional Höhengitter (None = keine Terrainprüfung)
+
+    Returns:
+        (num_buildings_blocking (M,), building_attenuation_db (M,), exact (M,),
+        terrain_blocked (M,))
+    """
+    rays, blocking, exact = query_blocking_pairs(engine, los_mode, origin, ends, exclude_key)
+    num_blocking = np.bincount(rays, minlength=len(ends))
+    attenuation = np.bincount(rays, weights=building_attenuation_db[blocking], minlength=len(ends))
+    if terrain is not None:
+        terrain_blocked = terrain.blocked(origin, ends)
+    else:
+        terrain_blocked = np.zeros(len(ends), dtype=bool)
+    return num_blocking, attenuation, exact, terrain_blocked
+
+
+def count_blocking_origins(
+    engines: Sequence,
+    los_mode: str,
+    origins: np.ndarray,
+    origin_index: np.ndarray,
+    ends: np.ndarray,
+    exclude_key: np.ndarray,
+    building_attenuation_db: np.ndarray,
+    terrain: Optional[TerrainGrid] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Wie count_blocking() für Sichtlinien von mehreren Antennenpositionen.
+
+    Args:
+        engines: LOS-Objekt pro Position (G) (für "buffer" je ein eigener
+                 Tiefenpuffer, sonst dasselbe Objekt)
+        los_mode: Verfahren
+        origins: (G, 3) Antennenpositionen
+        origin_index: (M,) Position pro Sichtlinie
+        ends, exclude_key, building_attenuation_db, terrain: wie count_blocking()
+
+    Returns:
+        Wie count_blocking()
+    """
+    n_rays = len(ends)
+    num_blocking = np.zeros(n_rays, dtype=np.int64)
+    attenuation = np.zeros(n_rays)
+    exact = np.zeros(n_rays, dtype=bool)
+    terrain_blocked = np.zeros(n_rays, dtype=bool)
+
+    for g in np.unique(origin_index).tolist():
+        rays = np.flatnonzero(origin_index == g)
+        num_blocking[rays], attenuation[rays], exact[rays], terrain_blocked[rays] = count_blocking(
+            engines[g], los_mode, origins[g], ends[rays], exclude_key[rays], building_attenuation_db, terrain,
+        )
+
+    return num_blocking, attenuation, exact, terrain_blocked
+
+
+def count_blocking_parallel(
+    engines: Sequence,
+    los_mode: str,
+    origins: np.ndarray,
+    origin_index: np.ndarray,
+    ends: np.ndarray,
+    exclude_key: np.ndarray,
+    building_attenuation_db: np.ndarray,
+    terrain: Optional[TerrainGrid] = None,
+    n_workers: Optional[int] = None,
+    range_size: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Parallele Variante von count_blocking_origins() mit Shared Memory.
+
+    Alle Antennenpositionen laufen im selben Pool; Sichtlinien sollten nach
+    Position sortiert sein (eine Aufgabe betrifft dann meist eine Position).
+
+    Args:
+        engines, los_mode, origins, origin_index, ends, exclude_key,
+        building_attenuation_db, terrain: wie count_blocking_origins()
+        n_workers: Anzahl paralleler Worker (None = CPU-Kerne)
+        range_size: Sichtlinien pro Aufgabe (None = automatisch)
+
+    Returns:
+        Wie count_blocking() (identisch zur seriellen Prüfung)
+    """
+    ends = np.ascontiguousarray(ends, dtype=float).reshape(-1, 3)
+    origins = np.asarray(origins, dtype=float).reshape(-1, 3)
+    n_rays = len(ends)
+
+    if n_workers is None:
+        n_workers = mp.cpu_count()
+
+    if n_workers <= 1 or n_rays == 0:
+        return count_blocking_origins(
+            engines, los_mode, origins, origin_index, ends, exclude_key, building_attenuation_db, terrain,
+        )
+
+    # Automatische Aufgabengrösse: ~4 Aufgaben pro Worker (Lastausgleich)
+    if range_size is None:
+        range_size = max(LOS_RAY_CHUNK, -(-n_rays // (n_workers * 4)))
+    range_size = max(1, range_size)
+
+    # Gleiche LOS-Objekte (Identität) nur einmal in den Shared-Block
+    unique_engines = []
+    engine_index = []
+    for engine in engines:
+        if engine is None:
+            engine_index.append(-1)
+            continue
+        if not any(engine is e for e in unique_engines):
+            unique_engines.append(engine)
+        engine_index.append(next(u for u, e in enumerate(unique_engines) if e is engine))
+
+    engine_arrays = {}
+    engine_specs = []
+    for u, engine in enumerate(unique_engines):
+        arrays, spec = _engine_arrays(engine, prefix=f"engine{u}.")
+        engine_arrays.update(arrays)
+        engine_specs.append(spec)
+
+    terrain_spec = None
+    if terrain is not None:
+        arrays, terrain_spec = _engine_arrays(terrain, prefix="terrain.")
+        engine_arrays.update(arrays)
+
+    input_arrays = {
+        "ends": ends,
+        "exclude_key": np.asarray(exclude_key, dtype=np.intp),
+        "origin_index": np.asarray(origin_index, dtype=np.intp),
+        "origins": origins,
+        "building_attenuation_db": np.asarray(building_attenuation_db, dtype=float),
+        **engine_arrays,
+    }
+
+    inputs = _SharedArrays.create({
+        name: (array.shape, array.dtype.str) for name, array in input_arrays.items()
+    })
+    try:
+        for name, array in input_arrays.items():
+            inputs.arrays[name][...] = array
+
+        outputs = _SharedArrays.create({
+            name: ((n_rays,), dtype) for name, dtype in _OUTPUT_COLUMNS.items()
+        })
+        try:
+            ranges = [
+                (start, min(start + range_size, n_rays))
+                for start in range(0, n_rays, range_size)
+            ]
+
+            with mp.Pool(
+                processes=n_workers,
+                initializer=_init_los_worker,
+                initargs=(
+                    inputs.shm.name, inputs.layout,
+                    outputs.shm.name, outputs.layout,
+                    engine_specs, engine_index, los_mode, terrain_spec,
+                ),
+            ) as pool:
+                checked = sum(pool.imap_unordered(_count_range_worker, ranges))
+
+            if checked != n_rays:
+                raise RuntimeError(
+                    f"Parallele LOS-Prüfung unvollständig: {checked}/{n_rays} Sichtlinien"
+                )
+
+            # Ergebnisse aus dem Shared-Block kopieren (Block wird freigegeben)
+            columns = [outputs.arrays[name].copy() for name in _OUTPUT_COLUMNS]
+        finally:
+            outputs.release(unlink=True)
+    finally:
+        inputs.release(unlink=True)
+
+    return tuple(columns)
+
+
+def _engine_arrays(engine, prefix: str = "engine.") -> Tuple[Dict[str, np.ndarray], tuple]:
+    """
+    Zerlegt ein LOS-Objekt (Dataclass) in Arrays für den Shared-Block und
+    eine Bauanleitung (Klasse, {Feld: Art und Wert}).
+
+    Verschachtelte Dataclasses (OcclusionBuffer.bvh) werden rekursiv zerlegt,
+    die Gebäudeliste wird nicht übertragen (Worker rechnen mit Gebäude-Codes).
+    """
+    arrays = {}
+    spec = {}
+    for field in fields(engine):
+        value = getattr(engine, field.name)
+        name = prefix + field.name
+        if isinstance(value, np.ndarray):
+            arrays[name] = np.ascontiguousarray(value)
+            spec[field.name] = ("array", name)
+        elif is_dataclass(value):
+            sub_arrays, sub_spec = _engine_arrays(value, name + ".")
+            arrays.update(sub_arrays)
+            spec[field.name] = ("engine", sub_spec)
+        elif field.name == "buildings":
+            spec[field.name] = ("value", [])
+        else:
+            spec[field.name] = ("value", value)
+    return arrays, (type(engine), spec)
+
+
+def _restore_engine(engine_spec: tuple, arrays: Dict[str, np.ndarray]):
+    """Baut das LOS-Objekt aus der Bauanleitung mit Views auf den Shared-Block."""
+    cls, spec = engine_spec
+    kwargs = {}
+    for name, (kind, value) in spec.items():
+        if kind == "array":
+            kwargs[name] = arrays[value]
+        elif kind == "engine":
+            kwargs[name] = _restore_engine(value, arrays)
+        else:
+            kwargs[name] = value
+    return cls(**kwargs)
+
+
+def _init_los_worker(
+    input_name: str,
+    input_layout: list,
+    output_name: str,
+    output_layout: list,
+    engine_specs: List[tuple],
+    engine_index: List[int],
+    los_mode: str,
+    terrain_spec: Optional[tuple] = None,
+) -> None:
+    """Pool-Initializer: bindet die Shared-Blöcke einmalig pro Worker ein."""
+    inputs = _SharedArrays.attach(input_name, input_layout)
+    outputs = _SharedArrays.attach(output_name, output_layout)
+
+    for array in inputs.arrays.values():
+        array.flags.writeable = False
+
+    unique_engines = [_restore_engine(spec, inputs.arrays) for spec in engine_specs]
+
+    _los_worker_state.update(
+        inputs=inputs,
+        outputs=outputs,
+        engines=[unique_engines[u] if u >= 0 else None for u in engine_index],
+        los_mode=los_mode,
+        terrain=_restore_engine(terrain_spec, inputs.arrays) if terrain_spec is not None else None,
+    )
+
+
+def _count_range_worker(index_range: Tuple[int, int]) -> int:
+    """
+    Prüft die Sichtlinien [start, stop) und schreibt die Ergebnisse in den
+    Ausgabeblock.
+
+    Returns:
+        Anzahl geprüfter Sichtlinien
+    """
+    start, stop = index_range
+    inputs = _los_worker_state["inputs"].arrays
+    outputs = _los_worker_state["outputs"].arrays
+
+    num_blocking, attenuation, exact, terrain_blocked = count_blocking_origins(
+        _los_worker_state["engines"],
+        _los_worker_state["los_mode"],
+        inputs["origins"],
+        inputs["origin_index"][start:stop],
+        inputs["ends"][start:stop],
+        inputs["exclude_key"][start:stop],
+        inputs["building_attenuation_db"],
+        _los_worker_state["terrain"],
+    )
+    outputs["num_buildings_blocking"][start:stop] = num_blocking
+    outputs["building_attenuation_db"][start:stop] = attenuation
+    outputs["exact"][start:stop] = exact
+    outputs["terrain_blocked"][start:stop] = terrain_blocked
+
+    return stop - start
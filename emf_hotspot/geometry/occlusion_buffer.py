@@ -0,0 +1,298 @@
+"""
+Sphärischer Tiefenpuffer (Occlusion Buffer) für LOS-Abfragen von einer Antenne aus.
+
+Alle Sichtlinien einer LOS-Analyse beginnen am selben Punkt. Statt jede
+Sichtlinie einzeln durch die BVH zu schicken, werden alle Gebäudedreiecke
+einmal in ein Azimut × Elevation-Raster um diesen Punkt gerastert: pro
+Zelle werden alle Schnittdistanzen (erste, zweite, ...) des Strahls durch
+die Zellmitte samt Gebäude gespeichert (CSR-Layout, nach Distanz sortiert).
+
+Die LOS eines Punkts ist danach ein Lookup: blockierend sind alle Gebäude
+der Zelle mit Distanz kleiner als der Punktabstand. Weil die Zellmitten
+nur Stichproben sind, gilt das Ergebnis nur, wenn die 3×3-Nachbarschaft
+übereinstimmt (gleiche blockierende Gebäude, keine Fläche innerhalb der
+Tiefentoleranz um den Punkt). Punkte an Silhouettenkanten, dicht vor
+Flächen, nahe den Polen oder in Zellen mit Dreiecken unterhalb der
+Rasterauflösung werden exakt über die BVH nachgeprüft.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+import numpy as np
+
+from ..config import LOS_BUFFER_DEPTH_TOLERANCE_M, LOS_BUFFER_RESOLUTION_DEG, LOS_PAIR_CHUNK
+from .bvh import TriangleBVH
+from .ray_triangle import item_blocks, ray_triangle_intersections
+
+
+@dataclass
+class OcclusionBuffer:
+    """Azimut × Elevation-Tiefenpuffer aller Gebäudedreiecke um einen Ursprung"""
+    origin: np.ndarray  # (3,) [E, N, H] Ursprung (Antenne)
+    resolution_deg: float  # Zellgrösse in Azimut und Elevation [°]
+    n_azimuth: int  # Zellen in Azimut (0° = Nord, im Uhrzeigersinn)
+    n_elevation: int  # Zellen in Elevation (-90° bis +90°)
+    cell_offsets: np.ndarray  # (C + 1,) CSR-Offsets in hit_distance/hit_building
+    hit_distance: np.ndarray  # (H,) Distanz der Schnittpunkte [m], pro Zelle aufsteigend
+    hit_building: np.ndarray  # (H,) Gebäudeindex (wie bvh.buildings)
+    dirty: np.ndarray  # (C,) bool - Zelle enthält Dreiecke unterhalb der Auflösung
+    bvh: TriangleBVH  # Für die exakte Nachprüfung
+    depth_tolerance_m: float = LOS_BUFFER_DEPTH_TOLERANCE_M
+
+    @classmethod
+    def from_bvh(
+        cls,
+        bvh: TriangleBVH,
+        origin: np.ndarray,
+        resolution_deg: float = LOS_BUFFER_RESOLUTION_DEG,
+        depth_tolerance_m: float = LOS_BUFFER_DEPTH_TOLERANCE_M,
+        pair_chunk: int = LOS_PAIR_CHUNK,
+    ) -> "OcclusionBuffer":
+        """
+        Rastert alle Dreiecke der BVH in den Tiefenpuffer um origin.
+
+        Args:
+            bvh: BVH der Gebäudedreiecke (liefert Dreiecke und Gebäude)
+            origin: (3,) Ursprung aller Sichtlinien
+            resolution_deg: Zellgrösse [°]
+            depth_tolerance_m: Flächen näher als dies am Punkt → exakte Prüfung
+            pair_chunk: Maximale Anzahl Paare (Zelle, Dreieck) pro Block
+
+        Returns:
+            OcclusionBuffer
+        """
+        origin = np.asarray(origin, dtype=float).reshape(3)
+        n_elevation = max(int(round(180.0 / resolution_deg)), 2)
+        n_azimuth = 2 * n_elevation
+        resolution_deg = 180.0 / n_elevation
+        n_cells = n_azimuth * n_elevation
+
+        triangles = bvh.triangles - origin
+        az_from, az_to, el_from, el_to = _angular_bounds(triangles)
+
+        # Zellen, deren Mitte im Winkelbereich liegt (Azimut periodisch)
+        i_from = np.ceil(az_from / resolution_deg - 0.5).astype(np.intp)
+        i_to = np.floor(az_to / resolution_deg - 0.5).astype(np.intp)
+        j_from = np.maximum(np.ceil((el_from + 90.0) / resolution_deg - 0.5), 0).astype(np.intp)
+        j_to = np.minimum(np.floor((el_to + 90.0) / resolution_deg - 0.5), n_elevation - 1).astype(np.intp)
+        i_to = np.minimum(i_to, i_from + n_azimuth - 1)
+
+        n_az = np.maximum(i_to - i_from + 1, 0)
+        n_el = np.maximum(j_to - j_from + 1, 0)
+        n_pairs = n_az * n_el
+
+        cell_parts, distance_parts, building_parts = [], [], []
+        triangle_hit = np.zeros(len(triangles), dtype=bool)
+
+        for block in item_blocks(n_pairs, pair_chunk):
+            counts = n_pairs[block]
+            tri = np.repeat(block, counts)
+            local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            i = (i_from[tri] + local % n_az[tri]) % n_azimuth
+            j = j_from[tri] + local // n_az[tri]
+
+            directions = _cell_directions(i, j, resolution_deg)
+            t = ray_triangle_intersections(
+                origin, directions, bvh.triangles[tri, 0], bvh.triangles[tri, 1], bvh.triangles[tri, 2]
+            )
+            hit = ~np.isnan(t)
+
+            triangle_hit[tri[hit]] = True
+            cell_parts.append(j[hit] * n_azimuth + i[hit])
+            distance_parts.append(t[hit])
+            building_parts.append(bvh.triangle_building[tri[hit]])
+
+        cells = np.concatenate(cell_parts) if cell_parts else np.zeros(0, dtype=np.intp)
+        distance = np.concatenate(distance_parts) if distance_parts else np.zeros(0)
+        building = np.concatenate(building_parts) if building_parts else np.zeros(0, dtype=np.intp)
+
+        order = np.lexsort((distance, cells))
+        cells, distance, building = cells[order], distance[order], building[order]
+        cell_offsets = np.concatenate([[0], np.cumsum(np.bincount(cells, minlength=n_cells))])
+
+        # Dreiecke ohne Treffer einer Zellmitte: alle berührten Zellen nachprüfen
+        dirty = np.zeros(n_cells, dtype=bool)
+        for k in np.flatnonzero(~triangle_hit):
+            rows = np.arange(
+                max(int(np.floor((el_from[k] + 90.0) / resolution_deg)), 0),
+                min(int(np.floor((el_to[k] + 90.0) / resolution_deg)), n_elevation - 1) + 1,
+            )
+            first = int(np.floor(az_from[k] / resolution_deg))
+            last = min(int(np.floor(az_to[k] / resolution_deg)), first + n_azimuth - 1)
+            columns = np.arange(first, last + 1) % n_azimuth
+            dirty[(rows[:, None] * n_azimuth + columns[None, :]).ravel()] = True
+
+        return cls(
+            origin=origin,
+            resolution_deg=resolution_deg,
+            n_azimuth=n_azimuth,
+            n_elevation=n_elevation,
+            cell_offsets=cell_offsets,
+            hit_distance=distance,
+            hit_building=building,
+            dirty=dirty,
+            bvh=bvh,
+            depth_tolerance_m=depth_tolerance_m,
+        )
+
+    @property
+    def n_hits(self) -> int:
+        return len(self.hit_distance)
+
+    def blocking_pairs(
+        self,
+        ends: np.ndarray,
+        exclude_building_ids: Optional[Sequence[str]] = None,
+        exclude_key: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Blockierende Gebäude pro Sichtlinie origin → ends (wie TriangleBVH.blocking_pairs).
+
+        Args:
+            ends: (M, 3) Endpunkte (Messpunkte)
+            exclude_building_ids: (M,) Gebäude-ID pro Sichtlinie, die nicht zählt
+            exclude_key: (M,) Gebäude-Code pro Sichtlinie statt exclude_building_ids
+
+        Returns:
+            (ray_index, building_index, exact) - eindeutige Paare sortiert nach
+            Sichtlinie und (M,) Maske der exakt über die BVH geprüften Sichtlinien
+        """
+        ends = np.asarray(ends, dtype=float).reshape(-1, 3)
+        if exclude_key is None:
+            exclude_key = self.bvh._exclude_keys(exclude_building_ids, len(ends))
+
+        relative = ends - self.origin
+        horizontal = np.linalg.norm(relative[:, :2], axis=1)
+        distance = np.linalg.norm(relative, axis=1)
+        azimuth = np.degrees(np.arctan2(relative[:, 0], relative[:, 1])) % 360.0
+        elevation = np.degrees(np.arctan2(relative[:, 2], horizontal))
+
+        # Wie check_line_of_sight_3d: senkrecht über/unter dem Ursprung frei
+        active = horizontal >= 0.01
+
+        i = np.floor(azimuth / self.resolution_deg).astype(np.intp) % self.n_azimuth
+        j = np.floor((elevation + 90.0) / self.resolution_deg).astype(np.intp)
+
+        # Polnähe: Azimut-Nachbarzellen liegen zu dicht → exakt
+        uncertain = active & ((j < 1) | (j > self.n_elevation - 2))
+        j = np.clip(j, 0, self.n_elevation - 1)
+
+        # 3×3-Nachbarschaft: (M, 9) Zellen
+        di, dj = np.meshgrid([-1, 0, 1], [-1, 0, 1], indexing="ij")
+        neighbour_i = (i[:, None] + di.ravel()[None, :]) % self.n_azimuth
+        neighbour_j = np.clip(j[:, None] + dj.ravel()[None, :], 0, self.n_elevation - 1)
+        neighbours = neighbour_j * self.n_azimuth + neighbour_i
+
+        uncertain |= active & self.dirty[neighbours].any(axis=1)
+
+        # Alle Treffer aller Nachbarzellen als (Sichtlinie, Nachbar, Treffer)
+        counts = np.where(active[:, None], self.cell_offsets[neighbours + 1] - self.cell_offsets[neighbours], 0)
+        counts = counts.ravel()
+        pair = np.repeat(np.arange(counts.size), counts)
+        hit = np.repeat(self.cell_offsets[neighbours.ravel()], counts) + (
+            np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        )
+        ray = pair // 9
+        neighbour = pair % 9
+
+        hit_distance = self.hit_distance[hit]
+        hit_building = self.hit_building[hit]
+        foreign = self.bvh.building_key[hit_building] != exclude_key[ray]
+
+        # Fläche innerhalb der Tiefentoleranz um den Punkt → exakt
+        near = foreign & (np.abs(hit_distance - distance[ray]) <= self.depth_tolerance_m)
+        uncertain[ray[near]] = True
+
+        # Blockierende Gebäude pro Nachbarzelle; alle 9 Zellen müssen übereinstimmen
+        # (Schlüssel (Sichtlinie, Gebäude) · 9 + Nachbar, eindeutig pro Zelle)
+        blocking = foreign & (hit_distance < distance[ray] - self.depth_tolerance_m)
+        n_buildings = max(len(self.bvh.building_key), 1)
+        pair_key = ray[blocking].astype(np.int64) * n_buildings + hit_building[blocking]
+        per_cell = np.unique(pair_key * 9 + neighbour[blocking]) // 9
+        pair_key, n_cells = np.unique(per_cell, return_counts=True)
+        pair_ray, pair_building = np.divmod(pair_key, n_buildings)
+        uncertain[pair_ray[n_cells < 9]] = True
+
+        # Sichere Sichtlinien aus dem Puffer, unsichere exakt über die BVH
+        keep = ~uncertain[pair_ray]
+        rays, buildings = pair_ray[keep].astype(np.intp), pair_building[keep].astype(np.intp)
+
+        exact = np.flatnonzero(uncertain)
+        if len(exact):
+            exact_rays, exact_buildings = self.bvh.blocking_pairs(
+                self.origin, ends[exact], exclude_key=exclude_key[exact],
+            )
+            rays = np.concatenate([rays, exact[exact_rays]])
+            buildings = np.concatenate([buildings, exact_buildings])
+
+        order = np.lexsort((buildings, rays))
+        return rays[order], buildings[order], uncertain
+
+
+def _cell_directions(i: np.ndarray, j: np.ndarray, resolution_deg: float) -> np.ndarray:
+    """(P, 3) Einheitsvektoren durch die Zellmitten (Azimut 0° = Nord)"""
+    azimuth = np.radians((i + 0.5) * resolution_deg)
+    elevation = np.radians(-90.0 + (j + 0.5) * resolution_deg)
+    cos_el = np.cos(elevation)
+    return np.stack([cos_el * np.sin(azimuth), cos_el * np.cos(azimuth), np.sin(elevation)], axis=1)
+
+
+def _angular_bounds(triangles: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Konservativer Winkelbereich jedes Dreiecks vom Ursprung (0, 0, 0) aus.
+
+    Der Azimut ist entlang einer Strecke monoton, der Bereich der Ecken ist
+    daher exakt (Dreiecke, deren Grundriss den Ursprung enthält: 0-360°).
+    Die Elevation kann auf einer Kante über der Elevation der Ecken liegen;
+    die Schranke verwendet die extremen Höhen mit dem kleinsten bzw. grössten
+    horizontalen Abstand des Dreiecks.
+
+    Args:
+        triangles: (T, 3, 3) Dreiecke relativ zum Ursprung
+
+    Returns:
+        (az_from, az_to, el_from, el_to) in Grad; az_to - az_from <= 360
+    """
+    x, y, z = triangles[..., 0], triangles[..., 1], triangles[..., 2]
+    azimuth = np.degrees(np.arctan2(x, y))
+    relative = ((azimuth - azimuth[:, :1] + 180.0) % 360.0) - 180.0
+    az_from = azimuth[:, 0] + relative.min(axis=1)
+    az_to = azimuth[:, 0] + relative.max(axis=1)
+
+    min_horizontal = _distance_to_triangle_2d(triangles[..., :2])
+    max_horizontal = np.hypot(x, y).max(axis=1)
+
+    around = (min_horizontal < 1e-9) | (az_to - az_from > 180.0)
+    span = np.where(around, 360.0, az_to - az_from)
+    az_from = np.where(around, 0.0, az_from % 360.0)
+    az_to = az_from + span
+
+    max_z = z.max(axis=1)
+    min_z = z.min(axis=1)
+    el_to = np.degrees(np.arctan2(max_z, np.where(max_z >= 0.0, min_horizontal, max_horizontal)))
+    el_from = np.degrees(np.arctan2(min_z, np.where(min_z >= 0.0, max_horizontal, min_horizontal)))
+
+    return az_from, az_to, el_from, el_to
+
+
+def _distance_to_triangle_2d(triangles: np.ndarray) -> np.ndarray:
+    """(T,) Abstand des Ursprungs zu den Dreiecken im Grundriss (0 = innerhalb)"""
+    distance = np.full(len(triangles), np.inf)
+
+    for k in range(3):
+        a = triangles[:, k]
+        b = triangles[:, (k + 1) % 3]
+        edge = b - a
+        length2 = np.sum(edge**2, axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            s = np.clip(np.where(length2 > 0, -np.sum(a * edge, axis=1) / length2, 0.0), 0.0, 1.0)
+        distance = np.minimum(distance, np.linalg.norm(a + s[:, None] * edge, axis=1))
+
+    # Ursprung innerhalb (gleiches Vorzeichen aller Kantenprodukte)
+    cross = np.stack([
+        np.cross(triangles[:, (k + 1) % 3] - triangles[:, k], -triangles[:, k])
+        for k in range(3)
+    ], axis=1)
+    inside = (cross >= 0).all(axis=1) | (cross <= 0).all(axis=1)
+
+    return np.where(inside, 0.0, distance)
@@ -0,0 +1,209 @@
+"""
+Vektorisierter Möller-Trumbore-Schnitttest für Sichtlinien und Gebäudedreiecke.
+
+Alle Funktionen arbeiten auf Arrays: entweder paarweise (Sichtlinie i gegen
+Dreieck i, z.B. Kandidaten aus der BVH) oder dicht (M Sichtlinien gegen T
+Dreiecke, in Blöcken mit begrenztem Speicher). Die Regeln entsprechen dem
+früheren Einzeltest: Richtung normalisiert, |det| < 1e-6 gilt als parallel,
+u, v und u + v in [0, 1], Treffer bei 1e-6 < t <= Länge der Sichtlinie.
+"""
+
+from typing import Sequence, Tuple
+import numpy as np
+
+from ..config import LOS_PAIR_CHUNK
+from ..models import Building
+
+
+# Toleranz für Determinante und Strahlparameter
+_EPSILON = 1e-6
+
+
+def fan_triangles(vertices: np.ndarray) -> np.ndarray:
+    """Fan-Triangulation eines Polygons um den ersten Vertex: (K, 3, 3)"""
+    vertices = np.asarray(vertices, dtype=float).reshape(-1, 3)
+    if len(vertices) < 3:
+        return np.zeros((0, 3, 3))
+
+    n_triangles = len(vertices) - 2
+    return np.stack([
+        np.repeat(vertices[:1], n_triangles, axis=0),
+        vertices[1:-1],
+        vertices[2:],
+    ], axis=1)
+
+
+def building_triangles(
+    buildings: Sequence[Building],
+    include_roofs: bool = False,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Trianguliert die Wandflächen (optional auch Dachflächen) der Gebäude.
+
+    Entartete Dreiecke (z.B. aus geschlossenen Polygonen mit wiederholtem
+    Startpunkt) werden verworfen, sie können nie getroffen werden.
+
+    Returns:
+        (triangles (T, 3, 3), triangle_building (T,) Index in buildings)
+    """
+    parts = []
+    owners = []
+
+    for index, building in enumerate(buildings):
+        surfaces = list(building.wall_surfaces)
+        if include_roofs:
+            surfaces += list(building.roof_surfaces)
+        for surface in surfaces:
+            if surface.vertices is None or len(surface.vertices) < 3:
+                continue
+            triangles = fan_triangles(surface.vertices)
+            parts.append(triangles)
+            owners.append(np.full(len(triangles), index, dtype=np.intp))
+
+    triangles = np.concatenate(parts) if parts else np.zeros((0, 3, 3))
+    owner = np.concatenate(owners) if owners else np.zeros(0, dtype=np.intp)
+
+    normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    valid = np.linalg.norm(normals, axis=1) > 1e-12
+
+    return triangles[valid], owner[valid]
+
+
+def item_blocks(n_items: np.ndarray, chunk: int):
+    """
+    Teilt Einträge (z.B. Dreiecke oder Sichtlinien mit n_items Paaren/Stichproben
+    pro Eintrag) in Blöcke mit höchstens chunk Elementen (mind. ein Eintrag).
+
+    Yields:
+        Indexarrays der Einträge pro Block
+    """
+    start = 0
+    cumulative = np.cumsum(n_items)
+    while start < len(n_items):
+        offset = cumulative[start - 1] if start else 0
+        stop = max(int(np.searchsorted(cumulative, offset + chunk, side="right")), start + 1)
+        yield np.arange(start, stop)
+        start = stop
+
+
+def ray_triangle_intersections(
+    origins: np.ndarray,
+    directions: np.ndarray,
+    v0: np.ndarray,
+    v1: np.ndarray,
+    v2: np.ndarray,
+) -> np.ndarray:
+    """
+    Möller-Trumbore für beliebig viele Paare (Strahl, Dreieck).
+
+    Alle Argumente haben die Form (..., 3) und werden gegeneinander
+    gebroadcastet, z.B. (M, 1, 3) Strahlen gegen (1, T, 3) Dreiecke.
+
+    Args:
+        origins: Startpunkte der Strahlen
+        directions: Richtungen der Strahlen (normalisiert)
+        v0, v1, v2: Dreieck-Vertices
+
+    Returns:
+        Distanz t entlang des Strahls zum Schnittpunkt (NaN = kein Treffer)
+    """
+    edge1 = v1 - v0
+    edge2 = v2 - v0
+
+    h = np.cross(directions, edge2)
+    a = np.sum(edge1 * h, axis=-1)
+    parallel = np.abs(a) < _EPSILON
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        f = 1.0 / np.where(parallel, 1.0, a)
+
+    s = origins - v0
+    u = f * np.sum(s * h, axis=-1)
+
+    q = np.cross(s, edge1)
+    v = f * np.sum(directions * q, axis=-1)
+
+    t = f * np.sum(edge2 * q, axis=-1)
+
+    hit = (
+        ~parallel
+        & (u >= 0.0) & (u <= 1.0)
+        & (v >= 0.0) & (u + v <= 1.0)
+        & (t > _EPSILON)
+    )
+    return np.where(hit, t, np.nan)
+
+
+def segment_triangle_hits(
+    origins: np.ndarray,
+    ends: np.ndarray,
+    triangles: np.ndarray,
+) -> np.ndarray:
+    """
+    Paarweiser Test: schneidet Dreieck i die Sichtlinie origins[i] → ends[i]?
+
+    Args:
+        origins: (P, 3) Startpunkte
+        ends: (P, 3) Endpunkte
+        triangles: (P, 3, 3) Dreiecke
+
+    Returns:
+        (P,) bool
+    """
+    direction = ends - origins
+    length = np.linalg.norm(direction, axis=-1)
+    active = length >= 0.01  # Start == End: kein Treffer
+
+    unit = direction / np.where(active, length, 1.0)[..., None]
+    t = ray_triangle_intersections(
+        origins, unit, triangles[..., 0, :], triangles[..., 1, :], triangles[..., 2, :]
+    )
+
+    with np.errstate(invalid="ignore"):
+        return active & (t <= length)
+
+
+def segment_building_hits(
+    origins: np.ndarray,
+    ends: np.ndarray,
+    triangles: np.ndarray,
+    triangle_building: np.ndarray,
+    n_buildings: int,
+    pair_chunk: int = LOS_PAIR_CHUNK,
+) -> np.ndarray:
+    """
+    Dichter Test: M Sichtlinien gegen alle T Dreiecke.
+
+    Die Sichtlinien werden so in Blöcke geteilt, dass pro Block höchstens
+    pair_chunk Paare (Sichtlinie, Dreieck) gleichzeitig im Speicher liegen.
+
+    Args:
+        origins: (M, 3) oder (3,) Startpunkte
+        ends: (M, 3) Endpunkte
+        triangles: (T, 3, 3) Dreiecke
+        triangle_building: (T,) Gebäudeindex pro Dreieck
+        n_buildings: Anzahl Gebäude B
+        pair_chunk: Maximale Anzahl Paare pro Block
+
+    Returns:
+        (M, B) bool - Gebäude b blockiert Sichtlinie m (ein Gebäude zählt
+        einmal, egal wie viele seiner Dreiecke getroffen werden);
+        Anzahl blockierender Gebäude = hits.sum(axis=1)
+    """
+    ends = np.asarray(ends, dtype=float).reshape(-1, 3)
+    origins = np.broadcast_to(np.asarray(origins, dtype=float).reshape(-1, 3), ends.shape)
+    hits = np.zeros((len(ends), n_buildings), dtype=bool)
+
+    if len(triangles) == 0:
+        return hits
+
+    ray_chunk = max(1, pair_chunk // len(triangles))
+    for start in range(0, len(ends), ray_chunk):
+        stop = min(start + ray_chunk, len(ends))
+        triangle_hit = segment_triangle_hits(
+            origins[start:stop, None, :], ends[start:stop, None, :], triangles[None, :, :, :]
+        )
+        rays, hit_triangles = np.nonzero(triangle_hit)
+        hits[start + rays, triangle_building[hit_triangles]] = True
+
+    return hits
@@ -0,0 +1,161 @@
+"""
+Terrain-Abschattung von Sichtlinien über ein Höhenmodell (swissALTI3D).
+
+Das Höhenmodell liegt als reguläres E/N-Gitter vor (swissALTI3D: 2 m).
+Sichtlinien Antenne → Punkt werden vektorisiert in Schritten von einer
+halben Gitterweite abgetastet; die Terrainhöhe wird bilinear zwischen den
+Gitterpunkten interpoliert. Liegt eine Stichprobe unter dem Terrain, ist die
+Sichtlinie durch das Gelände abgeschattet (z.B. Hügelkuppe zwischen Antenne
+und Punkt).
+
+Stichproben näher als margin_m (horizontal) an Antenne oder Punkt werden
+ausgelassen: Messpunkte liegen am Fassadenfuss knapp über dem Terrain, und
+die Interpolation glättet Geländekanten. Gitterpunkte ohne Daten (NaN)
+blockieren nie.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Sequence
+import numpy as np
+
+from ..config import LOS_PAIR_CHUNK, TERRAIN_LOS_MARGIN_M
+from .ray_triangle import item_blocks
+
+
+@dataclass
+class TerrainGrid:
+    """Reguläres Höhengitter (z.B. eine oder mehrere swissALTI3D-Kacheln)"""
+    origin: np.ndarray  # (2,) E, N des Gitterpunkts [0, 0]
+    cell_size_m: float  # Gitterweite [m]
+    heights: np.ndarray  # (ny, nx) float32 Höhe [m ü.M.] (NaN = keine Daten), Zeile = N
+
+    @property
+    def shape(self):
+        return self.heights.shape
+
+    @classmethod
+    def from_points(cls, points: np.ndarray) -> "TerrainGrid":
+        """
+        Baut das Gitter aus regelmässig angeordneten Punkten (E, N, H),
+        z.B. dem Inhalt einer swissALTI3D-XYZ-Datei.
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        e_values = np.unique(points[:, 0])
+        n_values = np.unique(points[:, 1])
+        steps = np.concatenate([np.diff(e_values), np.diff(n_values)])
+        cell_size = float(steps.min()) if len(steps) else 1.0
+
+        origin = np.array([e_values[0], n_values[0]])
+        ix = np.round((points[:, 0] - origin[0]) / cell_size).astype(np.intp)
+        iy = np.round((points[:, 1] - origin[1]) / cell_size).astype(np.intp)
+
+        heights = np.full((iy.max() + 1, ix.max() + 1), np.nan, dtype=np.float32)
+        heights[iy, ix] = points[:, 2]
+
+        return cls(origin=origin, cell_size_m=cell_size, heights=heights)
+
+    @classmethod
+    def mosaic(cls, grids: Sequence["TerrainGrid"]) -> "TerrainGrid":
+        """Fügt Kacheln mit gleicher Gitterweite (und gleichem Raster) zusammen."""
+        cell_size = grids[0].cell_size_m
+        origin = np.min([g.origin for g in grids], axis=0)
+        offsets = [np.round((g.origin - origin) / cell_size).astype(np.intp) for g in grids]
+        ny = max(int(o[1]) + g.shape[0] for g, o in zip(grids, offsets))
+        nx = max(int(o[0]) + g.shape[1] for g, o in zip(grids, offsets))
+
+        heights = np.full((ny, nx), np.nan, dtype=np.float32)
+        for grid, (ox, oy) in zip(grids, offsets):
+            target = heights[oy:oy + grid.shape[0], ox:ox + grid.shape[1]]
+            np.copyto(target, grid.heights, where=np.isfinite(grid.heights))
+
+        return cls(origin=origin, cell_size_m=cell_size, heights=heights)
+
+    def save(self, path: Path) -> None:
+        """Speichert das Gitter als kompaktes .npz (Höhen als float32)"""
+        np.savez(
+            path,
+            origin=self.origin,
+            cell_size_m=np.float64(self.cell_size_m),
+            heights=self.heights.astype(np.float32),
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "TerrainGrid":
+        """Lädt ein mit save() geschriebenes Gitter"""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                origin=data["origin"],
+                cell_size_m=float(data["cell_size_m"]),
+                heights=data["heights"],
+            )
+
+    def height_at(self, e: np.ndarray, n: np.ndarray) -> np.ndarray:
+        """Bilinear interpolierte Terrainhöhe (NaN ausserhalb/ohne Daten)"""
+        ny, nx = self.shape
+        gx = (np.asarray(e, dtype=float) - self.origin[0]) / self.cell_size_m
+        gy = (np.asarray(n, dtype=float) - self.origin[1]) / self.cell_size_m
+
+        inside = (gx >= 0) & (gx <= nx - 1) & (gy >= 0) & (gy <= ny - 1)
+        ix = np.clip(np.floor(gx).astype(np.intp), 0, max(nx - 2, 0))
+        iy = np.clip(np.floor(gy).astype(np.intp), 0, max(ny - 2, 0))
+        fx = np.clip(gx - ix, 0.0, 1.0)
+        fy = np.clip(gy - iy, 0.0, 1.0)
+        ix1 = np.minimum(ix + 1, nx - 1)
+        iy1 = np.minimum(iy + 1, ny - 1)
+
+        h = self.heights
+        height = (
+            (h[iy, ix] * (1 - fx) + h[iy, ix1] * fx) * (1 - fy)
+            + (h[iy1, ix] * (1 - fx) + h[iy1, ix1] * fx) * fy
+        )
+        return np.where(inside, height, np.nan)
+
+    def blocked(
+        self,
+        origins: np.ndarray,
+        ends: np.ndarray,
+        margin_m: float = TERRAIN_LOS_MARGIN_M,
+        pair_chunk: int = LOS_PAIR_CHUNK,
+    ) -> np.ndarray:
+        """
+        Sichtlinien, die unter dem Terrain verlaufen.
+
+        Args:
+            origins: (M, 3) oder (3,) Startpunkte (Antennenposition)
+            ends: (M, 3) Endpunkte (Messpunkte)
+            margin_m: Horizontaler Abstand zu Start und Ende ohne Prüfung [m]
+            pair_chunk: Maximale Anzahl Stichproben pro Block
+
+        Returns:
+            (M,) bool
+        """
+        ends = np.asarray(ends, dtype=float).reshape(-1, 3)
+        origins = np.broadcast_to(np.asarray(origins, dtype=float).reshape(-1, 3), ends.shape)
+        blocked = np.zeros(len(ends), dtype=bool)
+
+        delta = ends - origins
+        horizontal = np.linalg.norm(delta[:, :2], axis=1)
+
+        # Stichproben bei s = (k + 0.5) / n, höchstens eine halbe Gitterweite
+        # auseinander, nur mit mindestens margin_m Abstand zu beiden Enden
+        n_samples = np.ceil(2.0 * horizontal / self.cell_size_m)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            s_margin = np.where(horizontal > 0, margin_m / horizontal, 1.0)
+        k_first = np.maximum(np.ceil(s_margin * n_samples - 0.5), 0).astype(np.intp)
+        k_last = np.floor((1.0 - s_margin) * n_samples - 0.5).astype(np.intp)
+        n_samples = n_samples.astype(np.intp)
+        counts = np.maximum(k_last - k_first + 1, 0)
+
+        for block in item_blocks(counts, pair_chunk):
+            block_counts = counts[block]
+            ray = np.repeat(block, block_counts)
+            k = np.arange(block_counts.sum()) - np.repeat(np.cumsum(block_counts) - block_counts, block_counts)
+            s = (k + k_first[ray] + 0.5) / n_samples[ray]
+
+            sample = origins[ray] + s[:, None] * delta[ray]
+            with np.errstate(invalid="ignore"):
+                under = sample[:, 2] < self.height_at(sample[:, 0], sample[:, 1])
+            blocked[ray[under]] = True
+
+        return blocked
@@ -5,7 +5,8 @@ Parst die OMEN-Standortdatenblatt-Excel-Datei und extrahiert Antennendaten.
 """
 
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
+import re
 import pandas as pd
 
 from ..models import LV95Coordinate, Antenna, AntennaSystem, OMENLocation
@@ -35,6 +36,12 @@ class AntennaSheetRows:
     TILT_TO = 21  # Gesamter Neigungswinkel bis (180)
 
 
+# Azimut-Bereich direkt in der Azimut-Zelle, z.B. "20-60", "350 bis 10"
+_AZIMUT_RANGE_PATTERN = re.compile(
+    r"^\s*(\d+(?:[.,]\d+)?)\s*(?:-|–|bis|\.\.)\s*(\d+(?:[.,]\d+)?)\s*$"
+)
+
+
 def load_omen_data(filepath: Path) -> AntennaSystem:
     """
     Lädt Antennendaten aus einer OMEN XLS-Datei.
@@ -147,8 +154,10 @@ def _parse_antennas(df: pd.DataFrame, base_position: LV95Coordinate) -> list[Ant
 
         position = base_position.offset(x_offset, y_offset, z_height)
 
-        # Azimut und Tilt
-        azimut = float(_get_cell_value(df, AntennaSheetRows.AZIMUT, col_idx, 0))
+        # Azimut (fest oder Bereich für die Worst-Case-Suche) und Tilt
+        azimut, azimut_from, azimut_to = _parse_azimuth(
+            _get_cell_value(df, AntennaSheetRows.AZIMUT, col_idx, 0)
+        )
         tilt = float(_get_cell_value(df, AntennaSheetRows.TILT, col_idx, 0))
         tilt_from = float(_get_cell_value(df, AntennaSheetRows.TILT_FROM, col_idx, tilt))
         tilt_to = float(_get_cell_value(df, AntennaSheetRows.TILT_TO, col_idx, tilt))
@@ -166,12 +175,34 @@ def _parse_antennas(df: pd.DataFrame, base_position: LV95Coordinate) -> list[Ant
             antenna_type=antenna_type,
             is_adaptive=is_adaptive,
             sub_arrays=sub_arrays,
+            azimuth_from_deg=azimut_from,
+            azimuth_to_deg=azimut_to,
         )
         antennas.append(antenna)
 
     return antennas
 
 
+def _parse_azimuth(value) -> Tuple[float, Optional[float], Optional[float]]:
+    """
+    Parst die Azimut-Zelle.
+
+    Returns:
+        (azimut, azimut_von, azimut_bis) - von/bis None bei festem Azimut.
+        Bei einem Bereich ist azimut die Mitte (im Uhrzeigersinn von -> bis).
+    """
+    if isinstance(value, str):
+        match = _AZIMUT_RANGE_PATTERN.match(value)
+        if match:
+            azimut_from = float(match.group(1).replace(",", "."))
+            azimut_to = float(match.group(2).replace(",", "."))
+            span = (azimut_to - azimut_from) % 360.0
+            return (azimut_from + span / 2.0) % 360.0, azimut_from, azimut_to
+        value = value.replace(",", ".")
+
+    return float(value), None, None
+
+
 def _get_cell_value(df: pd.DataFrame, row: int, col: int, default=None):
     """Sichere Zellenabfrage mit Default-Wert."""
     try:
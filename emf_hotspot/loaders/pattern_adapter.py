@@ -8,6 +8,7 @@ import numpy as np
 from pathlib import Path
 from typing import Tuple, Optional
 
+from ..config import PATTERN_LUT_RESOLUTION_DEG
 from ..models import AntennaPattern, AntennaSystem
 from ..patterns import load_antenna_patterns, PatternData
 
@@ -102,6 +103,9 @@ def load_patterns_with_standard_fallback(
             frequency_band=freq_band
         )
 
+        # Lookup-Tabellen einmalig beim Laden erstellen (read-only, teilbar)
+        pattern.compile_lut(PATTERN_LUT_RESOLUTION_DEG)
+
         patterns[(antenna_type, freq_band)] = pattern
 
         # Zeige Quelle
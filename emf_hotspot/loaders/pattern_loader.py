@@ -10,7 +10,7 @@ from typing import Optional
 import numpy as np
 
 from ..models import AntennaPattern, AntennaSystem
-from ..config import FREQUENCY_BAND_MAPPING
+from ..config import FREQUENCY_BAND_MAPPING, PATTERN_LUT_RESOLUTION_DEG
 
 
 def load_antenna_pattern(
@@ -126,6 +126,7 @@ def load_all_patterns(
     for antenna_type, freq_band in needed:
         pattern = _find_and_load_pattern(pattern_dir, antenna_type, freq_band)
         if pattern:
+            pattern.compile_lut(PATTERN_LUT_RESOLUTION_DEG)
             patterns[(antenna_type, freq_band)] = pattern
 
     return patterns
@@ -6,6 +6,7 @@ import numpy as np
 from pathlib import Path
 from typing import Tuple
 
+from ..config import PATTERN_LUT_RESOLUTION_DEG
 from ..models import AntennaPattern, AntennaSystem
 
 
@@ -108,6 +109,9 @@ def load_patterns_from_ods(
                 v_gains=v_gains,
             )
 
+            # Lookup-Tabellen einmalig beim Laden erstellen (read-only, teilbar)
+            pattern.compile_lut(PATTERN_LUT_RESOLUTION_DEG)
+
             patterns[(omen_type, omen_freq)] = pattern
             print(f"    - {omen_type} @ {omen_freq} MHz: H={len(h_angles)} Punkte, V={len(v_angles)} Punkte")
 
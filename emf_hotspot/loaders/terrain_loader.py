@@ -11,6 +11,8 @@ from pathlib import Path
 import zipfile
 import io
 
+from ..geometry.terrain import TerrainGrid
+
 
 def get_swissalti3d_tile(center_e: float, center_n: float) -> Tuple[int, int]:
     """
@@ -32,6 +34,10 @@ def get_swissalti3d_tile(center_e: float, center_n: float) -> Tuple[int, int]:
     return tile_e, tile_n
 
 
+def _default_cache_dir() -> Path:
+    return Path.home() / ".cache" / "stdb-scout" / "swissalti3d"
+
+
 def download_swissalti3d_tile(tile_e: int, tile_n: int, cache_dir: Path = None) -> Optional[Path]:
     """
     Lädt eine SwissALTI3D-Kachel von swisstopo.
@@ -45,7 +51,7 @@ def download_swissalti3d_tile(tile_e: int, tile_n: int, cache_dir: Path = None)
         Pfad zur heruntergeladenen XYZ-Datei oder None bei Fehler
     """
     if cache_dir is None:
-        cache_dir = Path.home() / ".cache" / "stdb-scout" / "swissalti3d"
+        cache_dir = _default_cache_dir()
 
     cache_dir.mkdir(parents=True, exist_ok=True)
 
@@ -84,6 +90,93 @@ def download_swissalti3d_tile(tile_e: int, tile_n: int, cache_dir: Path = None)
         return None
 
 
+def _read_xyz(xyz_file: Path) -> np.ndarray:
+    """Liest eine XYZ-Datei (E N H), mit oder ohne Kopfzeile"""
+    with open(xyz_file, "r") as f:
+        first = f.readline().split()
+    try:
+        [float(v) for v in first]
+        skip = 0
+    except ValueError:
+        skip = 1
+    return np.loadtxt(xyz_file, skiprows=skip, ndmin=2)
+
+
+def load_terrain_tile_grid(tile_e: int, tile_n: int, cache_dir: Path = None) -> Optional[TerrainGrid]:
+    """
+    Lädt eine SwissALTI3D-Kachel als Höhengitter.
+
+    Die XYZ-Datei wird nur beim ersten Mal geparst; das Gitter wird als
+    kompaktes Binär-Array (float32, ~1 MB pro Kachel) neben der XYZ-Datei
+    gecacht.
+
+    Args:
+        tile_e: Kachel E-Koordinate in km
+        tile_n: Kachel N-Koordinate in km
+        cache_dir: Verzeichnis zum Cachen der Downloads
+
+    Returns:
+        TerrainGrid oder None bei Fehler
+    """
+    if cache_dir is None:
+        cache_dir = _default_cache_dir()
+
+    grid_file = Path(cache_dir) / f"swissalti3d_2024_{tile_e}-{tile_n}_grid.npz"
+    if grid_file.exists():
+        try:
+            return TerrainGrid.load(grid_file)
+        except (OSError, KeyError, ValueError) as e:
+            print(f"  WARNUNG: Terrain-Cache {grid_file.name} unlesbar ({e}), wird neu aufgebaut")
+
+    xyz_file = download_swissalti3d_tile(tile_e, tile_n, Path(cache_dir))
+    if xyz_file is None or not xyz_file.exists():
+        return None
+
+    try:
+        grid = TerrainGrid.from_points(_read_xyz(xyz_file))
+    except (OSError, ValueError) as e:
+        print(f"  WARNUNG: Fehler beim Laden von {xyz_file.name}: {e}")
+        return None
+
+    grid.save(grid_file)
+    return grid
+
+
+def load_terrain_grid(
+    center_e: float,
+    center_n: float,
+    radius_m: float,
+    cache_dir: Path = None,
+) -> Optional[TerrainGrid]:
+    """
+    Lädt das Höhengitter für einen Bereich (alle berührten Kacheln).
+
+    Args:
+        center_e: LV95 E-Koordinate des Zentrums
+        center_n: LV95 N-Koordinate des Zentrums
+        radius_m: Radius in Metern
+        cache_dir: Verzeichnis zum Cachen der Downloads
+
+    Returns:
+        TerrainGrid oder None, falls keine Kachel verfügbar ist
+    """
+    tile_min_e, tile_min_n = get_swissalti3d_tile(center_e - radius_m, center_n - radius_m)
+    tile_max_e, tile_max_n = get_swissalti3d_tile(center_e + radius_m, center_n + radius_m)
+
+    grids = []
+    for tile_e in range(tile_min_e, tile_max_e + 1):
+        for tile_n in range(tile_min_n, tile_max_n + 1):
+            grid = load_terrain_tile_grid(tile_e, tile_n, cache_dir)
+            if grid is not None:
+                grids.append(grid)
+
+    if not grids:
+        print("  WARNUNG: Keine Terrain-Daten gefunden")
+        return None
+
+    return TerrainGrid.mosaic(grids)
+
+
 def load_terrain_mesh(
     center_e: float,
     center_n: float,
@@ -9,8 +9,22 @@ from pathlib import Path
 from typing import Optional
 import sys
 
-from .config import AGW_LIMIT_VM, DEFAULT_RADIUS_M, DEFAULT_RESOLUTION_M
-from .models import AntennaSystem, Building, FacadePoint, HotspotResult
+import numpy as np
+
+from .config import (
+    ADAPTIVE_COARSE_RESOLUTION_M,
+    ADAPTIVE_SCAN_AZIMUTH_DEG,
+    AGW_LIMIT_VM,
+    DEFAULT_RADIUS_M,
+    DEFAULT_RESOLUTION_M,
+    LOS_BUFFER_RESOLUTION_DEG,
+    LOS_DSM_RESOLUTION_M,
+    SCREENING_FRACTION,
+    TERRAIN_LOS_ATTENUATION_DB,
+    VOLUME_HEIGHT_M,
+    VOLUME_RESOLUTION_M,
+)
+from .models import AntennaSystem, Building, FacadePoint, FacadePointArray, ResultTable
 from .loaders.omen_loader import load_omen_data
 from .loaders.pattern_loader_ods import load_patterns_from_ods
 from .loaders.pattern_adapter import load_patterns_with_standard_fallback
@@ -25,7 +39,8 @@ from .geometry.facade_sampling import (
     filter_points_by_distance,
     create_virtual_omen_points,
 )
-from .physics.summation import calculate_all_points, calculate_hotspots
+from .physics.field_engine import calculate_field_batch
+from .physics.field_cache import FIELD_CACHE_FILENAME, FieldCache
 from .output.csv_export import (
     export_hotspots_csv,
     export_hotspots_with_antenna_details_csv,
@@ -43,6 +58,7 @@ from .output.visualization import (
     create_heatmap_image,
     create_hotspot_marker_map,
     export_to_vtk,
+    export_volume_to_vti,
 )
 from .output.omen_export import create_neuomen_workbooks
 
@@ -59,7 +75,20 @@ def analyze_site(
     visualize: bool = False,  # Default: disabled (OpenGL issues on headless servers)
     parallel: bool = True,  # Parallele Berechnung (multiprocessing)
     n_workers: Optional[int] = None,  # Anzahl Worker (None = CPU-Kerne)
-) -> list[HotspotResult]:
+    mode: str = "facade",  # "facade" oder "volume" (zusätzlich 3D-Feldgitter)
+    volume_resolution_m: float = VOLUME_RESOLUTION_M,
+    volume_height_m: float = VOLUME_HEIGHT_M,
+    adaptive: bool = False,  # Adaptive Verfeinerung um den Grenzwert
+    coarse_resolution_m: float = ADAPTIVE_COARSE_RESOLUTION_M,
+    screening: bool = False,  # Gebäude-Screening mit Feldstärke-Obergrenzen
+    screening_fraction: float = SCREENING_FRACTION,
+    hotspots_only: bool = False,  # Unkritische Gebäude ganz überspringen
+    beam_sweep: bool = False,  # Strahlschwenk adaptiver Antennen (Worst-Case über alle Beams)
+    los_mode: str = "bvh",  # "bvh", "buffer" (Tiefenpuffer um die Antenne) oder "dsm" (2.5D-Raster)
+    los_scope: str = "hotspots",  # LOS nur für Punkte über dem Schwellwert oder für alle ("all")
+    los_cache: bool = True,  # Persistenter LOS-Cache in ~/.cache/emf_hotspot/los
+    terrain_los: bool = False,  # Sichtlinien zusätzlich durch das Gelände (swissALTI3D) prüfen
+) -> ResultTable:
     """
     Führt eine vollständige Hotspot-Analyse für einen Standort durch.
 
@@ -73,10 +102,40 @@ def analyze_site(
         threshold_vm: Schwellwert für Hotspots [V/m]
         auto_download_buildings: Ob Gebäude automatisch geladen werden
         visualize: Ob 3D-Visualisierung erstellt wird
+        mode: "facade" (nur Fassaden/Dächer) oder "volume" (zusätzlich
+              E-Feld auf einem E/N/H-Gitter, Export als .vti neben dem VTM)
+        volume_resolution_m: Gitterabstand im Volumen-Modus [m]
+        volume_height_m: Vertikale Ausdehnung ab Basishöhe im Volumen-Modus [m]
+        adaptive: Nur Rasterbereiche nahe/über dem Grenzwert bis resolution_m
+                  verfeinern (Hotspots und Maximum wie beim dichten Raster)
+        coarse_resolution_m: Gröbste Blockgrösse der adaptiven Verfeinerung [m],
+                             zugleich Auflösung für unkritische Gebäude beim Screening
+        screening: Gebäude mit Obergrenze < screening_fraction × threshold_vm
+                   nur mit coarse_resolution_m abtasten
+        screening_fraction: Anteil des Schwellwerts für das Screening
+        hotspots_only: Unkritische Gebäude überspringen (impliziert screening)
+        beam_sweep: Adaptive Antennen (is_adaptive) mit Worst-Case über alle
+                    Schwenkrichtungen rechnen (Azimut-Scanbereich, Tilt-Bereich)
+        los_mode: LOS-Verfahren: "bvh" (jede Sichtlinie exakt durch die BVH)
+                  oder "buffer" (sphärischer Tiefenpuffer um die Antenne,
+                  exakte Nachprüfung an Kanten; lohnt sich bei vielen Punkten)
+                  oder "dsm" (2.5D-Gebäuderaster, genähert, für grosse Radien)
+        los_scope: "hotspots" (LOS nur für Punkte über dem Schwellwert im
+                   Freiraum) oder "all" (LOS und Gebäudedämpfung für alle
+                   Punkte, parallel bei parallel=True)
+        los_cache: Bereits geprüfte Sichtlinien (gleiche Gebäude und
+                   Antennenposition) aus ~/.cache/emf_hotspot/los übernehmen
+        terrain_los: Sichtlinien zusätzlich durch das swissALTI3D-Höhenmodell
+                     führen (Abschattung durch Gelände, Kacheln als Gitter gecacht)
 
     Returns:
-        Liste aller HotspotResults
+        ResultTable aller Punkte (Iteration liefert HotspotResult)
     """
+    if mode not in ("facade", "volume"):
+        raise ValueError(f"Unbekannter Modus: {mode} (erlaubt: facade, volume)")
+    if los_scope not in ("hotspots", "all"):
+        raise ValueError(f"Unbekannter LOS-Umfang: {los_scope} (erlaubt: hotspots, all)")
+
     # 1. Antennendaten laden (müssen wir zuerst laden, um die Adresse zu bekommen)
     print("=" * 60)
     print("EMF-Hotspot-Finder")
@@ -109,8 +168,23 @@ def analyze_site(
         else:
             tilt_info = f"Tilt {ant.tilt_deg:.0f}°"
 
+        # Azimut-Anzeige: Zeige Bereich falls vorhanden
+        if ant.azimuth_from_deg is not None and ant.azimuth_to_deg is not None:
+            azimuth_info = f"Azimut {ant.azimuth_from_deg:.0f}° bis {ant.azimuth_to_deg:.0f}° (Worst-Case-Suche)"
+        else:
+            azimuth_info = f"Azimut {ant.azimuth_deg}°"
+
         print(f"    - Ant {ant.id}: {ant.frequency_band} MHz, {ant.erp_watts:.0f} W, "
-              f"Azimut {ant.azimuth_deg}°, {tilt_info}")
+              f"{azimuth_info}, {tilt_info}")
+
+    # Gleichwertige Antennen (Position, Richtung, Diagramm) zu Quellen zusammenfassen
+    from .physics.source_planning import plan_sources
+
+    source_plan = plan_sources(antenna_system)
+    sources = source_plan.sources
+    for ids in source_plan.merged_groups:
+        print(f"  → Antennen {', '.join(str(i) for i in ids)} als eine Quelle berechnet "
+              f"(gleiche Position, Richtung und Diagramm)")
 
     # 2. Antennendiagramme laden
     print(f"\n[2/6] Lade Antennendiagramme...")
@@ -172,6 +246,20 @@ Optionen:
 
     print(f"  Geladene Diagramme: {len(patterns)}")
 
+    # Strahlschwenk adaptiver Antennen: 2D-Hüllkurven einmal vorberechnen
+    adaptive_envelopes = None
+    if beam_sweep:
+        from .physics.adaptive_envelope import adaptive_scan_range, build_adaptive_envelopes
+
+        adaptive_envelopes = build_adaptive_envelopes(antenna_system, patterns)
+        for ant in antenna_system.antennas:
+            if ant.id in adaptive_envelopes:
+                (az_from, az_to), (el_from, el_to) = adaptive_scan_range(ant)
+                print(f"  Strahlschwenk Ant {ant.id}: Azimut {az_from:+.0f}° bis {az_to:+.0f}°, "
+                      f"Elevation {el_from:.0f}° bis {el_to:.0f}°")
+        if not adaptive_envelopes:
+            print("  Strahlschwenk: keine adaptiven Antennen im Antennensystem")
+
     # 3. Gebäudedaten laden
     print(f"\n[3/6] Lade Gebäudedaten...")
     buildings = []
@@ -269,24 +357,59 @@ Optionen:
 
     # 4. Fassaden- und Dachpunkte generieren
     print(f"\n[4/6] Generiere Fassaden- und Dachpunkte (Auflösung: {resolution_m}m)...")
-    all_points = []
+    point_arrays = []
+
+    # Adaptiv: gleiche Rasterpunkte, zusätzlich mit Rasterindizes pro Fläche
+    if adaptive:
+        from .geometry.adaptive_sampling import (
+            FacadeLattice,
+            calculate_field_adaptive,
+            filter_lattice_by_distance,
+            lattice_all_facades,
+            lattice_all_roofs,
+        )
+        sample_facades, sample_roofs = lattice_all_facades, lattice_all_roofs
+    else:
+        sample_facades, sample_roofs = sample_all_facades, sample_all_roofs
+
+    # Gebäude-Screening: Obergrenze pro Gebäude aus Bounding-Box und Diagrammen
+    screened_ids = set()
+    if screening or hotspots_only:
+        from .physics.screening import screen_buildings
+
+        building_screening = screen_buildings(
+            buildings, sources, patterns,
+            threshold_vm=threshold_vm,
+            fraction=screening_fraction,
+            adaptive_envelopes=adaptive_envelopes,
+        )
+        screened_ids = building_screening.below_limit
+        action = "übersprungen" if hotspots_only else f"grob abgetastet ({coarse_resolution_m}m)"
+        print(f"  Screening: {len(screened_ids)} von {len(buildings)} Gebäuden "
+              f"mit Obergrenze < {building_screening.limit_vm:.2f} V/m → {action}")
 
     for building in buildings:
+        building_resolution = resolution_m
+        if building.id in screened_ids:
+            if hotspots_only:
+                continue
+            building_resolution = max(coarse_resolution_m, resolution_m)
+
         # Fassaden
-        facade_points = sample_all_facades(
+        facade_points = sample_facades(
             building.wall_surfaces,
-            resolution_m,
+            building_resolution,
             building.id,
         )
-        all_points.extend(facade_points)
+        point_arrays.append(facade_points)
 
         # Dächer
-        roof_points = sample_all_roofs(
+        roof_points = sample_roofs(
             building.roof_surfaces,
-            resolution_m,
+            building_resolution,
             building.id,
         )
-        all_points.extend(roof_points)
+        point_arrays.append(roof_points)
 
     # Virtuelle Gebäude samplen
     if virtual_building_objects:
@@ -294,12 +417,12 @@ Optionen:
         virtual_points_count = 0
         for virt_building in virtual_building_objects:
             # Fassaden
-            facade_points = sample_all_facades(
+            facade_points = sample_facades(
                 virt_building.wall_surfaces,
                 resolution_m,
                 virt_building.id,
             )
-            all_points.extend(facade_points)
+            point_arrays.append(facade_points)
             virtual_points_count += len(facade_points)
 
         print(f"  → {virtual_points_count} virtuelle Messpunkte hinzugefügt")
@@ -311,87 +434,137 @@ Optionen:
             buildings=buildings,
             resolution_m=resolution_m,
         )
-        if omen_points:
-            all_points.extend(omen_points)
+        if len(omen_points):
+            point_arrays.append(FacadeLattice.from_points(omen_points) if adaptive else omen_points)
             print(f"  → {len(omen_points)} Bauplatz-OMEN-Punkte hinzugefügt (Gebäude noch nicht gebaut)")
 
     # Nach Radius filtern
-    all_points = filter_points_by_distance(
-        all_points,
-        antenna_system.base_position.e,
-        antenna_system.base_position.n,
-        radius_m,
-    )
+    if adaptive:
+        lattice = filter_lattice_by_distance(
+            FacadeLattice.concatenate(point_arrays),
+            antenna_system.base_position.e,
+            antenna_system.base_position.n,
+            radius_m,
+        )
+        all_points = lattice.points
+    else:
+        all_points = filter_points_by_distance(
+            FacadePointArray.concatenate(point_arrays),
+            antenna_system.base_position.e,
+            antenna_system.base_position.n,
+            radius_m,
+        )
 
-    print(f"  Fassadenpunkte: {len(all_points)} ({len([p for p in all_points if 'VIRTUAL' in p.building_id])} virtuell)")
+    print(f"  Fassadenpunkte: {len(all_points)} ({int(all_points.building_mask(lambda b: 'VIRTUAL' in b).sum())} virtuell)")
+
+    if screened_ids:
+        from .physics.screening import count_raster_points
+
+        full_count = count_raster_points(
+            [b for b in buildings if b.id in screened_ids],
+            resolution_m,
+            antenna_system.base_position.e,
+            antenna_system.base_position.n,
+            radius_m,
+        )
+        screened_count = int(all_points.building_mask(lambda b: b in screened_ids).sum())
+        print(f"  → Screening: {full_count - screened_count} Punkte eingespart "
+              f"({screened_count} statt {full_count} Punkte auf unkritischen Gebäuden)")
 
     # 5. E-Feldstärke berechnen
     print(f"\n[5/6] Berechne E-Feldstärken...")
 
-    # Parallele oder serielle Berechnung
-    if parallel and len(all_points) > 100:
+    # Adaptive, parallele oder serielle Berechnung
+    if adaptive:
+        print(f"  → Adaptive Verfeinerung ({coarse_resolution_m}m → {resolution_m}m)...")
+        adaptive_result = calculate_field_adaptive(
+            lattice,
+            sources,
+            patterns,
+            resolution_m=resolution_m,
+            threshold_vm=threshold_vm,
+            coarse_resolution_m=coarse_resolution_m,
+            parallel=parallel,
+            n_workers=n_workers,
+            adaptive_envelopes=adaptive_envelopes,
+        )
+        all_points = adaptive_result.points
+        batch = adaptive_result.batch
+        share = 100.0 * len(all_points) / max(adaptive_result.n_lattice_points, 1)
+        print(f"  → {len(all_points)} von {adaptive_result.n_lattice_points} Rasterpunkten berechnet ({share:.1f}%)")
+    elif parallel and len(all_points) > 100:
         print(f"  → Parallele Berechnung mit {n_workers or 'allen'} CPU-Kernen...")
-        from .physics.summation_parallel import calculate_all_points_parallel
-        results = calculate_all_points_parallel(
-            all_points, antenna_system, patterns, n_workers=n_workers
+        from .physics.summation_parallel import calculate_field_batch_parallel
+        batch = calculate_field_batch_parallel(
+            all_points, sources, patterns, n_workers=n_workers,
+            adaptive_envelopes=adaptive_envelopes,
         )
     else:
         if parallel:
             print(f"  → Serielle Berechnung (zu wenige Punkte für Parallelisierung)")
-        results = calculate_all_points(all_points, antenna_system, patterns)
+        batch = calculate_field_batch(
+            all_points, sources, patterns, adaptive_envelopes=adaptive_envelopes,
+        )
+
+    # Beiträge der Quellen auf die ursprünglichen Antennen aufteilen
+    batch = source_plan.expand(batch)
+    results = ResultTable.from_batch(all_points, batch, threshold_vm=threshold_vm)
 
     print(f"  Berechnete Punkte: {len(results)}")
 
+    # LOS wird nur für Punkte über dem Schwellwert (Freiraum) geprüft, mit --los all für alle
+    if buildings and los_scope == "hotspots":
+        los_checked = results.exceeds_limit
+    else:
+        los_checked = np.ones(len(results), dtype=bool)
+
     # 5b. Line-of-Sight Analyse (VOR Hotspot-Identifikation!)
     # Gebäude im LOS dämpfen die Strahlung → E-Feld reduzieren
     if results and buildings:
         print(f"  → LOS-Analyse...")
         from .geometry.line_of_sight import add_los_info_to_results
-
-        # WICHTIG: Berechne Mast-Offset (Antennen sind typischerweise 3-5m über dem Dach)
-        try:
-            # Versuche die höchste Antennenposition zu finden
-            antenna_heights = [ant.position.h for ant in antenna_system.antennas if hasattr(ant, 'position')]
-            if antenna_heights:
-                max_antenna_height = max(antenna_heights)
-                mast_offset = max_antenna_height - antenna_system.base_position.h
-            else:
-                # Fallback: +3m Mast-Offset
-                mast_offset = 3.0
-        except:
-            # Fallback: +3m Mast-Offset
-            mast_offset = 3.0
+        from .geometry.bvh import TriangleBVH
 
         # Kombiniere reale und virtuelle Gebäude für LOS-Analyse
         all_buildings_for_los = buildings + virtual_building_objects
 
+        # BVH über alle Wanddreiecke (einmal pro Lauf, nicht für das DSM-Raster)
+        los_bvh = None
+        if los_mode != "dsm":
+            los_bvh = TriangleBVH.from_buildings(all_buildings_for_los)
+            print(f"    BVH: {len(los_bvh)} Dreiecke aus {len(all_buildings_for_los)} Gebäuden")
+
+        # Höhengitter für Terrain-Abschattung (swissALTI3D, None = nicht verfügbar)
+        los_terrain = None
+        if terrain_los:
+            from .loaders.terrain_loader import load_terrain_grid
+            los_terrain = load_terrain_grid(
+                antenna_system.base_position.e,
+                antenna_system.base_position.n,
+                radius_m,
+            )
+            if los_terrain is not None:
+                ny, nx = los_terrain.shape
+                print(f"    Terrain: {nx}×{ny} Gitterpunkte ({los_terrain.cell_size_m:g} m)")
+
         add_los_info_to_results(
             results=results,
-            antenna_position=antenna_system.base_position,  # Basis-Position
+            antenna_system=antenna_system,  # Sichtlinien ab jeder Antennenposition
             buildings=all_buildings_for_los,  # Inkl. virtuelle Gebäude
-            mast_height_offset=mast_offset,  # Offset wird in der Funktion angewendet
+            bvh=los_bvh,
+            los_mode=los_mode,
+            check_all=los_scope == "all",
+            parallel=parallel,
+            n_workers=n_workers,
+            use_cache=los_cache,
+            terrain=los_terrain,
         )
 
-        # Wende Gebäudedämpfung an: E_gedämpft = E_frei * 10^(-Dämpfung_dB/20)
-        nlos_count = 0
-        total_damped = 0
-
-        for r in results:
-            if hasattr(r, 'building_attenuation_db') and r.building_attenuation_db > 0:
-                # Original E-Feld speichern
-                r.e_field_free_vm = r.e_field_vm
-
-                # Dämpfungsfaktor berechnen
-                attenuation_factor = 10 ** (-r.building_attenuation_db / 20.0)
-
-                # Gedämpftes E-Feld
-                r.e_field_vm = r.e_field_vm * attenuation_factor
-
-                # exceeds_limit neu bewerten
-                r.exceeds_limit = r.e_field_vm >= threshold_vm
-
-                nlos_count += 1
-                total_damped += 1
+        # Wende Gebäudedämpfung pro Antenne vor der Leistungsaddition an:
+        # E = sqrt(sum (E_i,frei * 10^(-Dämpfung_i/20))²)
+        # (e_field_free behält das ungedämpfte E-Feld, exceeds_limit folgt e_total)
+        total_damped = results.apply_building_attenuation(results.building_atten)
+        nlos_count = total_damped
 
         los_count = len(results) - nlos_count
 
@@ -400,13 +573,20 @@ Optionen:
         if total_damped > 0:
             print(f"    → {total_damped} Punkte mit Gebäudedämpfung reduziert")
 
+    # Feldcache für ERP-Szenarien (python -m emf_hotspot what-if <output_dir>)
+    if results:
+        FieldCache.from_results(
+            results, antenna_system, los_checked=los_checked, omen_file=Path(omen_file).resolve(),
+        ).save(output_dir / FIELD_CACHE_FILENAME)
+        print(f"  → Feldcache für ERP-Szenarien: {output_dir / FIELD_CACHE_FILENAME}")
+
     # Hotspots NACH Dämpfungsanwendung identifizieren
-    hotspots = [r for r in results if r.exceeds_limit]
+    hotspots = results[results.exceeds_limit]
     print(f"  Hotspots (E >= {threshold_vm} V/m): {len(hotspots)}")
 
     if results:
-        max_e = max(r.e_field_vm for r in results)
-        avg_e = sum(r.e_field_vm for r in results) / len(results)
+        max_e = float(results.e_total.max())
+        avg_e = float(results.e_total.mean())
         print(f"  Maximale Feldstärke: {max_e:.2f} V/m")
         print(f"  Mittlere Feldstärke: {avg_e:.2f} V/m")
 
@@ -540,6 +720,36 @@ Optionen:
     except Exception as e:
         print(f"  WARNUNG: VTK-Export fehlgeschlagen: {e}")
 
+    # Volumen-Modus: 3D-Feldgitter (Freiraum) neben dem VTM
+    if mode == "volume":
+        print(f"\n[Volumen] Berechne 3D-Feldgitter (Auflösung: {volume_resolution_m}m, "
+              f"Höhe: {volume_height_m}m)...")
+        from .physics.volume_grid import calculate_volume_grid
+
+        volume = calculate_volume_grid(
+            sources,
+            patterns,
+            radius_m=radius_m,
+            resolution_m=volume_resolution_m,
+            height_m=volume_height_m,
+            parallel=parallel,
+            n_workers=n_workers,
+            adaptive_envelopes=adaptive_envelopes,
+        )
+        volume_above = int((volume.e_field >= threshold_vm).sum())
+        print(f"  Gitterpunkte: {len(volume)} ({volume_above} >= {threshold_vm} V/m)")
+        print(f"  Maximale Feldstärke: {float(volume.e_field.max()):.2f} V/m")
+
+        try:
+            project_name_clean = re.sub(r'[^\w\-]', '_', antenna_system.name)
+            export_volume_to_vti(
+                volume,
+                output_dir / f"paraview-{project_name_clean}-volumen.vti",
+                threshold_vm=threshold_vm,
+            )
+        except Exception as e:
+            print(f"  WARNUNG: Volumen-Export fehlgeschlagen: {e}")
+
     # OMEN-Validierung
     if antenna_system.omen_locations:
         try:
@@ -682,8 +892,24 @@ def main():
     """CLI-Einstiegspunkt."""
     import argparse
 
+    # ERP-Szenario aus dem Feldcache einer bestehenden Analyse
+    if len(sys.argv) > 1 and sys.argv[1] == "what-if":
+        from .what_if import main as what_if_main
+        what_if_main(sys.argv[2:])
+        return
+
+    # Maximal zulässige ERP aus dem Feldcache einer bestehenden Analyse
+    if len(sys.argv) > 1 and sys.argv[1] == "max-erp":
+        from .analysis.max_erp import main as max_erp_main
+        max_erp_main(sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(
-        description="EMF-Hotspot-Finder: Berechnet NISV-Überschreitungen an Gebäudefassaden"
+        description="EMF-Hotspot-Finder: Berechnet NISV-Überschreitungen an Gebäudefassaden",
+        epilog=(
+            "ERP-Szenarien: python -m emf_hotspot what-if <ausgabeverzeichnis> --erp ANTENNE=WATT; "
+            "maximale ERP: python -m emf_hotspot max-erp <ausgabeverzeichnis> [--per antenna|band|all]"
+        ),
     )
     parser.add_argument(
         "omen_file",
@@ -752,6 +978,84 @@ def main():
         default=None,
         help="Anzahl paralleler Worker (default: alle CPU-Kerne)",
     )
+    parser.add_argument(
+        "--mode",
+        choices=["facade", "volume"],
+        default="facade",
+        help="facade: nur Fassaden/Dächer (default); volume: zusätzlich 3D-Feldgitter als .vti",
+    )
+    parser.add_argument(
+        "--volume-resolution",
+        type=float,
+        default=VOLUME_RESOLUTION_M,
+        help=f"Gitterabstand im Volumen-Modus in Metern (default: {VOLUME_RESOLUTION_M})",
+    )
+    parser.add_argument(
+        "--volume-height",
+        type=float,
+        default=VOLUME_HEIGHT_M,
+        help=f"Höhe des Volumens ab Basishöhe in Metern (default: {VOLUME_HEIGHT_M})",
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Adaptive Verfeinerung: nur Bereiche nahe/über dem Grenzwert bis --resolution rechnen",
+    )
+    parser.add_argument(
+        "--coarse-resolution",
+        type=float,
+        default=ADAPTIVE_COARSE_RESOLUTION_M,
+        help=f"Gröbste Blockgrösse der adaptiven Verfeinerung bzw. Auflösung unkritischer Gebäude beim Screening in Metern (default: {ADAPTIVE_COARSE_RESOLUTION_M})",
+    )
+    parser.add_argument(
+        "--screening",
+        action="store_true",
+        help="Gebäude-Screening: Gebäude, die den Schwellwert sicher nicht erreichen, nur grob abtasten",
+    )
+    parser.add_argument(
+        "--screening-fraction",
+        type=float,
+        default=SCREENING_FRACTION,
+        help=f"Gebäude mit Obergrenze < Anteil × Schwellwert gelten als unkritisch (default: {SCREENING_FRACTION})",
+    )
+    parser.add_argument(
+        "--hotspots-only",
+        action="store_true",
+        help="Unkritische Gebäude ganz überspringen (nur Hotspot-Ausgaben vollständig)",
+    )
+    parser.add_argument(
+        "--beam-sweep",
+        action="store_true",
+        help=f"Adaptive Antennen mit Strahlschwenk rechnen (Worst-Case über Tilt-Bereich "
+             f"und ±{ADAPTIVE_SCAN_AZIMUTH_DEG:.0f}° Azimut bzw. Azimut-Bereich der StDB)",
+    )
+    parser.add_argument(
+        "--los-mode",
+        choices=["bvh", "buffer", "dsm"],
+        default="bvh",
+        help=f"bvh: jede Sichtlinie exakt über die BVH (default); buffer: Tiefenpuffer um die Antenne "
+             f"({LOS_BUFFER_RESOLUTION_DEG}°-Raster, exakte Nachprüfung an Kanten); dsm: Sichtlinien "
+             f"auf einem {LOS_DSM_RESOLUTION_M} m-Gebäuderaster abtasten (genähert, schnell bei grossen Radien)",
+    )
+    parser.add_argument(
+        "--los",
+        dest="los_scope",
+        choices=["hotspots", "all"],
+        default="hotspots",
+        help="hotspots: LOS nur für Punkte über dem Schwellwert (default); all: LOS und "
+             "Gebäudedämpfung für alle Punkte (parallel, CSV/VTK mit gedämpftem und Freiraum-Feld)",
+    )
+    parser.add_argument(
+        "--no-los-cache",
+        action="store_true",
+        help="LOS-Cache (~/.cache/emf_hotspot/los) nicht verwenden, alle Sichtlinien neu prüfen",
+    )
+    parser.add_argument(
+        "--terrain-los",
+        action="store_true",
+        help=f"Sichtlinien zusätzlich durch das Gelände prüfen (swissALTI3D, "
+             f"{TERRAIN_LOS_ATTENUATION_DB:g} dB bei Abschattung)",
+    )
 
     args = parser.parse_args()
 
@@ -771,6 +1075,19 @@ def main():
         visualize=args.viz,  # Nur mit --viz aktivieren
         parallel=not args.no_parallel,  # Parallele Berechnung (default: aktiviert)
         n_workers=args.workers,  # Anzahl Worker (None = CPU-Kerne)
+        mode=args.mode,
+        volume_resolution_m=args.volume_resolution,
+        volume_height_m=args.volume_height,
+        adaptive=args.adaptive,
+        coarse_resolution_m=args.coarse_resolution,
+        screening=args.screening,
+        screening_fraction=args.screening_fraction,
+        hotspots_only=args.hotspots_only,
+        beam_sweep=args.beam_sweep,
+        los_mode=args.los_mode,
+        los_scope=args.los_scope,
+        los_cache=not args.no_los_cache,
+        terrain_los=args.terrain_los,
     )
 
 
@@ -3,9 +3,50 @@ EMF-Hotspot-Finder: Datenmodelle
 """
 
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Dict, List, Optional
 import numpy as np
 
+from .config import AGW_LIMIT_VM, PATTERN_LUT_RESOLUTION_DEG
+
+
+def build_periodic_lut(
+    attenuation_at,
+    resolution_deg: float = PATTERN_LUT_RESOLUTION_DEG,
+) -> np.ndarray:
+    """
+    Tabelliert eine Dämpfungsfunktion auf einem gleichmässigen 0-360°-Raster.
+
+    Args:
+        attenuation_at: Funktion Winkel-Array [°] -> Dämpfung [dB]
+        resolution_deg: Rasterweite (wird auf einen Teiler von 360° gerundet)
+
+    Returns:
+        Schreibgeschütztes Array (M,) mit Dämpfung bei 0, 360/M, 2*360/M, ...
+    """
+    n_cells = max(1, int(round(360.0 / resolution_deg)))
+    angles = np.arange(n_cells) * (360.0 / n_cells)
+
+    lut = np.ascontiguousarray(attenuation_at(angles), dtype=float)
+    lut.flags.writeable = False
+    return lut
+
+
+def lookup_periodic_lut(lut: np.ndarray, angle_deg):
+    """
+    Liest eine periodische Tabelle aus build_periodic_lut() (linear interpoliert).
+
+    Reine Index-Arithmetik, funktioniert für Skalare und Arrays.
+    """
+    n_cells = len(lut)
+    position = (np.asarray(angle_deg, dtype=float) % 360.0) * (n_cells / 360.0)
+
+    lower = position.astype(np.intp)
+    fraction = position - lower
+    lower = lower % n_cells
+    upper = (lower + 1) % n_cells
+
+    return lut[lower] * (1.0 - fraction) + lut[upper] * fraction
+
 
 @dataclass
 class LV95Coordinate:
@@ -53,6 +94,8 @@ class Antenna:
     antenna_type: str  # z.B. "HybridAIR3268"
     is_adaptive: bool = False  # Adaptiver Betrieb (5G)
     sub_arrays: int = 1  # Anzahl Sub-Arrays
+    azimuth_from_deg: Optional[float] = None  # Azimut-Bereich von (für Worst-Case-Suche)
+    azimuth_to_deg: Optional[float] = None  # Azimut-Bereich bis (im Uhrzeigersinn)
 
 
 @dataclass
@@ -84,17 +127,65 @@ class AntennaPattern:
     h_gains: np.ndarray  # Gain/Dämpfung in dB
     v_angles: np.ndarray
     v_gains: np.ndarray
+    # Vorberechnete Dämpfungstabellen (siehe compile_lut)
+    h_lut: Optional[np.ndarray] = field(default=None, repr=False)
+    v_lut: Optional[np.ndarray] = field(default=None, repr=False)
+
+    def compile_lut(self, resolution_deg: float = PATTERN_LUT_RESOLUTION_DEG) -> "AntennaPattern":
+        """
+        Tabelliert H- und V-Dämpfung auf einem periodischen 0-360°-Raster.
+
+        Danach sind get_h_attenuation()/get_v_attenuation() reine
+        Index-Arithmetik statt np.max + np.interp pro Aufruf. Die Tabellen
+        sind schreibgeschützt und können mit Workern geteilt werden.
+
+        Returns:
+            self (für Verkettung)
+        """
+        self.h_lut = build_periodic_lut(self._interp_h_attenuation, resolution_deg)
+        self.v_lut = build_periodic_lut(self._interp_v_attenuation, resolution_deg)
+        return self
+
+    @property
+    def lut_resolution_deg(self) -> Optional[float]:
+        """Rasterweite der kompilierten Tabellen (None = nicht kompiliert)."""
+        if self.h_lut is None:
+            return None
+        return 360.0 / len(self.h_lut)
 
     def get_h_attenuation(self, azimuth_rel: float) -> float:
         """
         Horizontale Dämpfung aus Azimut-Diagramm.
 
         Args:
-            azimuth_rel: Relativer Azimut [-180, 180]°
+            azimuth_rel: Relativer Azimut [-180, 180]° (Skalar oder Array)
 
         Returns:
             H-Dämpfung in dB (positiv = Abschwächung)
         """
+        if self.h_lut is None:
+            self.compile_lut()
+        return lookup_periodic_lut(self.h_lut, azimuth_rel)
+
+    def get_v_attenuation(self, elevation_rel: float) -> float:
+        """
+        Vertikale Dämpfung aus Elevations-Diagramm.
+
+        V-Pattern ist im 0-360° Format (voller Kreis):
+        0° = Hauptstrahl, 90° = nach oben, 270° = nach unten
+
+        Args:
+            elevation_rel: Relative Elevation [-90, 90]° (Skalar oder Array)
+
+        Returns:
+            V-Dämpfung in dB (positiv = Abschwächung)
+        """
+        if self.v_lut is None:
+            self.compile_lut()
+        return lookup_periodic_lut(self.v_lut, elevation_rel)
+
+    def _interp_h_attenuation(self, azimuth_rel):
+        """H-Dämpfung direkt aus den Diagrammpunkten (Basis für die Tabelle)."""
         # Normalisiere Azimut auf 0-360
         h_angle = azimuth_rel % 360
 
@@ -107,16 +198,8 @@ class AntennaPattern:
         # Dämpfung = Differenz zum Maximum
         return max_h - h_gain
 
-    def get_v_attenuation(self, elevation_rel: float) -> float:
-        """
-        Vertikale Dämpfung aus Elevations-Diagramm.
-
-        Args:
-            elevation_rel: Relative Elevation [-90, 90]°
-
-        Returns:
-            V-Dämpfung in dB (positiv = Abschwächung)
-        """
+    def _interp_v_attenuation(self, elevation_rel):
+        """V-Dämpfung direkt aus den Diagrammpunkten (Basis für die Tabelle)."""
         # Normalisiere Elevation auf 0-360
         # V-Pattern ist im 0-360° Format (voller Kreis):
         # 0° = Hauptstrahl, 90° = nach oben, 270° = nach unten
@@ -177,6 +260,185 @@ class FacadePoint:
         return np.array([self.x, self.y, self.z])
 
 
+# Flächentyp eines Sampling-Punkts (FacadePointArray.surface_kind)
+SURFACE_WALL = 0
+SURFACE_ROOF = 1
+SURFACE_OMEN = 2  # Virtueller Punkt für Bauplatz-OMEN
+
+
+@dataclass
+class FacadePointArray:
+    """
+    Spaltenorientierter Container für viele Sampling-Punkte.
+
+    Ersetzt List[FacadePoint]: Koordinaten und Normalen liegen in
+    zusammenhängenden Arrays, Gebäude-IDs werden als Index in eine
+    gemeinsame Tabelle abgelegt. Slicing ist kopierfrei, Einzelzugriff
+    und Iteration liefern FacadePoint-Objekte (für bestehenden Code).
+    """
+    xyz: np.ndarray  # (N, 3) float64 [E, N, H]
+    normals: np.ndarray  # (N, 3) float32 Flächennormalen
+    building_index: np.ndarray  # (N,) int32 Index in building_ids
+    surface_kind: np.ndarray  # (N,) int8 SURFACE_WALL/ROOF/OMEN
+    building_ids: List[str] = field(default_factory=list)  # Gebäude-ID-Tabelle
+
+    @classmethod
+    def empty(cls) -> "FacadePointArray":
+        """Leerer Container."""
+        return cls(
+            xyz=np.empty((0, 3)),
+            normals=np.empty((0, 3), dtype=np.float32),
+            building_index=np.empty(0, dtype=np.int32),
+            surface_kind=np.empty(0, dtype=np.int8),
+        )
+
+    @classmethod
+    def from_surface(
+        cls,
+        xyz: np.ndarray,
+        normal: np.ndarray,
+        building_id: str,
+        surface_kind: int = SURFACE_WALL,
+    ) -> "FacadePointArray":
+        """
+        Punkte einer Fläche (gemeinsame Normale und Gebäude-ID).
+
+        Args:
+            xyz: (N, 3)-Koordinaten
+            normal: Flächennormale (3,) oder pro Punkt (N, 3)
+            building_id: Gebäude-ID aller Punkte
+            surface_kind: Flächentyp aller Punkte
+        """
+        xyz = np.asarray(xyz, dtype=float).reshape(-1, 3)
+        n_points = len(xyz)
+
+        return cls(
+            xyz=xyz,
+            normals=np.broadcast_to(np.asarray(normal, dtype=np.float32), (n_points, 3)).copy(),
+            building_index=np.zeros(n_points, dtype=np.int32),
+            surface_kind=np.full(n_points, surface_kind, dtype=np.int8),
+            building_ids=[building_id],
+        )
+
+    @classmethod
+    def from_points(
+        cls,
+        points: List[FacadePoint],
+        surface_kind: int = SURFACE_WALL,
+    ) -> "FacadePointArray":
+        """Konvertiert eine Liste von FacadePoint (Übergang für alten Code)."""
+        if isinstance(points, cls):
+            return points
+        if not points:
+            return cls.empty()
+
+        building_ids: List[str] = []
+        lookup = {}
+        building_index = np.empty(len(points), dtype=np.int32)
+        for i, p in enumerate(points):
+            if p.building_id not in lookup:
+                lookup[p.building_id] = len(building_ids)
+                building_ids.append(p.building_id)
+            building_index[i] = lookup[p.building_id]
+
+        return cls(
+            xyz=np.array([[p.x, p.y, p.z] for p in points], dtype=float),
+            normals=np.array([p.normal for p in points], dtype=np.float32).reshape(-1, 3),
+            building_index=building_index,
+            surface_kind=np.full(len(points), surface_kind, dtype=np.int8),
+            building_ids=building_ids,
+        )
+
+    @classmethod
+    def concatenate(cls, arrays: List["FacadePointArray"]) -> "FacadePointArray":
+        """
+        Fügt mehrere Container zusammen (Gebäude-ID-Tabellen werden vereinigt).
+        """
+        arrays = [a for a in arrays if len(a) > 0]
+        if not arrays:
+            return cls.empty()
+        if len(arrays) == 1:
+            return arrays[0]
+
+        building_ids: List[str] = []
+        lookup = {}
+        remapped = []
+        for a in arrays:
+            table = np.empty(len(a.building_ids), dtype=np.int32)
+            for j, building_id in enumerate(a.building_ids):
+                if building_id not in lookup:
+                    lookup[building_id] = len(building_ids)
+                    building_ids.append(building_id)
+                table[j] = lookup[building_id]
+            remapped.append(table[a.building_index])
+
+        return cls(
+            xyz=np.concatenate([a.xyz for a in arrays]),
+            normals=np.concatenate([a.normals for a in arrays]),
+            building_index=np.concatenate(remapped),
+            surface_kind=np.concatenate([a.surface_kind for a in arrays]),
+            building_ids=building_ids,
+        )
+
+    def __len__(self) -> int:
+        return len(self.xyz)
+
+    def __getitem__(self, key):
+        """
+        Ganzzahl -> FacadePoint, Slice -> kopierfreie Sicht,
+        Boolesche Maske / Indexarray -> gefilterter Container.
+        """
+        if isinstance(key, (int, np.integer)):
+            x, y, z = self.xyz[key].tolist()
+            return FacadePoint(
+                building_id=self.building_ids[self.building_index[key]],
+                x=x,
+                y=y,
+                z=z,
+                normal=self.normals[key],
+            )
+
+        return FacadePointArray(
+            xyz=self.xyz[key],
+            normals=self.normals[key],
+            building_index=self.building_index[key],
+            surface_kind=self.surface_kind[key],
+            building_ids=self.building_ids,
+        )
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def x(self) -> np.ndarray:
+        return self.xyz[:, 0]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self.xyz[:, 1]
+
+    @property
+    def z(self) -> np.ndarray:
+        return self.xyz[:, 2]
+
+    def building_id_at(self, i: int) -> str:
+        """Gebäude-ID des i-ten Punkts."""
+        return self.building_ids[self.building_index[i]]
+
+    def building_mask(self, predicate) -> np.ndarray:
+        """
+        Boolesche Maske (N,) über eine Bedingung auf der Gebäude-ID.
+
+        Die Bedingung wird nur einmal pro Tabelleneintrag ausgewertet,
+        z.B. building_mask(lambda b: "VIRTUAL" in b).
+        """
+        table = np.array([bool(predicate(b)) for b in self.building_ids], dtype=bool)
+        if len(table) == 0:
+            return np.zeros(len(self), dtype=bool)
+        return table[self.building_index]
+
+
 @dataclass
 class AntennaContribution:
     """Einzelbeitrag einer Antenne zu einem Punkt"""
@@ -186,6 +448,8 @@ class AntennaContribution:
     distance_m: float
     h_attenuation_db: float
     v_attenuation_db: float
+    critical_azimuth_deg: Optional[float] = None  # Worst-Case-Azimut der Antenne [°]
+    building_attenuation_db: float = 0.0  # Gebäudedämpfung auf der Sichtlinie dieser Antenne [dB]
 
 
 @dataclass
@@ -198,3 +462,348 @@ class HotspotResult:
     e_field_vm: float
     exceeds_limit: bool
     contributions: List[AntennaContribution] = field(default_factory=list)
+    # LOS-Analyse (siehe ResultTable.apply_building_attenuation)
+    has_los: bool = True
+    num_buildings_blocking: int = 0
+    building_attenuation_db: float = 0.0
+    e_field_free_vm: Optional[float] = None  # E ohne Gebäudedämpfung
+
+
+@dataclass
+class ResultTable:
+    """
+    Spaltenorientierte Berechnungsergebnisse für N Punkte und A Antennen.
+
+    Ersetzt List[HotspotResult]: Gesamtfeldstärke, Einzelbeiträge und
+    LOS-Informationen liegen als NumPy-Arrays vor. Schwellwert-Masken und
+    Gruppierung nach Gebäude sind vektorisiert. Einzelzugriff und Iteration
+    liefern HotspotResult-Objekte (für bestehenden Code).
+    """
+    xyz: np.ndarray  # (N, 3) [E, N, H]
+    building_index: np.ndarray  # (N,) Index in building_ids
+    building_ids: List[str]  # Gebäude-ID-Tabelle
+    antenna_ids: np.ndarray  # (A,) Antennen-IDs in Spaltenreihenfolge
+    e_total: np.ndarray  # (N,) E-Feldstärke [V/m] (inkl. Gebäudedämpfung)
+    e_contrib: np.ndarray  # (N, A) Einzelbeiträge [V/m] (Freiraum)
+    critical_tilt: np.ndarray  # (N, A) Worst-Case-Tilt [°]
+    critical_azimuth: np.ndarray  # (N, A) Worst-Case-Azimut [°]
+    distance: np.ndarray  # (N, A) 3D-Abstand [m]
+    h_atten: np.ndarray  # (N, A) H-Dämpfung [dB]
+    v_atten: np.ndarray  # (N, A) V-Dämpfung [dB]
+    has_los: np.ndarray  # (N,) bool - freie Sichtlinie zu allen Antennenpositionen
+    num_buildings_blocking: np.ndarray  # (N,) Anzahl blockierender Gebäude (Maximum über die Positionen)
+    building_attenuation_db: np.ndarray  # (N,) Wirksame Gebäudedämpfung [dB] (20·log10(E_frei/E))
+    e_field_free: np.ndarray  # (N,) E-Feldstärke ohne Gebäudedämpfung [V/m]
+    threshold_vm: float = AGW_LIMIT_VM  # Schwellwert für exceeds_limit
+    building_atten: Optional[np.ndarray] = None  # (N, A) Gebäudedämpfung pro Antenne [dB] (None = keine)
+
+    @classmethod
+    def from_batch(
+        cls,
+        points,
+        batch,
+        threshold_vm: float = AGW_LIMIT_VM,
+    ) -> "ResultTable":
+        """
+        Erstellt die Tabelle aus einer Batch-Berechnung.
+
+        Args:
+            points: FacadePointArray (oder Liste von FacadePoint) in Batch-Reihenfolge
+            batch: FieldBatch aus calculate_field_batch()
+            threshold_vm: Schwellwert für exceeds_limit [V/m]
+        """
+        points = FacadePointArray.from_points(points)
+        n_points = len(points)
+
+        return cls(
+            xyz=points.xyz,
+            building_index=points.building_index,
+            building_ids=points.building_ids,
+            antenna_ids=batch.antenna_ids,
+            e_total=batch.e_total.copy(),
+            e_contrib=batch.e_contrib,
+            critical_tilt=batch.critical_tilt,
+            critical_azimuth=batch.critical_azimuth,
+            distance=batch.distance,
+            h_atten=batch.h_atten,
+            v_atten=batch.v_atten,
+            has_los=np.ones(n_points, dtype=bool),
+            num_buildings_blocking=np.zeros(n_points, dtype=np.int32),
+            building_attenuation_db=np.zeros(n_points),
+            e_field_free=batch.e_total,
+            threshold_vm=threshold_vm,
+        )
+
+    @classmethod
+    def from_results(
+        cls,
+        results: List[HotspotResult],
+        threshold_vm: float = AGW_LIMIT_VM,
+    ) -> "ResultTable":
+        """Konvertiert eine Liste von HotspotResult (Übergang für alten Code)."""
+        if isinstance(results, cls):
+            return results
+
+        results = list(results or [])
+        n_points = len(results)
+
+        antenna_ids = [c.antenna_id for c in results[0].contributions] if results else []
+        n_antennas = len(antenna_ids)
+
+        building_ids: List[str] = []
+        lookup = {}
+        building_index = np.empty(n_points, dtype=np.int32)
+        for i, r in enumerate(results):
+            if r.building_id not in lookup:
+                lookup[r.building_id] = len(building_ids)
+                building_ids.append(r.building_id)
+            building_index[i] = lookup[r.building_id]
+
+        def contribution_matrix(attribute: str) -> np.ndarray:
+            matrix = np.zeros((n_points, n_antennas))
+            for i, r in enumerate(results):
+                for col, c in enumerate(r.contributions[:n_antennas]):
+                    value = getattr(c, attribute)
+                    matrix[i, col] = np.nan if value is None else value
+            return matrix
+
+        e_total = np.array([r.e_field_vm for r in results], dtype=float)
+
+        return cls(
+            xyz=np.array([[r.x, r.y, r.z] for r in results], dtype=float).reshape(-1, 3),
+            building_index=building_index,
+            building_ids=building_ids,
+            antenna_ids=np.array(antenna_ids, dtype=int),
+            e_total=e_total,
+            e_contrib=contribution_matrix("e_field_vm"),
+            critical_tilt=contribution_matrix("critical_tilt_deg"),
+            critical_azimuth=contribution_matrix("critical_azimuth_deg"),
+            distance=contribution_matrix("distance_m"),
+            h_atten=contribution_matrix("h_attenuation_db"),
+            v_atten=contribution_matrix("v_attenuation_db"),
+            has_los=np.array([getattr(r, "has_los", True) for r in results], dtype=bool),
+            num_buildings_blocking=np.array(
+                [getattr(r, "num_buildings_blocking", 0) for r in results], dtype=np.int32
+            ),
+            building_attenuation_db=np.array(
+                [getattr(r, "building_attenuation_db", 0.0) for r in results], dtype=float
+            ),
+            e_field_free=np.array([
+                r.e_field_vm if getattr(r, "e_field_free_vm", None) is None else r.e_field_free_vm
+                for r in results
+            ], dtype=float),
+            threshold_vm=threshold_vm,
+        )
+
+    def __len__(self) -> int:
+        return len(self.e_total)
+
+    def __getitem__(self, key):
+        """
+        Ganzzahl -> HotspotResult, Slice / Maske / Indexarray -> Teiltabelle.
+        """
+        if isinstance(key, (int, np.integer)):
+            x, y, z = self.xyz[key].tolist()
+            e_total = float(self.e_total[key])
+            attenuation_db = float(self.building_attenuation_db[key])
+
+            return HotspotResult(
+                building_id=self.building_id_at(key),
+                x=x,
+                y=y,
+                z=z,
+                e_field_vm=e_total,
+                exceeds_limit=bool(e_total >= self.threshold_vm),
+                contributions=self.contributions_at(key),
+                has_los=bool(self.has_los[key]),
+                num_buildings_blocking=int(self.num_buildings_blocking[key]),
+                building_attenuation_db=attenuation_db,
+                e_field_free_vm=float(self.e_field_free[key]) if attenuation_db > 0 else None,
+            )
+
+        return ResultTable(
+            xyz=self.xyz[key],
+            building_index=self.building_index[key],
+            building_ids=self.building_ids,
+            antenna_ids=self.antenna_ids,
+            e_total=self.e_total[key],
+            e_contrib=self.e_contrib[key],
+            critical_tilt=self.critical_tilt[key],
+            critical_azimuth=self.critical_azimuth[key],
+            distance=self.distance[key],
+            h_atten=self.h_atten[key],
+            v_atten=self.v_atten[key],
+            has_los=self.has_los[key],
+            num_buildings_blocking=self.num_buildings_blocking[key],
+            building_attenuation_db=self.building_attenuation_db[key],
+            e_field_free=self.e_field_free[key],
+            threshold_vm=self.threshold_vm,
+            building_atten=None if self.building_atten is None else self.building_atten[key],
+        )
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def x(self) -> np.ndarray:
+        return self.xyz[:, 0]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self.xyz[:, 1]
+
+    @property
+    def z(self) -> np.ndarray:
+        return self.xyz[:, 2]
+
+    @property
+    def exceeds_limit(self) -> np.ndarray:
+        """Boolesche Maske (N,): E >= threshold_vm."""
+        return self.e_total >= self.threshold_vm
+
+    def hotspot_mask(self, threshold_vm: Optional[float] = None) -> np.ndarray:
+        """Boolesche Maske (N,): E >= threshold_vm (Default: Tabellen-Schwellwert)."""
+        if threshold_vm is None:
+            threshold_vm = self.threshold_vm
+        return self.e_total >= threshold_vm
+
+    def building_id_at(self, i: int) -> str:
+        """Gebäude-ID der i-ten Zeile."""
+        return self.building_ids[self.building_index[i]]
+
+    def contributions_at(self, i: int) -> List[AntennaContribution]:
+        """Antennenbeiträge der i-ten Zeile als AntennaContribution-Liste."""
+        building_atten = self.contrib_building_attenuation[i]
+        return [
+            AntennaContribution(
+                antenna_id=int(antenna_id),
+                e_field_vm=float(self.e_contrib[i, col]),
+                critical_tilt_deg=float(self.critical_tilt[i, col]),
+                distance_m=float(self.distance[i, col]),
+                h_attenuation_db=float(self.h_atten[i, col]),
+                v_attenuation_db=float(self.v_atten[i, col]),
+                critical_azimuth_deg=float(self.critical_azimuth[i, col]),
+                building_attenuation_db=float(building_atten[col]),
+            )
+            for col, antenna_id in enumerate(self.antenna_ids)
+        ]
+
+    @property
+    def contrib_building_attenuation(self) -> np.ndarray:
+        """(N, A) Gebäudedämpfung pro Antenne [dB] (Nullen ohne LOS-Analyse)."""
+        if self.building_atten is None:
+            return np.zeros(self.e_contrib.shape)
+        return self.building_atten
+
+    def building_inverse(self, sort_by_id: bool = False):
+        """
+        Gruppierung nach Gebäude (vektorisiert).
+
+        Args:
+            sort_by_id: Gruppen nach Gebäude-ID sortieren
+                        (Default: Reihenfolge des ersten Auftretens)
+
+        Returns:
+            (group_ids, inverse) - Gebäude-IDs der Gruppen und Gruppennummer (N,)
+            jeder Zeile, z.B. für np.bincount(inverse, weights=...)
+        """
+        codes, first_index, inverse = np.unique(
+            self.building_index, return_index=True, return_inverse=True
+        )
+        group_ids = [self.building_ids[c] for c in codes]
+
+        if sort_by_id:
+            order = sorted(range(len(codes)), key=lambda g: group_ids[g])
+        else:
+            order = np.argsort(first_index, kind="stable")
+
+        rank = np.empty(len(codes), dtype=np.intp)
+        rank[np.asarray(order, dtype=np.intp)] = np.arange(len(codes))
+
+        return [group_ids[g] for g in order], rank[inverse.reshape(-1)]
+
+    def building_groups(self, sort_by_id: bool = False) -> Dict[str, np.ndarray]:
+        """
+        Zeilenindizes pro Gebäude (Reihenfolge innerhalb der Gruppe erhalten).
+
+        Returns:
+            Dictionary: building_id -> Indexarray
+        """
+        group_ids, inverse = self.building_inverse(sort_by_id)
+        order = np.argsort(inverse, kind="stable")
+        bounds = np.cumsum(np.bincount(inverse, minlength=len(group_ids)))[:-1]
+
+        return dict(zip(group_ids, np.split(order, bounds)))
+
+    def building_max_indices(self, sort_by_id: bool = False) -> Dict[str, int]:
+        """
+        Zeile mit maximaler E-Feldstärke pro Gebäude.
+
+        Bei Gleichstand wird die erste Zeile gewählt (wie max()).
+
+        Returns:
+            Dictionary: building_id -> Zeilenindex
+        """
+        group_ids, inverse = self.building_inverse(sort_by_id)
+        # Sortiert nach Gruppe, dann E absteigend, dann Zeilenindex
+        order = np.lexsort((np.arange(len(self)), -self.e_total, inverse))
+        first = np.flatnonzero(np.r_[True, np.diff(inverse[order]) != 0])
+
+        return dict(zip(group_ids, order[first].tolist()))
+
+    def apply_building_attenuation(
+        self,
+        attenuation_db: np.ndarray,
+        has_los: Optional[np.ndarray] = None,
+        num_buildings_blocking: Optional[np.ndarray] = None,
+    ) -> int:
+        """
+        Setzt die LOS-Spalten und dämpft die Feldstärke (in-place).
+
+        attenuation_db ist (N,) (gleiche Dämpfung für alle Antennen) oder
+        (N, A) pro Antenne. Pro Antenne wird der Beitrag vor der
+        Leistungsaddition gedämpft: E = sqrt(sum (E_i,frei * 10^(-Dämpfung_i/20))²),
+        nur für Punkte mit Dämpfung > 0. e_contrib bleibt Freiraum,
+        building_attenuation_db enthält danach die wirksame Dämpfung pro Punkt.
+
+        Returns:
+            Anzahl gedämpfter Punkte
+        """
+        attenuation_db = np.asarray(attenuation_db, dtype=float)
+
+        if attenuation_db.ndim < 2:
+            # Gleiche Dämpfung für alle Beiträge: E_gedämpft = E_frei * 10^(-Dämpfung_dB/20)
+            attenuation_db = np.broadcast_to(attenuation_db, self.e_total.shape)
+            damped = attenuation_db > 0
+            self.building_atten = np.repeat(attenuation_db[:, None], self.e_contrib.shape[1], axis=1)
+            self.building_attenuation_db = attenuation_db.copy()
+            self.e_total = np.where(
+                damped,
+                self.e_field_free * 10 ** (-attenuation_db / 20.0),
+                self.e_field_free,
+            )
+        else:
+            attenuation_db = np.broadcast_to(attenuation_db, self.e_contrib.shape)
+            damped = (attenuation_db > 0).any(axis=1)
+            self.building_atten = attenuation_db.copy()
+
+            factor = np.where(attenuation_db > 0, 10 ** (-attenuation_db / 10.0), 1.0)
+            e_damped = np.sqrt(np.nansum(self.e_contrib**2 * factor, axis=1))
+            self.e_total = np.where(damped, e_damped, self.e_field_free)
+
+            # Wirksame Dämpfung; ohne Feld (E_frei = 0) die grösste Einzeldämpfung
+            with np.errstate(divide="ignore", invalid="ignore"):
+                effective = 20.0 * np.log10(self.e_field_free / self.e_total)
+            self.building_attenuation_db = np.where(
+                damped,
+                np.where(np.isfinite(effective), effective, attenuation_db.max(axis=1, initial=0.0)),
+                0.0,
+            )
+
+        if has_los is not None:
+            self.has_los = np.asarray(has_los, dtype=bool)
+        if num_buildings_blocking is not None:
+            self.num_buildings_blocking = np.asarray(num_buildings_blocking, dtype=np.int32)
+
+        return int(damped.sum())
@@ -4,15 +4,15 @@ CSV-Export für Hotspot-Ergebnisse
 
 import csv
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Union
 import numpy as np
 
-from ..models import HotspotResult, AntennaSystem
+from ..models import HotspotResult, AntennaSystem, ResultTable
 from ..config import AGW_LIMIT_VM
 
 
 def export_hotspots_csv(
-    results: List[HotspotResult],
+    results: Union[ResultTable, List[HotspotResult]],
     output_path: Path,
     include_contributions: bool = False,
     floor_height_m: float = 3.0,
@@ -21,41 +21,28 @@ def export_hotspots_csv(
     Exportiert Hotspot-Ergebnisse als CSV-Datei.
 
     Args:
-        results: Liste von HotspotResult
+        results: ResultTable (oder Liste von HotspotResult)
         output_path: Ausgabepfad für CSV
         include_contributions: Ob Einzelbeiträge der Antennen exportiert werden
         floor_height_m: Geschosshöhe für Floor-Level-Berechnung (default: 3m)
     """
-    from collections import defaultdict
-    import numpy as np
-
-    # Berechne Floor-Levels pro Gebäude
-    by_building = defaultdict(list)
-    for r in results:
-        by_building[r.building_id].append(r)
-
-    # Für jedes Gebäude: Floor-Levels und Z-Max pro Level bestimmen
-    floor_info = {}  # (building_id, z) -> (floor_level, floor_z_max)
-
-    for building_id, building_results in by_building.items():
-        # Min-Z des Gebäudes als Referenz (Erdgeschoss)
-        z_coords = [r.z for r in building_results]
-        z_min = min(z_coords)
-        z_max = max(z_coords)
-
-        # Stratifiziere in Floor-Levels
-        levels_in_building = defaultdict(list)
-        for r in building_results:
-            floor_level = int((r.z - z_min) / floor_height_m)
-            levels_in_building[floor_level].append(r.z)
-
-        # Z-Max für jedes Level
-        level_z_max = {level: max(z_list) for level, z_list in levels_in_building.items()}
-
-        # Zuordnung für alle Punkte
-        for r in building_results:
-            floor_level = int((r.z - z_min) / floor_height_m)
-            floor_info[(building_id, r.z)] = (floor_level, level_z_max[floor_level])
+    results = ResultTable.from_results(results)
+    z = results.z
+
+    # Floor-Levels pro Gebäude: Min-Z des Gebäudes als Referenz (Erdgeschoss)
+    _, inverse = results.building_inverse()
+    z_min = np.full(inverse.max() + 1 if len(z) else 0, np.inf)
+    np.minimum.at(z_min, inverse, z)
+    floor_levels = ((z - z_min[inverse]) / floor_height_m).astype(int)
+
+    # Z-Max für jedes (Gebäude, Level)
+    _, level_inverse = np.unique(
+        np.stack([inverse, floor_levels], axis=1), axis=0, return_inverse=True
+    )
+    level_inverse = level_inverse.reshape(-1)
+    level_z_max = np.full(level_inverse.max() + 1 if len(z) else 0, -np.inf)
+    np.maximum.at(level_z_max, level_inverse, z)
+    floor_z_max = level_z_max[level_inverse]
 
     fieldnames = [
         "building_id",
@@ -65,6 +52,7 @@ def export_hotspots_csv(
         "floor_level",
         "floor_z_max",
         "e_field_vm",
+        "e_field_free_vm",
         "exceeds_limit",
         "los_status",
         "num_buildings_blocking",
@@ -74,31 +62,36 @@ def export_hotspots_csv(
     if include_contributions:
         fieldnames.append("contributions")
 
+    antenna_ids = results.antenna_ids.tolist()
+    e_contrib = results.e_contrib.tolist()
+    critical_tilt = results.critical_tilt.tolist()
+    distance = results.distance.tolist()
+
     with open(output_path, "w", newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames)
         writer.writeheader()
 
-        for result in results:
-            # Floor-Level und Z-Max abrufen
-            floor_level, floor_z_max = floor_info.get(
-                (result.building_id, result.z),
-                (0, result.z)  # Fallback
-            )
-
-            # LOS-Information (falls vorhanden)
-            has_los = getattr(result, 'has_los', True)
-            num_blocking = getattr(result, 'num_buildings_blocking', 0)
-            building_atten = getattr(result, 'building_attenuation_db', 0.0)
-
+        for i, ((x, y, z_i), e, e_free, exceeds, has_los, num_blocking, building_atten, level, level_z) in enumerate(zip(
+            results.xyz.tolist(),
+            results.e_total.tolist(),
+            results.e_field_free.tolist(),
+            results.exceeds_limit.tolist(),
+            results.has_los.tolist(),
+            results.num_buildings_blocking.tolist(),
+            results.building_attenuation_db.tolist(),
+            floor_levels.tolist(),
+            floor_z_max.tolist(),
+        )):
             row = {
-                "building_id": result.building_id,
-                "x": f"{result.x:.2f}",
-                "y": f"{result.y:.2f}",
-                "z": f"{result.z:.2f}",
-                "floor_level": floor_level,
-                "floor_z_max": f"{floor_z_max:.2f}",
-                "e_field_vm": f"{result.e_field_vm:.4f}",
-                "exceeds_limit": result.exceeds_limit,
+                "building_id": results.building_id_at(i),
+                "x": f"{x:.2f}",
+                "y": f"{y:.2f}",
+                "z": f"{z_i:.2f}",
+                "floor_level": level,
+                "floor_z_max": f"{level_z:.2f}",
+                "e_field_vm": f"{e:.4f}",
+                "e_field_free_vm": f"{e_free:.4f}",
+                "exceeds_limit": exceeds,
                 "los_status": "LOS" if has_los else "NLOS",
                 "num_buildings_blocking": num_blocking,
                 "building_attenuation_db": f"{building_atten:.1f}",
@@ -107,8 +100,10 @@ def export_hotspots_csv(
             if include_contributions:
                 # Format: "ant1:E=0.5,tilt=-12,dist=50;ant2:..."
                 contrib_str = ";".join(
-                    f"{c.antenna_id}:E={c.e_field_vm:.4f},tilt={c.critical_tilt_deg:.1f},dist={c.distance_m:.1f}"
-                    for c in result.contributions
+                    f"{antenna_id}:E={e_c:.4f},tilt={tilt:.1f},dist={dist:.1f}"
+                    for antenna_id, e_c, tilt, dist in zip(
+                        antenna_ids, e_contrib[i], critical_tilt[i], distance[i]
+                    )
                 )
                 row["contributions"] = contrib_str
 
@@ -116,7 +111,7 @@ def export_hotspots_csv(
 
 
 def export_hotspots_with_antenna_details_csv(
-    results: List[HotspotResult],
+    results: Union[ResultTable, List[HotspotResult]],
     output_path: Path,
     antenna_system: AntennaSystem,
     buildings=None,  # Optional: Liste von Buildings für EGID
@@ -125,7 +120,7 @@ def export_hotspots_with_antenna_details_csv(
     Exportiert Hotspots mit detaillierten Antennenbeiträgen als separate Spalten.
 
     Args:
-        results: Liste von HotspotResult
+        results: ResultTable (oder Liste von HotspotResult)
         output_path: Ausgabepfad für CSV
         antenna_system: AntennaSystem für Antennen-IDs
         buildings: Optional - Liste von Buildings für EGID/Adresse
@@ -133,6 +128,8 @@ def export_hotspots_with_antenna_details_csv(
     if not results:
         return
 
+    results = ResultTable.from_results(results)
+
     # EGID-Map und Koordinaten-Map erstellen
     egid_map = {}
     building_coords = {}  # building_id -> (e, n)
@@ -176,15 +173,17 @@ def export_hotspots_with_antenna_details_csv(
                 address_cache[egid] = addr['full_address']
 
     # Fallback: Koordinaten-basierte Lookups für Gebäude ohne EGID/Adresse
+    # (ein Lookup pro Gebäude, am letzten Hotspot des Gebäudes)
     from ..loaders.geoadmin_api import lookup_address_by_coordinates
     buildings_without_address = []
 
-    for result in results:
-        egid = egid_map.get(result.building_id, "")
+    for building_id, indices in results.building_groups().items():
+        egid = egid_map.get(building_id, "")
         has_address = (egid and egid in address_cache)
 
         if not has_address:
-            buildings_without_address.append((result.building_id, result.x, result.y))
+            x, y, _ = results.xyz[indices[-1]].tolist()
+            buildings_without_address.append((building_id, x, y))
 
     if buildings_without_address:
         print(f"  Lade Adressen für {len(buildings_without_address)} Gebäude via Koordinaten...")
@@ -207,6 +206,7 @@ def export_hotspots_with_antenna_details_csv(
         "y",
         "z",
         "e_field_total_vm",
+        "e_field_free_vm",
         "exceeds_limit",
         "los_status",
         "num_buildings_blocking",
@@ -227,66 +227,81 @@ def export_hotspots_with_antenna_details_csv(
         writer = csv.DictWriter(f, fieldnames=fieldnames)
         writer.writeheader()
 
-        for result in results:
+        antenna_ids = results.antenna_ids.tolist()
+        contrib_columns = list(zip(
+            results.e_contrib.tolist(),
+            results.critical_tilt.tolist(),
+            results.distance.tolist(),
+            results.h_atten.tolist(),
+            results.v_atten.tolist(),
+        ))
+
+        for i, ((x, y, z), e, e_free, exceeds, has_los, num_blocking, building_atten) in enumerate(zip(
+            results.xyz.tolist(),
+            results.e_total.tolist(),
+            results.e_field_free.tolist(),
+            results.exceeds_limit.tolist(),
+            results.has_los.tolist(),
+            results.num_buildings_blocking.tolist(),
+            results.building_attenuation_db.tolist(),
+        )):
+            building_id = results.building_id_at(i)
+
             # EGID und Adresse nachschlagen
-            egid = egid_map.get(result.building_id, "")
+            egid = egid_map.get(building_id, "")
             address = address_cache.get(egid, "")
 
             # Fallback: Koordinaten-basierte Adresse
             if not address:
-                address = address_cache.get(f"coord_{result.building_id}", "")
-
-            # LOS-Information (falls vorhanden)
-            has_los = getattr(result, 'has_los', True)
-            num_blocking = getattr(result, 'num_buildings_blocking', 0)
-            building_atten = getattr(result, 'building_attenuation_db', 0.0)
+                address = address_cache.get(f"coord_{building_id}", "")
 
             row = {
-                "building_id": result.building_id,
+                "building_id": building_id,
                 "egid": egid,
                 "address": address,
-                "x": f"{result.x:.2f}",
-                "y": f"{result.y:.2f}",
-                "z": f"{result.z:.2f}",
-                "e_field_total_vm": f"{result.e_field_vm:.4f}",
-                "exceeds_limit": result.exceeds_limit,
+                "x": f"{x:.2f}",
+                "y": f"{y:.2f}",
+                "z": f"{z:.2f}",
+                "e_field_total_vm": f"{e:.4f}",
+                "e_field_free_vm": f"{e_free:.4f}",
+                "exceeds_limit": exceeds,
                 "los_status": "LOS" if has_los else "NLOS",
                 "num_buildings_blocking": num_blocking,
                 "building_attenuation_db": f"{building_atten:.1f}",
             }
 
             # Antennenbeiträge als Spalten
-            for contrib in result.contributions:
-                ant_id = contrib.antenna_id
-                row[f"ant{ant_id}_e_vm"] = f"{contrib.e_field_vm:.4f}"
-                row[f"ant{ant_id}_tilt_deg"] = f"{contrib.critical_tilt_deg:.1f}"
-                row[f"ant{ant_id}_dist_m"] = f"{contrib.distance_m:.1f}"
-                row[f"ant{ant_id}_h_atten_db"] = f"{contrib.h_attenuation_db:.2f}"
-                row[f"ant{ant_id}_v_atten_db"] = f"{contrib.v_attenuation_db:.2f}"
+            for ant_id, e_c, tilt, dist, h_att, v_att in zip(antenna_ids, *contrib_columns[i]):
+                row[f"ant{ant_id}_e_vm"] = f"{e_c:.4f}"
+                row[f"ant{ant_id}_tilt_deg"] = f"{tilt:.1f}"
+                row[f"ant{ant_id}_dist_m"] = f"{dist:.1f}"
+                row[f"ant{ant_id}_h_atten_db"] = f"{h_att:.2f}"
+                row[f"ant{ant_id}_v_atten_db"] = f"{v_att:.2f}"
 
             writer.writerow(row)
 
 
 def export_summary_csv(
-    results: List[HotspotResult],
+    results: Union[ResultTable, List[HotspotResult]],
     output_path: Path,
 ) -> None:
     """
     Exportiert eine Zusammenfassung der Hotspot-Analyse.
     """
+    results = ResultTable.from_results(results)
     total_points = len(results)
-    hotspots = [r for r in results if r.exceeds_limit]
-    num_hotspots = len(hotspots)
+    hotspot_mask = results.exceeds_limit
+    num_hotspots = int(hotspot_mask.sum())
 
-    if results:
-        max_e = max(r.e_field_vm for r in results)
-        avg_e = sum(r.e_field_vm for r in results) / total_points
+    if total_points:
+        max_e = float(results.e_total.max())
+        avg_e = float(results.e_total.mean())
     else:
         max_e = 0.0
         avg_e = 0.0
 
     # Gebäude mit Hotspots
-    buildings_with_hotspots = set(r.building_id for r in hotspots)
+    buildings_with_hotspots = np.unique(results.building_index[hotspot_mask])
 
     with open(output_path, "w", newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
@@ -301,7 +316,7 @@ def export_summary_csv(
 
 
 def export_buildings_overview_csv(
-    results: List[HotspotResult],
+    results: Union[ResultTable, List[HotspotResult]],
     output_path: Path,
     building_analyses=None,  # Optional: Liste von BuildingAnalysis aus building_validation
     antenna_system=None,  # Optional: AntennaSystem für OMEN-Zuordnung
@@ -313,19 +328,17 @@ def export_buildings_overview_csv(
     Vereint die Daten aus pro_gebaeude.csv und gebaeude_validierung.csv in einer Datei.
 
     Args:
-        results: Liste von HotspotResult
+        results: ResultTable (oder Liste von HotspotResult)
         output_path: Pfad für CSV-Datei
         building_analyses: Optional - BuildingAnalysis-Daten aus building_validation
         antenna_system: Optional - AntennaSystem für OMEN-Zuordnung
         buildings: Optional - Liste von Buildings für EGID-Zuordnung
     """
     from collections import defaultdict
-    import numpy as np
 
-    # Gruppiere nach Gebäude
-    by_building = defaultdict(list)
-    for r in results:
-        by_building[r.building_id].append(r)
+    # Gruppiere nach Gebäude (building_id -> Zeilenindizes)
+    results = ResultTable.from_results(results)
+    by_building = results.building_groups()
 
     # BuildingAnalysis in Dict umwandeln für schnellen Zugriff
     analysis_map = {}
@@ -365,7 +378,7 @@ def export_buildings_overview_csv(
     if antenna_system and antenna_system.omen_locations:
         # Für jeden OMEN: Prüfe ob Punkt INNERHALB eines Gebäudes liegt
         for omen in antenna_system.omen_locations:
-            for building_id, building_results in by_building.items():
+            for building_id, indices in by_building.items():
                 building_obj = building_map.get(building_id)
                 if not building_obj:
                     continue
@@ -378,8 +391,8 @@ def export_buildings_overview_csv(
                     building_max_z = max(all_z)
                 else:
                     # Fallback
-                    building_min_z = min(r.z for r in building_results)
-                    building_max_z = max(r.z for r in building_results)
+                    building_min_z = results.z[indices].min()
+                    building_max_z = results.z[indices].max()
 
                 # Kleine Toleranz für Messungenauigkeiten (±0.5m)
                 height_tolerance = 0.5
@@ -422,11 +435,11 @@ def export_buildings_overview_csv(
     egid_to_building_coords = {}
     for building_id, egid in egid_map.items():
         if egid and egid != "":
-            building_results = by_building.get(building_id, [])
-            if building_results:
+            indices = by_building.get(building_id)
+            if indices is not None:
                 # Nutze Mittelpunkt des Gebäudes
-                center_x = np.mean([r.x for r in building_results])
-                center_y = np.mean([r.y for r in building_results])
+                center_x = np.mean(results.x[indices])
+                center_y = np.mean(results.y[indices])
                 egid_to_building_coords[egid] = (center_x, center_y)
 
     if egid_to_building_coords:
@@ -443,14 +456,14 @@ def export_buildings_overview_csv(
     from ..loaders.geoadmin_api import lookup_address_by_coordinates
     buildings_without_address = []
 
-    for building_id, building_results in by_building.items():
+    for building_id, indices in by_building.items():
         egid = egid_map.get(building_id, "")
         has_address = (egid and egid in address_cache)
 
-        if not has_address and building_results:
+        if not has_address:
             # Nutze Mittelpunkt des Gebäudes
-            center_x = np.mean([r.x for r in building_results])
-            center_y = np.mean([r.y for r in building_results])
+            center_x = np.mean(results.x[indices])
+            center_y = np.mean(results.y[indices])
             buildings_without_address.append((building_id, center_x, center_y))
 
     if buildings_without_address:
@@ -505,19 +518,23 @@ def export_buildings_overview_csv(
         writer = csv.DictWriter(f, fieldnames=fieldnames)
         writer.writeheader()
 
-        for idx, (building_id, building_results) in enumerate(sorted(by_building.items())):
+        max_indices = results.building_max_indices(sort_by_id=True)
+        exceeds_limit = results.exceeds_limit
+
+        for building_id, max_index in max_indices.items():
+            indices = by_building[building_id]
+
             # Hotspot-Statistik berechnen
-            num_points = len(building_results)
-            num_hotspots = sum(1 for r in building_results if r.exceeds_limit)
-            max_e = max(r.e_field_vm for r in building_results)
-            avg_e = sum(r.e_field_vm for r in building_results) / num_points
-            min_z = min(r.z for r in building_results)
-            max_z = max(r.z for r in building_results)
-
-            # Finde Punkt mit max E-Feldstärke (für Geodaten)
-            max_e_point = max(building_results, key=lambda r: r.e_field_vm)
-            max_hotspot_x = max_e_point.x
-            max_hotspot_y = max_e_point.y
+            num_points = len(indices)
+            num_hotspots = int(exceeds_limit[indices].sum())
+            max_e = results.e_total[max_index]
+            avg_e = results.e_total[indices].mean()
+            min_z = results.z[indices].min()
+            max_z = results.z[indices].max()
+
+            # Punkt mit max E-Feldstärke (für Geodaten)
+            max_hotspot_x = results.x[max_index]
+            max_hotspot_y = results.y[max_index]
 
             # Gebäudehöhe und Stockwerke
             height_m = max_z - min_z
@@ -600,7 +617,7 @@ def export_buildings_overview_csv(
 
 
 def export_hotspots_aggregated_csv(
-    results: List[HotspotResult],
+    results: Union[ResultTable, List[HotspotResult]],
     output_path: Path,
     buildings=None,  # Optional: Liste von Buildings für EGID
     antenna_system=None,  # Optional: AntennaSystem für OMEN
@@ -614,7 +631,7 @@ def export_hotspots_aggregated_csv(
     Mit EGID, Adresse (optional) und OMEN-Nr.
 
     Args:
-        results: Liste von HotspotResult (nur Hotspots)
+        results: ResultTable oder Liste von HotspotResult (nur Hotspots)
         output_path: Pfad für CSV-Datei
         buildings: Optional - Liste von Buildings für EGID
         antenna_system: Optional - AntennaSystem für OMEN-Zuordnung
@@ -622,16 +639,14 @@ def export_hotspots_aggregated_csv(
         floor_height_m: Geschosshöhe (aktuell ungenutzt, für Kompatibilität beibehalten)
     """
     from collections import defaultdict
-    import numpy as np
 
     if not results:
         print("  HINWEIS: Keine Hotspots zum Exportieren.")
         return
 
-    # Gruppiere nach Gebäude
-    by_building = defaultdict(list)
-    for r in results:
-        by_building[r.building_id].append(r)
+    # Gruppiere nach Gebäude (building_id -> Zeilenindizes)
+    results = ResultTable.from_results(results)
+    by_building = results.building_groups()
 
     # EGID-Map und Building-Map für Höhen
     egid_map = {}
@@ -665,7 +680,7 @@ def export_hotspots_aggregated_csv(
     if antenna_system and antenna_system.omen_locations:
         # Für jeden OMEN: Prüfe ob Punkt INNERHALB eines Gebäudes liegt
         for omen in antenna_system.omen_locations:
-            for building_id, building_results in by_building.items():
+            for building_id, indices in by_building.items():
                 building_obj = building_map.get(building_id)
                 if not building_obj:
                     continue
@@ -678,8 +693,8 @@ def export_hotspots_aggregated_csv(
                     building_max_z = max(all_z)
                 else:
                     # Fallback
-                    building_min_z = min(r.z for r in building_results)
-                    building_max_z = max(r.z for r in building_results)
+                    building_min_z = results.z[indices].min()
+                    building_max_z = results.z[indices].max()
 
                 # Kleine Toleranz für Messungenauigkeiten (±0.5m)
                 height_tolerance = 0.5
@@ -724,14 +739,11 @@ def export_hotspots_aggregated_csv(
         for building_id in by_building.keys():
             egid = egid_map.get(building_id, "")
             if egid:
-                building_results = by_building[building_id]
-                if building_results:
-                    # Nutze Mittelpunkt des Gebäudes für Validierung
-                    center_x = np.mean([r.x for r in building_results])
-                    center_y = np.mean([r.y for r in building_results])
-                    addr = lookup_address_by_egid(egid, building_e=center_x, building_n=center_y)
-                else:
-                    addr = lookup_address_by_egid(egid)
+                # Nutze Mittelpunkt des Gebäudes für Validierung
+                indices = by_building[building_id]
+                center_x = np.mean(results.x[indices])
+                center_y = np.mean(results.y[indices])
+                addr = lookup_address_by_egid(egid, building_e=center_x, building_n=center_y)
 
                 if addr:
                     address_cache[building_id] = addr['full_address']
@@ -752,7 +764,7 @@ def export_hotspots_aggregated_csv(
 
     aggregated_rows = []
 
-    for building_id, building_results in sorted(by_building.items()):
+    for building_id, max_index in results.building_max_indices(sort_by_id=True).items():
         # EGID
         egid = egid_map.get(building_id, "")
 
@@ -762,13 +774,11 @@ def export_hotspots_aggregated_csv(
         # OMEN-Nr(n) - mehrere OMENs möglich (eine pro Wohnung)
         omen_nr = ",".join(omen_to_building.get(building_id, []))
 
-        # Max E-Feld über gesamtes Gebäude
-        max_point = max(building_results, key=lambda r: r.e_field_vm)
-
-        # LOS-Informationen vom Max-Punkt
-        has_los = getattr(max_point, 'has_los', True)
-        num_blocking = getattr(max_point, 'num_buildings_blocking', 0)
-        building_atten = getattr(max_point, 'building_attenuation_db', 0.0)
+        # Max E-Feld über gesamtes Gebäude (mit LOS-Informationen)
+        max_point = results[max_index]
+        has_los = max_point.has_los
+        num_blocking = max_point.num_buildings_blocking
+        building_atten = max_point.building_attenuation_db
 
         aggregated_rows.append({
             "building_id": building_id,
@@ -794,7 +804,7 @@ def export_hotspots_aggregated_csv(
 
 
 def export_omen_validation_csv(
-    results: List[HotspotResult],
+    results: Union[ResultTable, List[HotspotResult]],
     antenna_system: AntennaSystem,
     output_path: Path,
     patterns: dict,  # Antennendiagramme
@@ -815,8 +825,7 @@ def export_omen_validation_csv(
         tolerance_m: Nicht verwendet (Kompatibilität)
         tolerance_percent: Prozentuale Abweichungstoleranz für Warnung
     """
-    from ..physics.summation import calculate_total_e_field_at_point
-    from ..models import FacadePoint
+    from ..physics.field_engine import calculate_field_batch
 
     if not antenna_system.omen_locations:
         print("  HINWEIS: Keine OMEN-Locations im Antennensystem gefunden.")
@@ -846,25 +855,22 @@ def export_omen_validation_csv(
 
     validation_results = []
 
-    for omen in omen_with_ref:
-        # Erstelle FacadePoint an OMEN-Position
-        omen_point = FacadePoint(
-            building_id=f"OMEN_{omen.nr}",
-            x=omen.position.e,
-            y=omen.position.n,
-            z=omen.position.h,
-            normal=np.array([0, 0, 1]),  # Dummy-Normal
-        )
-
-        # Berechne E-Feld DIREKT an dieser Position
-        result = calculate_total_e_field_at_point(
-            omen_point,
-            antenna_system,
-            patterns,
-            building_attenuation_db=omen.building_attenuation_db,
-        )
-
-        e_calculated = result.e_field_vm
+    # Berechne E-Feld DIREKT an allen OMEN-Positionen (ein Batch)
+    omen_xyz = np.array([
+        [omen.position.e, omen.position.n, omen.position.h]
+        for omen in omen_with_ref
+    ])
+    omen_attenuation = np.array([omen.building_attenuation_db for omen in omen_with_ref])
+
+    batch = calculate_field_batch(
+        omen_xyz,
+        antenna_system,
+        patterns,
+        building_attenuation_db=omen_attenuation,
+    )
+
+    for omen, e_calculated in zip(omen_with_ref, batch.e_total):
+        e_calculated = float(e_calculated)
         deviation_vm = e_calculated - omen.e_field_expected
         deviation_percent = (deviation_vm / omen.e_field_expected) * 100
 
@@ -906,7 +912,7 @@ def export_omen_assignment_validation_csv(
     output_path: Path,
     antenna_system: Optional[AntennaSystem] = None,
     buildings=None,
-    results: Optional[List[HotspotResult]] = None,
+    results: Optional[Union[ResultTable, List[HotspotResult]]] = None,
 ) -> None:
     """
     Exportiert OMEN-Zuordnungs-Validierung: Zeigt welche OMENs einem Gebäude zugeordnet wurden.
@@ -932,11 +938,10 @@ def export_omen_assignment_validation_csv(
         print("  HINWEIS: Keine Gebäude für OMEN-Zuordnung verfügbar.")
         return
 
-    # Gruppiere results nach Gebäude
-    by_building = defaultdict(list)
+    # Gebäude mit Ergebnissen (Reihenfolge des ersten Auftretens)
+    by_building = {}
     if results:
-        for r in results:
-            by_building[r.building_id].append(r)
+        by_building = ResultTable.from_results(results).building_groups()
 
     # Building-Map für schnellen Zugriff
     building_map = {}
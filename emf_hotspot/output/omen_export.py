@@ -6,11 +6,14 @@ im Format des Standortdatenblatts (StDB).
 """
 
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Union
+import numpy as np
 import pandas as pd
 from odf.table import TableRow, TableCell
 from odf.text import P
 
+from ..models import ResultTable
+
 # Optionale Excel-Module (xlrd + xlwt + xlutils für altes .xls Format mit Formatierung)
 try:
     import xlrd
@@ -328,7 +331,7 @@ def create_combined_neuomen_workbook(
     template_file: Path,
     input_omen_file: Path,
     df_hotspots: pd.DataFrame,
-    results: Optional[List],
+    results: Optional[Union[ResultTable, List]],
     antenna_system,
     num_antennas: int,
 ) -> None:
@@ -343,7 +346,7 @@ def create_combined_neuomen_workbook(
         template_file: Template-Datei (nicht verwendet)
         input_omen_file: Input-OMEN mit Global/Masten/Antenna
         df_hotspots: DataFrame mit allen Hotspots
-        results: HotspotResult-Objekte
+        results: ResultTable (oder Liste von HotspotResult)
         antenna_system: AntennaSystem
         num_antennas: Anzahl Antennen
     """
@@ -407,6 +410,12 @@ def create_combined_neuomen_workbook(
     # Basis-Position der Antenne
     base_pos = antenna_system.base_position if antenna_system else None
 
+    # Zeilenindizes der Ergebnisse pro Gebäude
+    building_rows = {}
+    if results:
+        results = ResultTable.from_results(results)
+        building_rows = results.building_groups()
+
     # 5. Überschreibe Werte in den kopierten OMEN-Sheets
     for idx, row in df_hotspots.iterrows():
         neuomen_nr = start_nr + idx
@@ -460,7 +469,7 @@ def create_combined_neuomen_workbook(
         # center_x/y/z sind bereits die Koordinaten des max_point
         building_id = row.get("building_id", "")
         hotspot_result = None
-        if results:
+        if building_id in building_rows:
             # Finde den result-Punkt, der zu den center-Koordinaten passt
             x_abs = row.get("center_x", 0.0)
             y_abs = row.get("center_y", 0.0)
@@ -468,13 +477,12 @@ def create_combined_neuomen_workbook(
 
             # Suche result mit gleichen Koordinaten (mit Toleranz)
             tolerance = 0.01
-            for result in results:
-                if result.building_id == building_id:
-                    if (abs(result.x - x_abs) < tolerance and
-                        abs(result.y - y_abs) < tolerance and
-                        abs(result.z - z_abs) < tolerance):
-                        hotspot_result = result
-                        break
+            candidates = building_rows[building_id]
+            matches = candidates[np.all(
+                np.abs(results.xyz[candidates] - [x_abs, y_abs, z_abs]) < tolerance, axis=1
+            )]
+            if len(matches):
+                hotspot_result = results[matches[0]]
 
         # Überschreibe Zellen (Excel-Zeilen 31-34 = ODS-Zeilen 30-33)
         # Zeile 31, Spalte C (Index 2): OMEN-Nummer
@@ -3,18 +3,18 @@
 """
 
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Union
 import numpy as np
 import urllib.request
 import urllib.parse
 from io import BytesIO
 
-from ..models import HotspotResult, AntennaSystem, Building
+from ..models import HotspotResult, AntennaSystem, Building, ResultTable
 from ..config import AGW_LIMIT_VM
 
 
 def visualize_hotspots(
-    results: List[HotspotResult],
+    results: Union[ResultTable, List[HotspotResult]],
     antenna_system: AntennaSystem,
     buildings: Optional[List[Building]] = None,
     output_path: Optional[Path] = None,
@@ -25,7 +25,7 @@ def visualize_hotspots(
     Erstellt eine 3D-Visualisierung der Hotspot-Ergebnisse.
 
     Args:
-        results: Liste von HotspotResult
+        results: ResultTable (oder Liste von HotspotResult)
         antenna_system: AntennaSystem für Antennenposition
         buildings: Optional - Gebäude für Kontext
         output_path: Optional - Pfad für Screenshot
@@ -89,7 +89,7 @@ def visualize_hotspots(
 
 def _add_result_points(
     plotter,
-    results: List[HotspotResult],
+    results: Union[ResultTable, List[HotspotResult]],
     threshold_vm: float,
 ) -> None:
     """Fügt Ergebnispunkte mit Farbskala hinzu."""
@@ -99,8 +99,9 @@ def _add_result_points(
         return
 
     # Punkte und E-Werte extrahieren
-    points = np.array([[r.x, r.y, r.z] for r in results])
-    e_values = np.array([r.e_field_vm for r in results])
+    results = ResultTable.from_results(results)
+    points = results.xyz
+    e_values = results.e_total
 
     # PolyData erstellen
     cloud = pv.PolyData(points)
@@ -317,32 +318,28 @@ def create_hotspot_marker_map(
 
     # Wenn results vorhanden: Zeige Max-E-Punkt pro Gebäude (wenn >= AGW)
     if results:
-        from collections import defaultdict
+        results = ResultTable.from_results(results)
 
-        # Gruppiere alle Punkte nach building_id
-        by_building = defaultdict(list)
-        for r in results:
-            by_building[r.building_id].append(r)
-
-        # Pro Gebäude: Finde Punkt mit max E-Feldstärke
+        # Pro Gebäude: Punkt mit max E-Feldstärke
         # Zeige nur Gebäude mit max_e >= 5.0 V/m
         hotspots = []
-        for building_id, building_points in by_building.items():
-            max_point = max(building_points, key=lambda p: p.e_field_vm)
+        for building_id, max_index in results.building_max_indices().items():
+            x, y, z = results.xyz[max_index].tolist()
+            e_vm = float(results.e_total[max_index])
 
             # Nur Gebäude mit Grenzwertüberschreitung anzeigen
-            if max_point.e_field_vm >= 5.0:
+            if e_vm >= 5.0:
                 hotspots.append({
-                    'x': max_point.x,
-                    'y': max_point.y,
-                    'z': max_point.z,
-                    'e_vm': max_point.e_field_vm,
+                    'x': x,
+                    'y': y,
+                    'z': z,
+                    'e_vm': e_vm,
                     'building_id': building_id,
                 })
 
         # BBox von ALLEN Punkten (nicht nur Hotspots) - wie heatmap
-        all_x = np.array([r.x for r in results])
-        all_y = np.array([r.y for r in results])
+        all_x = results.x
+        all_y = results.y
         margin = 10  # Meter Rand
         x_min, x_max = all_x.min() - margin, all_x.max() + margin
         y_min, y_max = all_y.min() - margin, all_y.max() + margin
@@ -690,7 +687,7 @@ def create_hotspot_marker_map(
 
 
 def export_to_geojson(
-    results: List[HotspotResult],
+    results: Union[ResultTable, List[HotspotResult]],
     output_path: Path,
     threshold_vm: float = AGW_LIMIT_VM,
 ) -> None:
@@ -699,20 +696,25 @@ def export_to_geojson(
     """
     import json
 
+    results = ResultTable.from_results(results)
     features = []
 
-    for r in results:
+    for i, ((x, y, z), e, exceeds) in enumerate(zip(
+        results.xyz.tolist(),
+        results.e_total.tolist(),
+        results.exceeds_limit.tolist(),
+    )):
         feature = {
             "type": "Feature",
             "geometry": {
                 "type": "Point",
-                "coordinates": [float(r.x), float(r.y), float(r.z)],  # LV95
+                "coordinates": [x, y, z],  # LV95
             },
             "properties": {
-                "building_id": str(r.building_id),
-                "e_field_vm": round(float(r.e_field_vm), 4),
-                "exceeds_limit": bool(r.exceeds_limit),
-                "z": round(float(r.z), 2),
+                "building_id": str(results.building_id_at(i)),
+                "e_field_vm": round(e, 4),
+                "exceeds_limit": exceeds,
+                "z": round(z, 2),
             },
         }
         features.append(feature)
@@ -733,7 +735,7 @@ def export_to_geojson(
 
 
 def export_hotspots_for_geoadmin(
-    results: List[HotspotResult],
+    results: Union[ResultTable, List[HotspotResult]],
     antenna_system,
     output_path: Path,
     threshold_vm: float = AGW_LIMIT_VM,
@@ -778,7 +780,8 @@ def export_hotspots_for_geoadmin(
         features.append(antenna_feature)
 
     # 2. Nur Hotspots exportieren (E >= threshold)
-    hotspots = [r for r in results if r.e_field_vm >= threshold_vm]
+    results = ResultTable.from_results(results)
+    hotspots = results[results.e_total >= threshold_vm]
 
     for r in hotspots:
         # Farbcodierung nach E-Feldstärke
@@ -843,7 +846,7 @@ def export_hotspots_for_geoadmin(
 
 
 def export_hotspots_kml(
-    results: List[HotspotResult],
+    results: Union[ResultTable, List[HotspotResult]],
     antenna_system,
     output_path: Path,
     threshold_vm: float = AGW_LIMIT_VM,
@@ -932,7 +935,8 @@ WGS84: {lat:.6f}°N / {lon:.6f}°E
         SubElement(point, 'altitudeMode').text = 'absolute'
 
     # Hotspots
-    hotspots = [r for r in results if r.e_field_vm >= threshold_vm]
+    results = ResultTable.from_results(results)
+    hotspots = results[results.e_total >= threshold_vm]
 
     for r in hotspots:
         e = r.e_field_vm
@@ -1050,7 +1054,7 @@ def _fetch_wms_basemap(
 
 
 def create_heatmap_image(
-    results: List[HotspotResult],
+    results: Union[ResultTable, List[HotspotResult]],
     output_path: Path,
     antenna_system: Optional[AntennaSystem] = None,
     buildings: Optional[List[Building]] = None,
@@ -1064,7 +1068,7 @@ def create_heatmap_image(
     Erstellt ein 2D-Heatmap-Bild (Draufsicht) der E-Feldstärken.
 
     Args:
-        results: Liste von HotspotResult
+        results: ResultTable (oder Liste von HotspotResult)
         buildings: Optional - Gebäudeliste für OMEN-Beschriftung
         output_path: Pfad für die PNG-Datei
         antenna_system: AntennaSystem für Antennenmarker
@@ -1087,9 +1091,10 @@ def create_heatmap_image(
         return
 
     # Extrahiere X, Y, E-Werte
-    x = np.array([r.x for r in results])
-    y = np.array([r.y for r in results])
-    e = np.array([r.e_field_vm for r in results])
+    results = ResultTable.from_results(results)
+    x = results.x
+    y = results.y
+    e = results.e_total
 
     # Bounding Box mit Rand
     margin = 20  # Meter Rand
@@ -1319,16 +1324,16 @@ def _add_building_omen_labels(ax, results, buildings, antenna_system) -> None:
 
     Args:
         ax: Matplotlib Axes
-        results: Liste von HotspotResult
+        results: ResultTable (oder Liste von HotspotResult)
         buildings: Liste von Building
         antenna_system: AntennaSystem mit OMEN-Locations
     """
-    from collections import defaultdict
-
-    # Gruppiere Ergebnisse nach Gebäude-ID
-    by_building = defaultdict(list)
-    for r in results:
-        by_building[r.building_id].append(r)
+    # Zentroid pro Gebäude (Reihenfolge des ersten Auftretens)
+    results = ResultTable.from_results(results)
+    group_ids, inverse = results.building_inverse()
+    counts = np.bincount(inverse, minlength=len(group_ids))
+    centers_e = np.bincount(inverse, weights=results.x, minlength=len(group_ids)) / counts
+    centers_n = np.bincount(inverse, weights=results.y, minlength=len(group_ids)) / counts
 
     # OMEN→Gebäude 1:1-Mapping erstellen
     omen_to_building = {}
@@ -1337,15 +1342,8 @@ def _add_building_omen_labels(ax, results, buildings, antenna_system) -> None:
         closest_building_id = None
         closest_building_center = None
 
-        # Für jedes Gebäude: Zentroid berechnen
-        for building_id, building_results in by_building.items():
-            if not building_results:
-                continue
-
-            building_center_e = np.mean([r.x for r in building_results])
-            building_center_n = np.mean([r.y for r in building_results])
-
-            # Distanz zu OMEN
+        # Für jedes Gebäude: Distanz vom Zentroid zum OMEN
+        for building_id, building_center_e, building_center_n in zip(group_ids, centers_e, centers_n):
             dist = np.sqrt(
                 (omen.position.e - building_center_e)**2 +
                 (omen.position.n - building_center_n)**2
@@ -1374,7 +1372,7 @@ def _add_building_omen_labels(ax, results, buildings, antenna_system) -> None:
 
 
 def export_to_vtk(
-    results: List[HotspotResult],
+    results: Union[ResultTable, List[HotspotResult]],
     output_path: Path,
     antenna_system: Optional[AntennaSystem] = None,
     buildings: Optional[List[Building]] = None,
@@ -1395,7 +1393,7 @@ def export_to_vtk(
     - Professionelle Post-Processing-Möglichkeiten
 
     Args:
-        results: Liste von HotspotResult
+        results: ResultTable (oder Liste von HotspotResult)
         output_path: Pfad für VTU-Datei (Unstructured Grid)
         antenna_system: Optional - AntennaSystem für Antennenpositionen
         buildings: Optional - Gebäude für Kontext
@@ -1418,10 +1416,15 @@ def export_to_vtk(
         return
 
     # Daten vorbereiten
-    points = np.array([[r.x, r.y, r.z] for r in results])
-    e_values = np.array([r.e_field_vm for r in results])
-    exceeds = np.array([int(r.exceeds_limit) for r in results])
-    building_ids = np.array([hash(r.building_id) % 10000 for r in results])  # Als Zahlen für Coloring
+    results = ResultTable.from_results(results)
+    points = results.xyz
+    e_values = results.e_total
+    e_free_values = results.e_field_free
+    has_los = results.has_los.astype(int)
+    exceeds = results.exceeds_limit.astype(int)
+    # Als Zahlen für Coloring (ein Hash pro Gebäude, per Index verteilt)
+    building_hashes = np.array([hash(b) % 10000 for b in results.building_ids], dtype=int)
+    building_ids = building_hashes[results.building_index]
 
     if use_voxels and len(points) < 50000:
         # Erstelle Würfel/Voxel für jeden Punkt (nur für <50k Punkte, sonst zu langsam)
@@ -1466,6 +1469,8 @@ def export_to_vtk(
 
         # Daten auf Cell-Level (nicht Point-Level)
         cloud.cell_data["E_field_Vm"] = e_values
+        cloud.cell_data["E_field_free_Vm"] = e_free_values
+        cloud.cell_data["Has_LOS"] = has_los
         cloud.cell_data["Exceeds_Limit"] = exceeds
         cloud.cell_data["Building_ID"] = building_ids
 
@@ -1477,6 +1482,8 @@ def export_to_vtk(
 
         cloud = pv.PolyData(points)
         cloud["E_field_Vm"] = e_values
+        cloud["E_field_free_Vm"] = e_free_values
+        cloud["Has_LOS"] = has_los
         cloud["Exceeds_Limit"] = exceeds
         cloud["Building_ID"] = building_ids
         cloud["Point_Size_m"] = np.full(len(points), point_size)  # Metadaten für Glyph-Filter
@@ -1485,6 +1492,8 @@ def export_to_vtk(
         # Klassische PointCloud (klein in ParaView)
         cloud = pv.PolyData(points)
         cloud["E_field_Vm"] = e_values
+        cloud["E_field_free_Vm"] = e_free_values
+        cloud["Has_LOS"] = has_los
         cloud["Exceeds_Limit"] = exceeds
         cloud["Building_ID"] = building_ids
         cloud["Point_Size_m"] = np.full(len(points), point_size)  # Metadaten
@@ -1726,12 +1735,10 @@ def export_to_vtk(
 
             # Berechne Radius basierend auf Ergebnissen
             if results:
-                result_e = [r.x for r in results]
-                result_n = [r.y for r in results]
-                radius = max(
-                    max(abs(e - antenna_system.base_position.e) for e in result_e),
-                    max(abs(n - antenna_system.base_position.n) for n in result_n)
-                ) + 50  # +50m Puffer
+                radius = float(max(
+                    np.abs(results.x - antenna_system.base_position.e).max(),
+                    np.abs(results.y - antenna_system.base_position.n).max()
+                )) + 50  # +50m Puffer
             else:
                 radius = 200
 
@@ -1851,3 +1858,46 @@ def export_to_vtk(
     print(f"    → Öffnen mit: paraview {output_path}")
     print(f"    → Oder: python -m pyvista {output_path}")
     print(f"    → {len(results)} Punkte, {len(multiblock)} Objekte")
+
+
+def export_volume_to_vti(
+    volume,
+    output_path: Path,
+    threshold_vm: float = AGW_LIMIT_VM,
+) -> None:
+    """
+    Exportiert ein VolumeGrid als VTK ImageData (.vti) für ParaView.
+
+    Die Datei wird neben dem VTM-Export abgelegt. In ParaView liefert ein
+    Contour-Filter auf E_field_Vm (Wert = threshold_vm) direkt die
+    Grenzwert-Iso-Fläche.
+
+    Args:
+        volume: VolumeGrid aus physics.volume_grid
+        output_path: Pfad für VTI-Datei
+        threshold_vm: Schwellwert für die exceeds_limit-Markierung
+    """
+    try:
+        import pyvista as pv
+    except ImportError:
+        print("  HINWEIS: PyVista nicht installiert - Volumen-Export übersprungen")
+        print("  Installiere mit: pip install pyvista")
+        return
+
+    image = pv.ImageData(
+        dimensions=volume.dimensions,
+        spacing=(volume.spacing_m,) * 3,
+        origin=volume.origin,
+    )
+
+    # Punktdaten in VTK-Reihenfolge (E am schnellsten)
+    e_values = volume.e_field.ravel(order="F")
+    image.point_data["E_field_Vm"] = e_values
+    image.point_data["exceeds_limit"] = (e_values >= threshold_vm).astype(np.uint8)
+
+    image.save(str(output_path))
+
+    nx, ny, nz = volume.dimensions
+    print(f"  Volumen-Export: {output_path}")
+    print(f"    → {nx}×{ny}×{nz} = {len(volume)} Gitterpunkte ({volume.spacing_m}m)")
+    print(f"    → Iso-Fläche in ParaView: Contour-Filter auf E_field_Vm = {threshold_vm}")
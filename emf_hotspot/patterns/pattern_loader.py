@@ -12,6 +12,8 @@ from pathlib import Path
 from typing import Optional, Union
 from scipy.interpolate import interp1d
 
+from ..config import PATTERN_LUT_RESOLUTION_DEG
+from ..models import build_periodic_lut, lookup_periodic_lut
 from .standard_patterns import StandardPattern, ericsson_air3268_standard
 
 
@@ -52,6 +54,22 @@ class PatternData:
             fill_value=(self.attenuation_dB[0], self.attenuation_dB[-1])
         )
 
+        # Periodische Lookup-Tabelle (siehe compile_lut)
+        self.lut: Optional[np.ndarray] = None
+
+    def compile_lut(self, resolution_deg: float = PATTERN_LUT_RESOLUTION_DEG) -> "PatternData":
+        """
+        Tabelliert die Dämpfung auf einem periodischen 0-360°-Raster.
+
+        Danach ist get_attenuation() reine Index-Arithmetik. Die Tabelle ist
+        schreibgeschützt und kann mit Workern geteilt werden.
+
+        Returns:
+            self (für Verkettung)
+        """
+        self.lut = build_periodic_lut(self._interpolator, resolution_deg)
+        return self
+
     def get_attenuation(self, angle_deg: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
         """
         Gibt Dämpfung bei beliebigem Winkel zurück (interpoliert).
@@ -62,9 +80,9 @@ class PatternData:
         Returns:
             Dämpfung in dB (positiv!)
         """
-        # Normalisiere auf [0, 360]
-        angle = np.asarray(angle_deg) % 360
-        return self._interpolator(angle)
+        if self.lut is None:
+            self.compile_lut()
+        return lookup_periodic_lut(self.lut, angle_deg)
 
     def __repr__(self) -> str:
         return (f"PatternData({self.antenna_type}, {self.pattern_type})\n"
@@ -294,4 +312,8 @@ def load_antenna_patterns(
         ods_file, antenna_type, freq_mhz, 'v', standard
     )
 
+    # Lookup-Tabellen einmalig beim Laden erstellen
+    pattern_h.compile_lut()
+    pattern_v.compile_lut()
+
     return pattern_h, pattern_v
@@ -306,24 +306,50 @@ class AdaptiveAntennaModel:
     - Ohne Beamforming: Standard-Sektorantenne
     - Mit Beamforming: Engerer Beam, aber höhere Leistungsdichte
     - Worst-Case: Nutze Standard-Pattern ohne Beamforming-Gewinn
+
+    Strahlschwenk (Beam-Sweep):
+    Der Beam (Basis-Pattern) kann innerhalb des Scanbereichs in jede
+    Richtung (Azimut-Offset, Elevation) geschwenkt werden. Massgebend ist
+    pro Richtung der ungünstigste Schwenk:
+        A(φ, θ) = min über (φs, θs) von H(φ - φs) + V(θ - θs) + L(φs, θs)
+    mit dem Scanverlust L des Einzelelements (3GPP TR 38.901, 0 = ohne).
+    steerable_envelope() tabelliert A auf einem Azimut × Elevation-Raster.
     """
 
     def __init__(
         self,
         base_pattern: StandardPattern,
         num_beams: int = 1,
-        beamforming_gain_dB: float = 0
+        beamforming_gain_dB: float = 0,
+        scan_azimuth_deg: Tuple[float, float] = (0.0, 0.0),
+        scan_elevation_deg: Tuple[float, float] = (0.0, 0.0),
+        element_beamwidth_deg: float = 0.0,
+        element_max_attenuation_dB: float = 30.0,
+        steer_step_deg: float = 1.0,
     ):
         """
         Args:
-            base_pattern: Basis-Pattern (ohne Beamforming)
+            base_pattern: Basis-Pattern (ohne Beamforming), StandardPattern
+                          oder AntennaPattern (Diagramm aus ODS/MSI)
             num_beams: Anzahl simultaner Beams (typisch: 1-8)
             beamforming_gain_dB: Beamforming-Gewinn [dB]
                                  Positiv = engerer Beam, höhere Leistung
+            scan_azimuth_deg: Schwenkbereich (von, bis) relativ zur Hauptstrahlrichtung
+            scan_elevation_deg: Schwenkbereich (von, bis) der Beam-Elevation
+                                (Tilt-Konvention, negativ = nach unten)
+            element_beamwidth_deg: 3dB-Breite des Einzelelements für den
+                                   Scanverlust (0 = kein Scanverlust, konservativ)
+            element_max_attenuation_dB: Maximaler Scanverlust [dB]
+            steer_step_deg: Schrittweite der Schwenkrichtungen
         """
         self.base_pattern = base_pattern
         self.num_beams = num_beams
         self.beamforming_gain_dB = beamforming_gain_dB
+        self.scan_azimuth_deg = scan_azimuth_deg
+        self.scan_elevation_deg = scan_elevation_deg
+        self.element_beamwidth_deg = element_beamwidth_deg
+        self.element_max_attenuation_dB = element_max_attenuation_dB
+        self.steer_step_deg = steer_step_deg
 
     def worst_case_attenuation(
         self,
@@ -340,6 +366,136 @@ class AdaptiveAntennaModel:
         # Beamforming reduziert Dämpfung (höhere Leistungsdichte)
         return base_att + self.beamforming_gain_dB
 
+    def steering_directions(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Schwenkrichtungen (Azimut-Offsets, Elevationen) inkl. Bereichsgrenzen.
+
+        Returns:
+            (azimuth_offsets_deg, elevations_deg)
+        """
+        def steps(lo: float, hi: float) -> np.ndarray:
+            if hi <= lo:
+                return np.array([lo], dtype=float)
+            n_steps = max(int(np.ceil((hi - lo) / self.steer_step_deg - 1e-9)), 1)
+            return np.linspace(lo, hi, n_steps + 1)
+
+        return steps(*self.scan_azimuth_deg), steps(*self.scan_elevation_deg)
+
+    def scan_loss_dB(self, azimuth_offset_deg: np.ndarray, elevation_deg: np.ndarray) -> np.ndarray:
+        """
+        Scanverlust beim Schwenk (positiv), relativ zur Mitte des Scanbereichs.
+
+        3GPP TR 38.901 Einzelelement: min(12(φs/φ3dB)² + 12(θs/θ3dB)², Am).
+        """
+        azimuth_offset_deg = np.asarray(azimuth_offset_deg, dtype=float)
+        elevation_deg = np.asarray(elevation_deg, dtype=float)
+
+        if self.element_beamwidth_deg <= 0:
+            return np.zeros(np.broadcast(azimuth_offset_deg, elevation_deg).shape)
+
+        center_az = 0.5 * (self.scan_azimuth_deg[0] + self.scan_azimuth_deg[1])
+        center_el = 0.5 * (self.scan_elevation_deg[0] + self.scan_elevation_deg[1])
+        loss = (
+            12 * ((azimuth_offset_deg - center_az) / self.element_beamwidth_deg)**2
+            + 12 * ((elevation_deg - center_el) / self.element_beamwidth_deg)**2
+        )
+        return np.minimum(loss, self.element_max_attenuation_dB)
+
+    def _h_attenuation(self, azimuth_rel: np.ndarray) -> np.ndarray:
+        """H-Dämpfung des Basis-Patterns (positiv)"""
+        if hasattr(self.base_pattern, "get_h_attenuation"):
+            return self.base_pattern.get_h_attenuation(azimuth_rel)
+        return -self.base_pattern.azimuth_attenuation(azimuth_rel)
+
+    def _v_attenuation(self, elevation_rel: np.ndarray) -> np.ndarray:
+        """V-Dämpfung des Basis-Patterns (positiv)"""
+        if hasattr(self.base_pattern, "get_v_attenuation"):
+            return self.base_pattern.get_v_attenuation(elevation_rel)
+        return -self.base_pattern.elevation_attenuation(elevation_rel)
+
+    def worst_case_steering(
+        self,
+        azimuth_rel_deg: float,
+        elevation_deg: float,
+    ) -> Tuple[float, float, float, float]:
+        """
+        Ungünstigster Schwenk für eine Richtung (skalare Referenz).
+
+        Args:
+            azimuth_rel_deg: Azimut relativ zur Hauptstrahlrichtung
+            elevation_deg: Absolute Elevation
+
+        Returns:
+            (h_attenuation_dB, v_attenuation_dB, azimuth_offset_deg, elevation_deg)
+            mit v_attenuation inkl. Scanverlust abzüglich Beamforming-Gewinn
+        """
+        azimuths, elevations = self.steering_directions()
+        rel_az = ((azimuth_rel_deg - azimuths[:, None] + 180) % 360) - 180
+        h = self._h_attenuation(rel_az)
+        v = (
+            self._v_attenuation(elevation_deg - elevations[None, :])
+            + self.scan_loss_dB(azimuths[:, None], elevations[None, :])
+            - self.beamforming_gain_dB
+        )
+        total = h + v
+        i, j = np.unravel_index(np.argmin(total), total.shape)
+        return float(h[i, 0]), float(v[i, j]), float(azimuths[i]), float(elevations[j])
+
+    def steerable_envelope(
+        self,
+        azimuth_resolution_deg: float = 0.5,
+        elevation_resolution_deg: float = 0.5,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Worst-Case-Dämpfung über alle Schwenkrichtungen als 2D-Tabelle.
+
+        Raster: relativer Azimut 0 ... 360° (periodisch, ohne Endpunkt),
+        Elevation -90 ... 90° (inkl. Endpunkte). Pro Beam-Elevation θs
+        wird zuerst das Minimum über die Azimut-Offsets bestimmt (V hängt
+        nicht von φs ab), danach das Minimum über θs - Aufwand
+        O(θs · (φs · M_az + M_az · M_el)) statt O(φs · θs · M_az · M_el).
+
+        Returns:
+            (h_attenuation_dB, v_attenuation_dB, azimuth_offset_deg, elevation_deg)
+            je (M_az, M_el); v inkl. Scanverlust abzüglich Beamforming-Gewinn
+        """
+        azimuths, elevations = self.steering_directions()
+        n_az = int(round(360.0 / azimuth_resolution_deg))
+        n_el = int(round(180.0 / elevation_resolution_deg)) + 1
+        grid_az = (360.0 / n_az) * np.arange(n_az)
+        grid_el = -90.0 + elevation_resolution_deg * np.arange(n_el)
+
+        # (M_az, K_az): H-Dämpfung jedes Rasterazimuts für jeden Azimut-Offset
+        rel_az = ((grid_az[:, None] - azimuths[None, :] + 180) % 360) - 180
+        h_by_offset = self._h_attenuation(rel_az)
+
+        best_total = np.full((n_az, n_el), np.inf)
+        best_h = np.zeros((n_az, n_el))
+        best_v = np.zeros((n_az, n_el))
+        best_az = np.zeros((n_az, n_el))
+        best_el = np.zeros((n_az, n_el))
+
+        for elevation in elevations:
+            # Minimum über φs von H + Scanverlust (für diese Beam-Elevation)
+            h_loss = h_by_offset + self.scan_loss_dB(azimuths, elevation)[None, :]
+            k = np.argmin(h_loss, axis=1)
+            rows = np.arange(n_az)
+            h_part = h_by_offset[rows, k]
+            loss_part = h_loss[rows, k] - h_part
+
+            v_part = self._v_attenuation(grid_el - elevation) - self.beamforming_gain_dB
+            v_total = loss_part[:, None] + v_part[None, :]
+            total = h_part[:, None] + v_total
+
+            better = total < best_total
+            best_total = np.where(better, total, best_total)
+            best_h = np.where(better, h_part[:, None], best_h)
+            best_v = np.where(better, v_total, best_v)
+            best_az = np.where(better, azimuths[k][:, None], best_az)
+            best_el = np.where(better, elevation, best_el)
+
+        return best_h, best_v, best_az, best_el
+
 
 # Vordefinierte Typen für häufige CH-Antennen
 def ericsson_air3268_standard(mode: str = '4g') -> StandardPattern:
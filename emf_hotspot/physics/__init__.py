@@ -2,5 +2,12 @@
 
 from .propagation import e_field_free_space, apply_attenuation
 from .summation import sum_e_fields
+from .field_engine import FieldBatch, calculate_field_batch
 
-__all__ = ["e_field_free_space", "apply_attenuation", "sum_e_fields"]
+__all__ = [
+    "e_field_free_space",
+    "apply_attenuation",
+    "sum_e_fields",
+    "FieldBatch",
+    "calculate_field_batch",
+]
@@ -0,0 +1,223 @@
+"""
+Vorberechnete 2D-Hüllkurven für den Strahlschwenk adaptiver Antennen.
+
+Adaptive Antennen (is_adaptive=True, z.B. 5G-AAU) schwenken den Beam
+innerhalb eines Scanbereichs. Worst-Case ist pro Punktrichtung der
+Schwenk mit der geringsten Gesamtdämpfung (AdaptiveAntennaModel). Da
+der Schwenk nur den relativen Azimut und die relative Elevation
+verschiebt, hängt dieses Minimum nur von (Azimut relativ zur
+Hauptstrahlrichtung, absolute Elevation) ab und wird pro Antenne einmal
+auf einem 2D-Raster tabelliert. Die Feldberechnung kostet danach O(1)
+pro Punkt statt O(Schwenkrichtungen).
+
+Schwenkbereich:
+- Azimut: Azimut-Bereich der StDB (falls angegeben), sonst
+  ± ADAPTIVE_SCAN_AZIMUTH_DEG um die Hauptstrahlrichtung
+- Elevation: Tilt-Bereich der StDB (ohne Bereich nur der feste Tilt)
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+import numpy as np
+
+from ..config import (
+    ADAPTIVE_ELEMENT_BEAMWIDTH_DEG,
+    ADAPTIVE_ELEMENT_MAX_ATTENUATION_DB,
+    ADAPTIVE_ENVELOPE_RESOLUTION_DEG,
+    ADAPTIVE_SCAN_AZIMUTH_DEG,
+    ADAPTIVE_STEER_STEP_DEG,
+)
+from ..models import Antenna, AntennaPattern, AntennaSystem
+from ..loaders.pattern_loader_ods import get_pattern_for_antenna
+from ..patterns.standard_patterns import AdaptiveAntennaModel
+from .azimuth_envelope import azimuth_search_range, has_azimuth_range
+
+
+@dataclass
+class AdaptiveEnvelope:
+    """Minimale Dämpfung über alle Schwenkrichtungen als Funktion von (rel. Azimut, Elevation)"""
+    azimuth_resolution_deg: float  # Azimutraster (Start bei 0°, periodisch)
+    elevation_min_deg: float  # Elevation der ersten Spalte
+    elevation_resolution_deg: float  # Elevationsraster
+    h_attenuation_db: np.ndarray  # (M_az, M_el) H-Anteil der Worst-Case-Dämpfung [dB]
+    v_attenuation_db: np.ndarray  # (M_az, M_el) V-Anteil inkl. Scanverlust [dB]
+    critical_azimuth_deg: np.ndarray  # (M_az, M_el) Azimut-Offset des Worst-Case-Schwenks [°]
+    critical_tilt_deg: np.ndarray  # (M_az, M_el) Elevation des Worst-Case-Schwenks [°]
+
+    def lookup(
+        self,
+        azimuth_rel_deg,
+        elevation_deg,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Worst-Case-Dämpfungen und Schwenkrichtung für beliebige Punktrichtungen.
+
+        Die Dämpfungen werden bilinear (im Azimut periodisch) zwischen den
+        Rasterpunkten interpoliert, die Schwenkrichtung vom nächstgelegenen
+        Rasterpunkt übernommen.
+
+        Args:
+            azimuth_rel_deg: Azimut relativ zur Hauptstrahlrichtung [°]
+            elevation_deg: Absolute Elevation [-90, 90]°
+
+        Returns:
+            (h_attenuation_db, v_attenuation_db, azimuth_offset_deg, tilt_deg)
+        """
+        n_az, n_el = self.h_attenuation_db.shape
+
+        az_position = (np.asarray(azimuth_rel_deg, dtype=float) % 360.0) / self.azimuth_resolution_deg
+        az_lower = np.floor(az_position).astype(np.intp) % n_az
+        az_fraction = az_position - np.floor(az_position)
+        az_upper = (az_lower + 1) % n_az
+
+        el_position = (np.asarray(elevation_deg, dtype=float) - self.elevation_min_deg) / self.elevation_resolution_deg
+        el_position = np.clip(el_position, 0.0, n_el - 1)
+        el_lower = np.minimum(el_position.astype(np.intp), n_el - 2)
+        el_fraction = el_position - el_lower
+        el_upper = el_lower + 1
+
+        def interpolate(table: np.ndarray) -> np.ndarray:
+            return (
+                table[az_lower, el_lower] * (1.0 - az_fraction) * (1.0 - el_fraction)
+                + table[az_upper, el_lower] * az_fraction * (1.0 - el_fraction)
+                + table[az_lower, el_upper] * (1.0 - az_fraction) * el_fraction
+                + table[az_upper, el_upper] * az_fraction * el_fraction
+            )
+
+        az_nearest = np.where(az_fraction < 0.5, az_lower, az_upper)
+        el_nearest = np.where(el_fraction < 0.5, el_lower, el_upper)
+
+        return (
+            interpolate(self.h_attenuation_db),
+            interpolate(self.v_attenuation_db),
+            self.critical_azimuth_deg[az_nearest, el_nearest],
+            self.critical_tilt_deg[az_nearest, el_nearest],
+        )
+
+
+def adaptive_scan_range(antenna: Antenna) -> Tuple[Tuple[float, float], Tuple[float, float]]:
+    """
+    Schwenkbereich einer adaptiven Antenne.
+
+    Returns:
+        ((azimut_offset_von, azimut_offset_bis), (elevation_von, elevation_bis))
+        Azimut relativ zur Hauptstrahlrichtung, Elevation in Tilt-Konvention
+    """
+    if has_azimuth_range(antenna):
+        start, span = azimuth_search_range(antenna)
+        offset = ((start - antenna.azimuth_deg + 180.0) % 360.0) - 180.0
+        azimuth_range = (offset, offset + span)
+    else:
+        azimuth_range = (-ADAPTIVE_SCAN_AZIMUTH_DEG, ADAPTIVE_SCAN_AZIMUTH_DEG)
+
+    if antenna.tilt_from_deg == antenna.tilt_to_deg:
+        elevation_range = (float(antenna.tilt_deg), float(antenna.tilt_deg))
+    else:
+        elevation_range = (float(antenna.tilt_from_deg), float(antenna.tilt_to_deg))
+
+    return azimuth_range, elevation_range
+
+
+def adaptive_antenna_model(
+    antenna: Antenna,
+    pattern: AntennaPattern,
+    steer_step_deg: float = ADAPTIVE_STEER_STEP_DEG,
+) -> AdaptiveAntennaModel:
+    """AdaptiveAntennaModel einer Antenne mit dem Diagramm als Beam und ihrem Schwenkbereich"""
+    azimuth_range, elevation_range = adaptive_scan_range(antenna)
+
+    return AdaptiveAntennaModel(
+        base_pattern=pattern,
+        num_beams=antenna.sub_arrays,
+        scan_azimuth_deg=azimuth_range,
+        scan_elevation_deg=elevation_range,
+        element_beamwidth_deg=ADAPTIVE_ELEMENT_BEAMWIDTH_DEG,
+        element_max_attenuation_dB=ADAPTIVE_ELEMENT_MAX_ATTENUATION_DB,
+        steer_step_deg=steer_step_deg,
+    )
+
+
+def build_adaptive_envelope(
+    antenna: Antenna,
+    pattern: Optional[AntennaPattern],
+    resolution_deg: float = ADAPTIVE_ENVELOPE_RESOLUTION_DEG,
+    steer_step_deg: float = ADAPTIVE_STEER_STEP_DEG,
+) -> AdaptiveEnvelope:
+    """
+    Tabelliert die Worst-Case-Dämpfung einer adaptiven Antenne.
+
+    Args:
+        antenna: Antenne (liefert den Schwenkbereich)
+        pattern: Antennendiagramm des Beams (None = keine Dämpfung)
+        resolution_deg: Azimut- und Elevationsraster der Tabelle
+        steer_step_deg: Schrittweite der Schwenkrichtungen
+
+    Returns:
+        AdaptiveEnvelope
+    """
+    n_az = int(round(360.0 / resolution_deg))
+    azimuth_resolution_deg = 360.0 / n_az
+    n_el = int(round(180.0 / resolution_deg)) + 1
+
+    if pattern is None:
+        _, elevation_range = adaptive_scan_range(antenna)
+        return AdaptiveEnvelope(
+            azimuth_resolution_deg=azimuth_resolution_deg,
+            elevation_min_deg=-90.0,
+            elevation_resolution_deg=resolution_deg,
+            h_attenuation_db=np.zeros((n_az, n_el)),
+            v_attenuation_db=np.zeros((n_az, n_el)),
+            critical_azimuth_deg=np.zeros((n_az, n_el)),
+            critical_tilt_deg=np.full((n_az, n_el), elevation_range[0]),
+        )
+
+    model = adaptive_antenna_model(antenna, pattern, steer_step_deg)
+    h_atten, v_atten, azimuth_offset, tilt = model.steerable_envelope(
+        azimuth_resolution_deg, resolution_deg
+    )
+
+    return AdaptiveEnvelope(
+        azimuth_resolution_deg=azimuth_resolution_deg,
+        elevation_min_deg=-90.0,
+        elevation_resolution_deg=resolution_deg,
+        h_attenuation_db=h_atten,
+        v_attenuation_db=v_atten,
+        critical_azimuth_deg=azimuth_offset,
+        critical_tilt_deg=tilt,
+    )
+
+
+def build_adaptive_envelopes(
+    antenna_system: AntennaSystem,
+    patterns: dict[Tuple[str, str], AntennaPattern],
+    resolution_deg: float = ADAPTIVE_ENVELOPE_RESOLUTION_DEG,
+    steer_step_deg: float = ADAPTIVE_STEER_STEP_DEG,
+) -> Dict[int, AdaptiveEnvelope]:
+    """
+    Erstellt die 2D-Hüllkurven für alle adaptiven Antennen eines Systems.
+
+    Passive Antennen erhalten keinen Eintrag (Tilt-/Azimut-Hüllkurven).
+    Antennen mit gleichem Diagramm und gleichem Schwenkbereich teilen
+    sich eine Tabelle.
+
+    Returns:
+        Dictionary: antenna.id -> AdaptiveEnvelope
+    """
+    envelopes = {}
+    shared = {}
+
+    for antenna in antenna_system.antennas:
+        if not antenna.is_adaptive:
+            continue
+
+        pattern = get_pattern_for_antenna(
+            patterns, antenna.antenna_type, antenna.frequency_band
+        )
+        key = (id(pattern), adaptive_scan_range(antenna))
+
+        if key not in shared:
+            shared[key] = build_adaptive_envelope(antenna, pattern, resolution_deg, steer_step_deg)
+
+        envelopes[antenna.id] = shared[key]
+
+    return envelopes
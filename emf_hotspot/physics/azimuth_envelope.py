@@ -0,0 +1,172 @@
+"""
+Vorberechnete Azimut-Hüllkurven für die Worst-Case-Azimut-Suche.
+
+Gibt die StDB für eine Antenne einen Azimut-Bereich an, zählt die
+ungünstigste Hauptstrahlrichtung innerhalb dieses Bereichs. Die Richtung
+verschiebt nur den relativen Azimut (rel = azimut_punkt - azimut_antenne);
+die Worst-Case-H-Dämpfung ist daher ein Sliding-Window-Minimum über das
+H-Diagramm und hängt nur vom absoluten Azimut des Punktes ab. Wie bei der
+Tilt-Hüllkurve wird diese Funktion pro Antenne einmal auf einem
+periodischen 0-360°-Raster tabelliert; die Suche kostet danach O(1) pro
+Punkt statt O(Azimut-Bereich).
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+import numpy as np
+
+from ..config import AZIMUTH_ENVELOPE_RESOLUTION_DEG, AZIMUTH_STEP_DEG
+from ..models import Antenna, AntennaPattern, AntennaSystem
+from ..loaders.pattern_loader_ods import get_pattern_for_antenna
+
+
+@dataclass
+class AzimuthEnvelope:
+    """Minimale H-Dämpfung über den Azimut-Bereich als Funktion des Punkt-Azimuts"""
+    resolution_deg: float  # Rasterweite der Tabelle (Start bei 0°)
+    h_attenuation_db: np.ndarray  # (M,) Worst-Case-H-Dämpfung [dB]
+    critical_azimuth_deg: np.ndarray  # (M,) Azimut der Antenne, der das Minimum liefert [°]
+
+    def lookup(self, azimuth_deg) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Worst-Case-H-Dämpfung und kritischer Azimut für beliebige Punkt-Azimute.
+
+        Die Dämpfung wird linear (periodisch) zwischen den Rasterpunkten
+        interpoliert, der Azimut vom nächstgelegenen Rasterpunkt übernommen.
+
+        Args:
+            azimuth_deg: Absolute Azimute der Punkte [°] (0° = Nord)
+
+        Returns:
+            (h_attenuation_db, critical_azimuth_deg) - gleiche Form wie Eingabe
+        """
+        n_cells = len(self.h_attenuation_db)
+        position = (np.asarray(azimuth_deg, dtype=float) % 360.0) / self.resolution_deg
+
+        lower = np.floor(position).astype(np.intp) % n_cells
+        fraction = position - np.floor(position)
+        upper = (lower + 1) % n_cells
+
+        h_atten = (
+            self.h_attenuation_db[lower] * (1.0 - fraction)
+            + self.h_attenuation_db[upper] * fraction
+        )
+        nearest = np.where(fraction < 0.5, lower, upper)
+
+        return h_atten, self.critical_azimuth_deg[nearest]
+
+
+def has_azimuth_range(antenna: Antenna) -> bool:
+    """True, wenn die StDB einen Azimut-Bereich (statt eines festen Werts) angibt."""
+    return (
+        antenna.azimuth_from_deg is not None
+        and antenna.azimuth_to_deg is not None
+        and (antenna.azimuth_to_deg - antenna.azimuth_from_deg) % 360.0 > 0.0
+    )
+
+
+def azimuth_search_range(antenna: Antenna) -> Tuple[float, float]:
+    """
+    Azimut-Bereich der Suche als (Start, Spannweite) im Uhrzeigersinn.
+
+    Ohne Bereich: (azimuth_deg, 0). Bereiche über Nord (z.B. 350° bis 10°)
+    ergeben Start 350°, Spannweite 20°.
+    """
+    if not has_azimuth_range(antenna):
+        return float(antenna.azimuth_deg), 0.0
+
+    start = float(antenna.azimuth_from_deg) % 360.0
+    span = (float(antenna.azimuth_to_deg) - float(antenna.azimuth_from_deg)) % 360.0
+    return start, span
+
+
+def azimuth_search_values(antenna: Antenna, azimuth_step_deg: float = AZIMUTH_STEP_DEG) -> np.ndarray:
+    """
+    Azimut-Werte der Worst-Case-Suche (inkl. Endpunkten, höchstens azimuth_step_deg auseinander).
+
+    Ohne Bereich nur azimuth_deg.
+    """
+    start, span = azimuth_search_range(antenna)
+    if span == 0.0:
+        return np.array([start], dtype=float)
+
+    n_steps = max(int(np.ceil(span / azimuth_step_deg - 1e-9)), 1)
+    return (start + np.linspace(0.0, span, n_steps + 1)) % 360.0
+
+
+def build_azimuth_envelope(
+    antenna: Antenna,
+    pattern: Optional[AntennaPattern],
+    resolution_deg: float = AZIMUTH_ENVELOPE_RESOLUTION_DEG,
+    azimuth_step_deg: float = AZIMUTH_STEP_DEG,
+) -> AzimuthEnvelope:
+    """
+    Tabelliert die Worst-Case-H-Dämpfung einer Antenne über [0, 360)°.
+
+    Args:
+        antenna: Antenne (liefert den Azimut-Bereich)
+        pattern: Antennendiagramm (None = keine Dämpfung)
+        resolution_deg: Azimutraster der Tabelle
+        azimuth_step_deg: Schrittweite im Azimut-Bereich
+
+    Returns:
+        AzimuthEnvelope
+    """
+    azimuths = azimuth_search_values(antenna, azimuth_step_deg)
+    n_cells = int(round(360.0 / resolution_deg))
+    resolution_deg = 360.0 / n_cells
+    point_azimuths = resolution_deg * np.arange(n_cells)
+
+    if pattern is None:
+        return AzimuthEnvelope(
+            resolution_deg=resolution_deg,
+            h_attenuation_db=np.zeros(n_cells),
+            critical_azimuth_deg=np.full(n_cells, azimuths[0]),
+        )
+
+    # (M, K): H-Dämpfung jedes Punkt-Azimuts für jede Richtung, Minimum über K
+    rel_azimuth = ((point_azimuths[:, None] - azimuths[None, :] + 180) % 360) - 180
+    h_by_azimuth = pattern.get_h_attenuation(rel_azimuth)
+    best = np.argmin(h_by_azimuth, axis=1)  # Bei Gleichstand die erste Richtung
+
+    return AzimuthEnvelope(
+        resolution_deg=resolution_deg,
+        h_attenuation_db=h_by_azimuth[np.arange(n_cells), best],
+        critical_azimuth_deg=azimuths[best],
+    )
+
+
+def build_azimuth_envelopes(
+    antenna_system: AntennaSystem,
+    patterns: dict[Tuple[str, str], AntennaPattern],
+    resolution_deg: float = AZIMUTH_ENVELOPE_RESOLUTION_DEG,
+    azimuth_step_deg: float = AZIMUTH_STEP_DEG,
+) -> Dict[int, AzimuthEnvelope]:
+    """
+    Erstellt die Azimut-Hüllkurven für alle Antennen mit Azimut-Bereich.
+
+    Antennen mit festem Azimut erhalten keinen Eintrag (direkter
+    Diagramm-Lookup). Antennen mit gleichem Diagramm und gleichem
+    Bereich teilen sich eine Tabelle.
+
+    Returns:
+        Dictionary: antenna.id -> AzimuthEnvelope
+    """
+    envelopes = {}
+    shared = {}
+
+    for antenna in antenna_system.antennas:
+        if not has_azimuth_range(antenna):
+            continue
+
+        pattern = get_pattern_for_antenna(
+            patterns, antenna.antenna_type, antenna.frequency_band
+        )
+        key = (id(pattern), azimuth_search_range(antenna))
+
+        if key not in shared:
+            shared[key] = build_azimuth_envelope(antenna, pattern, resolution_deg, azimuth_step_deg)
+
+        envelopes[antenna.id] = shared[key]
+
+    return envelopes
@@ -0,0 +1,293 @@
+"""
+Konservative Obergrenzen der E-Feldstärke für achsparallele Boxen.
+
+Für eine Box (AABB in LV95) wird pro Antenne abgeschätzt:
+- kleinster Abstand Antenne → Box
+- kleinste H-Dämpfung über den Azimutbereich, unter dem die Box erscheint
+  (erweitert um den Azimut-Bereich der Antenne, falls die StDB einen angibt)
+- kleinste Worst-Case-V-Dämpfung (Tilt-Hüllkurve) über den Elevationsbereich
+- bei Strahlschwenk (adaptive Antennen): kleinste Gesamtdämpfung H + V der
+  2D-Hüllkurve, abgeschätzt über ihre Azimut- und Elevationsprofile
+
+Da E mit wachsendem Abstand und wachsender Dämpfung monoton fällt, liegt
+die Feldstärke jedes Punktes der Box unter der so berechneten Grenze
+(gleiche Formel wie calculate_e_field_with_pattern_batch()). Die Minima
+über Winkelbereiche werden auf den Diagramm-/Hüllkurventabellen mit einer
+Sparse-Table in O(1) pro Box bestimmt; die Tabellenpunkte, zwischen denen
+die Lookups linear interpolieren, sind dabei eingeschlossen.
+"""
+
+from typing import Dict, Optional, Tuple
+import numpy as np
+
+from ..config import E_FIELD_CONSTANT, MIN_DISTANCE_M
+from ..models import AntennaPattern, AntennaSystem
+from ..loaders.pattern_loader_ods import get_pattern_for_antenna
+from .tilt_envelope import TiltEnvelope, build_tilt_envelopes
+from .azimuth_envelope import azimuth_search_range
+from .adaptive_envelope import AdaptiveEnvelope
+
+
+class _RangeMinimum:
+    """Sparse-Table für Bereichsminima min(values[lo..hi]) in O(1)"""
+
+    def __init__(self, values: np.ndarray):
+        values = np.asarray(values, dtype=float)
+        n_values = len(values)
+        n_levels = max(1, int(np.floor(np.log2(max(n_values, 1)))) + 1)
+
+        table = np.full((n_levels, n_values), np.inf)
+        table[0] = values
+        for level in range(1, n_levels):
+            width = 1 << (level - 1)
+            table[level, :n_values - width] = np.minimum(
+                table[level - 1, :n_values - width], table[level - 1, width:]
+            )
+
+        self.table = table
+        self.overall_min = float(values.min()) if n_values else 0.0
+
+    def query(self, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+        """Minimum über die Indexbereiche [lo, hi] (inklusive, lo <= hi)"""
+        length = hi - lo + 1
+        level = np.floor(np.log2(length)).astype(np.intp)
+        return np.minimum(
+            self.table[level, lo],
+            self.table[level, hi - (1 << level) + 1],
+        )
+
+
+class FieldUpperBound:
+    """
+    Obergrenzen der Gesamtfeldstärke (Freiraum) für viele Boxen.
+
+    Die Tabellen werden einmal pro Antennensystem aufgebaut und können
+    für beliebig viele for_boxes()-Aufrufe wiederverwendet werden.
+    """
+
+    def __init__(
+        self,
+        antenna_system: AntennaSystem,
+        patterns: dict[Tuple[str, str], AntennaPattern],
+        tilt_envelopes: Optional[Dict[int, TiltEnvelope]] = None,
+        adaptive_envelopes: Optional[Dict[int, AdaptiveEnvelope]] = None,
+    ):
+        if tilt_envelopes is None:
+            tilt_envelopes = build_tilt_envelopes(antenna_system, patterns)
+        if adaptive_envelopes is None:
+            adaptive_envelopes = {}
+
+        self.antennas = antenna_system.antennas
+        self._h_tables = []
+        self._v_tables = []
+        self._adaptive_tables = []
+        shared = {}
+
+        for antenna in self.antennas:
+            pattern = get_pattern_for_antenna(
+                patterns, antenna.antenna_type, antenna.frequency_band
+            )
+            envelope = tilt_envelopes[antenna.id]
+
+            if pattern:
+                if pattern.h_lut is None:
+                    pattern.compile_lut()
+                key = ("h", id(pattern.h_lut))
+                if key not in shared:
+                    # Doppelte Tabelle: Azimutbereiche über 0°/360° ohne Umbruch
+                    shared[key] = _RangeMinimum(np.concatenate([pattern.h_lut] * 2))
+                self._h_tables.append((shared[key], len(pattern.h_lut)))
+            else:
+                self._h_tables.append(None)
+
+            key = ("v", id(envelope))
+            if key not in shared:
+                shared[key] = _RangeMinimum(envelope.v_attenuation_db)
+            self._v_tables.append((shared[key], envelope))
+
+            adaptive = adaptive_envelopes.get(antenna.id)
+            if adaptive is not None:
+                key = ("adaptive", id(adaptive))
+                if key not in shared:
+                    # Profile der Gesamtdämpfung: Minimum über Elevation bzw. Azimut
+                    total = adaptive.h_attenuation_db + adaptive.v_attenuation_db
+                    shared[key] = (
+                        _RangeMinimum(np.concatenate([total.min(axis=1)] * 2)),
+                        _RangeMinimum(total.min(axis=0)),
+                    )
+                self._adaptive_tables.append((shared[key], adaptive))
+            else:
+                self._adaptive_tables.append(None)
+
+    def for_boxes(self, box_min: np.ndarray, box_max: np.ndarray) -> np.ndarray:
+        """
+        Obergrenze der Gesamtfeldstärke pro Box.
+
+        Args:
+            box_min: (M, 3) untere Ecken [E, N, H]
+            box_max: (M, 3) obere Ecken [E, N, H]
+
+        Returns:
+            (M,) Obergrenze von sqrt(Σ E_i²) [V/m] über alle Punkte der Box
+        """
+        box_min = np.asarray(box_min, dtype=float).reshape(-1, 3)
+        box_max = np.asarray(box_max, dtype=float).reshape(-1, 3)
+        e_squared = np.zeros(len(box_min))
+
+        for antenna, h_entry, (v_table, envelope), adaptive_entry in zip(
+            self.antennas, self._h_tables, self._v_tables, self._adaptive_tables
+        ):
+            if antenna.erp_watts <= 0:
+                continue
+
+            position = antenna.position.to_array()
+            distance, h_horizontal_min, h_horizontal_max = _box_distances(
+                position, box_min, box_max
+            )
+            elev_min, elev_max = _elevation_range(
+                position, box_min, box_max, h_horizontal_min, h_horizontal_max
+            )
+
+            if adaptive_entry is not None:
+                # Strahlschwenk: H + V ist mindestens so gross wie das Minimum
+                # jedes der beiden Profile über den Winkelbereich der Box
+                # (als H-Dämpfung angesetzt, V = 0)
+                (az_table, el_table), adaptive = adaptive_entry
+                az_from, az_span = _azimuth_span(position, box_min, box_max, h_horizontal_min)
+                h_atten_min = np.maximum(
+                    _periodic_range_min(
+                        az_table, adaptive.h_attenuation_db.shape[0],
+                        az_from - antenna.azimuth_deg, az_span,
+                    ),
+                    _envelope_range_min(
+                        el_table, adaptive.elevation_min_deg, adaptive.elevation_resolution_deg,
+                        adaptive.h_attenuation_db.shape[1], elev_min, elev_max,
+                    ),
+                )
+                v_atten_min = np.zeros(len(box_min))
+            else:
+                # Kleinste H-Dämpfung über den Azimutbereich der Box
+                # (relativer Azimut über alle Richtungen des Azimut-Bereichs)
+                if h_entry is None:
+                    h_atten_min = np.zeros(len(box_min))
+                else:
+                    az_from, az_span = _azimuth_span(position, box_min, box_max, h_horizontal_min)
+                    antenna_from, antenna_span = azimuth_search_range(antenna)
+                    h_atten_min = _periodic_range_min(
+                        h_entry[0], h_entry[1],
+                        az_from - antenna_from - antenna_span, az_span + antenna_span,
+                    )
+
+                # Kleinste Worst-Case-V-Dämpfung über den Elevationsbereich der Box
+                v_atten_min = _envelope_range_min(
+                    v_table, envelope.elevation_min_deg, envelope.resolution_deg,
+                    len(envelope.v_attenuation_db), elev_min, elev_max,
+                )
+
+            gamma_h = 10.0 ** (np.maximum(h_atten_min, 0.0) / 10.0)
+            gamma_v = 10.0 ** (np.maximum(v_atten_min, 0.0) / 10.0)
+            distance = np.maximum(distance, MIN_DISTANCE_M)
+
+            e_squared += E_FIELD_CONSTANT * antenna.erp_watts / (gamma_h * gamma_v) / distance**2
+
+        return np.sqrt(e_squared)
+
+
+def _box_distances(
+    position: np.ndarray,
+    box_min: np.ndarray,
+    box_max: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Kleinster 3D-Abstand sowie kleinster/grösster Horizontalabstand zur Box.
+    """
+    nearest = np.clip(position, box_min, box_max)
+    delta = nearest - position
+    distance = np.sqrt(np.sum(delta**2, axis=1))
+    horizontal_min = np.sqrt(np.sum(delta[:, :2]**2, axis=1))
+
+    farthest = np.maximum(np.abs(box_min[:, :2] - position[:2]), np.abs(box_max[:, :2] - position[:2]))
+    horizontal_max = np.sqrt(np.sum(farthest**2, axis=1))
+
+    return distance, horizontal_min, horizontal_max
+
+
+def _azimuth_span(
+    position: np.ndarray,
+    box_min: np.ndarray,
+    box_max: np.ndarray,
+    horizontal_min: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Azimutbereich [az_from, az_from + span] der Box von der Antenne aus.
+
+    Liegt die Antenne über/unter dem Grundriss der Box, ist der Bereich 360°.
+    Sonst ist der Bereich kleiner als 180° und wird von den Grundrissecken
+    aufgespannt.
+    """
+    corners_e = np.stack([box_min[:, 0], box_max[:, 0], box_min[:, 0], box_max[:, 0]], axis=1)
+    corners_n = np.stack([box_min[:, 1], box_min[:, 1], box_max[:, 1], box_max[:, 1]], axis=1)
+    azimuths = np.degrees(np.arctan2(corners_e - position[0], corners_n - position[1]))
+
+    # Winkel relativ zur ersten Ecke in [-180, 180)
+    relative = ((azimuths - azimuths[:, :1] + 180.0) % 360.0) - 180.0
+    az_from = azimuths[:, 0] + relative.min(axis=1)
+    span = relative.max(axis=1) - relative.min(axis=1)
+
+    span = np.where(horizontal_min <= 0.0, 360.0, span)
+    return az_from, span
+
+
+def _elevation_range(
+    position: np.ndarray,
+    box_min: np.ndarray,
+    box_max: np.ndarray,
+    horizontal_min: np.ndarray,
+    horizontal_max: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Elevationsbereich der Box (gleiche Konvention wie calculate_point_angles_batch).
+    """
+    dz_min = box_min[:, 2] - position[2]
+    dz_max = box_max[:, 2] - position[2]
+
+    elev_max = np.degrees(np.arctan2(dz_max, np.where(dz_max >= 0, horizontal_min, horizontal_max)))
+    elev_min = np.degrees(np.arctan2(dz_min, np.where(dz_min >= 0, horizontal_max, horizontal_min)))
+
+    return elev_min, elev_max
+
+
+def _periodic_range_min(
+    table: _RangeMinimum,
+    n_cells: int,
+    angle_from: np.ndarray,
+    span: np.ndarray,
+) -> np.ndarray:
+    """Minimum einer periodischen Tabelle über [angle_from, angle_from + span]"""
+    cells_per_deg = n_cells / 360.0
+    start = (angle_from % 360.0) * cells_per_deg
+
+    lo = np.floor(start).astype(np.intp) % n_cells
+    hi = np.ceil(start + span * cells_per_deg).astype(np.intp)
+    hi = np.clip(hi, lo, lo + n_cells)
+
+    result = table.query(lo, hi)
+    return np.where(span >= 360.0, table.overall_min, result)
+
+
+def _envelope_range_min(
+    table: _RangeMinimum,
+    elevation_min_deg: float,
+    resolution_deg: float,
+    n_cells: int,
+    elevation_from: np.ndarray,
+    elevation_to: np.ndarray,
+) -> np.ndarray:
+    """Minimum einer Elevationstabelle (Hüllkurve) über [elevation_from, elevation_to]"""
+    last = n_cells - 1
+    lo = np.floor((elevation_from - elevation_min_deg) / resolution_deg)
+    hi = np.ceil((elevation_to - elevation_min_deg) / resolution_deg)
+
+    lo = np.clip(lo, 0, last).astype(np.intp)
+    hi = np.clip(hi, lo, last).astype(np.intp)
+    return table.query(lo, hi)
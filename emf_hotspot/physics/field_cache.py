@@ -0,0 +1,265 @@
+"""
+Feldcache pro Antenne für ERP-Szenarien ("what-if").
+
+Die E-Feldstärke skaliert mit sqrt(ERP): E_i = sqrt(ERP_i · u_i) mit dem
+Einheitsbeitrag u_i = 49 / (γ_h · γ_v) / d² (E² bei 1 W ERP). Geometrie,
+Diagramme, Worst-Case-Tilt und LOS hängen nicht von der ERP ab. Werden u_i
+und die LOS-Spalten nach einer Analyse gespeichert, lassen sich Gesamtfeld
+und Hotspots für geänderte ERP-Werte ohne Gebäude, Abtastung und
+Feldberechnung neu bestimmen.
+
+Einschränkung: Die LOS-Prüfung läuft nur für Punkte über dem Schwellwert
+(Freiraum). Punkte, die erst durch eine höhere ERP über den Schwellwert
+kommen, sind nicht geprüft und bleiben ungedämpft (konservativ).
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
+
+from ..config import AGW_LIMIT_VM
+from ..models import AntennaSystem, ResultTable
+from .propagation import calculate_e_field_with_pattern_batch
+
+
+# Dateiname des Caches im Ausgabeverzeichnis einer Analyse
+FIELD_CACHE_FILENAME = "feldcache.npz"
+
+
+@dataclass
+class FieldCache:
+    """Einheits-ERP-Beiträge und LOS-Spalten einer Analyse"""
+    xyz: np.ndarray  # (N, 3) [E, N, H]
+    building_index: np.ndarray  # (N,) Index in building_ids
+    building_ids: List[str]  # Gebäude-ID-Tabelle
+    antenna_ids: np.ndarray  # (A,) Antennen-IDs in Spaltenreihenfolge
+    erp_watts: np.ndarray  # (A,) ERP der Analyse [W]
+    e2_unit: np.ndarray  # (N, A) E² bei 1 W ERP [V²/m²] (Freiraum)
+    critical_tilt: np.ndarray  # (N, A) Worst-Case-Tilt [°]
+    critical_azimuth: np.ndarray  # (N, A) Worst-Case-Azimut [°]
+    distance: np.ndarray  # (N, A) 3D-Abstand [m]
+    h_atten: np.ndarray  # (N, A) H-Dämpfung [dB]
+    v_atten: np.ndarray  # (N, A) V-Dämpfung [dB]
+    has_los: np.ndarray  # (N,) bool
+    num_buildings_blocking: np.ndarray  # (N,)
+    building_attenuation_db: np.ndarray  # (N,) Wirksame Gebäudedämpfung [dB]
+    building_atten: np.ndarray  # (N, A) Gebäudedämpfung pro Antenne [dB]
+    los_checked: np.ndarray  # (N,) bool - LOS wurde für den Punkt geprüft
+    antenna_geometry: np.ndarray  # (A, 8) E, N, H, Azimut, Tilt von/bis, Azimut von/bis
+    antenna_types: List[str]  # (A,) "Typ|Band" pro Antenne
+    threshold_vm: float = AGW_LIMIT_VM
+    omen_file: str = ""  # OMEN-Datei der Analyse
+
+    def __len__(self) -> int:
+        return len(self.xyz)
+
+    @classmethod
+    def from_results(
+        cls,
+        results: ResultTable,
+        antenna_system: AntennaSystem,
+        los_checked: Optional[np.ndarray] = None,
+        omen_file: str = "",
+    ) -> "FieldCache":
+        """
+        Erstellt den Cache aus einer ResultTable (nach der LOS-Analyse).
+
+        Args:
+            results: ResultTable mit Beitragsmatrizen und LOS-Spalten
+            antenna_system: Antennensystem der Analyse (Spaltenreihenfolge wie results)
+            los_checked: (N,) Maske der LOS-geprüften Punkte (None = alle)
+            omen_file: Pfad der OMEN-Datei (für spätere Szenarien)
+        """
+        antennas = _antennas_by_id(antenna_system, results.antenna_ids)
+
+        # u_i aus Abstand und Dämpfungen (auch für Antennen mit ERP = 0)
+        e2_unit = calculate_e_field_with_pattern_batch(
+            erp_watts=1.0,
+            distance_m=results.distance,
+            h_attenuation_db=results.h_atten,
+            v_attenuation_db=results.v_atten,
+        ) ** 2
+
+        if los_checked is None:
+            los_checked = np.ones(len(results), dtype=bool)
+
+        return cls(
+            xyz=results.xyz,
+            building_index=results.building_index,
+            building_ids=list(results.building_ids),
+            antenna_ids=np.asarray(results.antenna_ids),
+            erp_watts=np.array([ant.erp_watts for ant in antennas], dtype=float),
+            e2_unit=e2_unit,
+            critical_tilt=results.critical_tilt,
+            critical_azimuth=results.critical_azimuth,
+            distance=results.distance,
+            h_atten=results.h_atten,
+            v_atten=results.v_atten,
+            has_los=results.has_los,
+            num_buildings_blocking=results.num_buildings_blocking,
+            building_attenuation_db=results.building_attenuation_db,
+            building_atten=results.contrib_building_attenuation,
+            los_checked=np.asarray(los_checked, dtype=bool),
+            antenna_geometry=_antenna_geometry(antennas),
+            antenna_types=[f"{ant.antenna_type}|{ant.frequency_band}" for ant in antennas],
+            threshold_vm=results.threshold_vm,
+            omen_file=str(omen_file),
+        )
+
+    def save(self, path: Path) -> None:
+        """Speichert den Cache als unkomprimiertes .npz"""
+        np.savez(
+            path,
+            xyz=self.xyz,
+            building_index=self.building_index,
+            building_ids=np.array(self.building_ids, dtype=str),
+            antenna_ids=self.antenna_ids,
+            erp_watts=self.erp_watts,
+            e2_unit=self.e2_unit,
+            critical_tilt=self.critical_tilt,
+            critical_azimuth=self.critical_azimuth,
+            distance=self.distance,
+            h_atten=self.h_atten,
+            v_atten=self.v_atten,
+            has_los=self.has_los,
+            num_buildings_blocking=self.num_buildings_blocking,
+            building_attenuation_db=self.building_attenuation_db,
+            building_atten=self.building_atten,
+            los_checked=self.los_checked,
+            antenna_geometry=self.antenna_geometry,
+            antenna_types=np.array(self.antenna_types, dtype=str),
+            threshold_vm=np.float64(self.threshold_vm),
+            omen_file=np.array(self.omen_file, dtype=str),
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "FieldCache":
+        """Lädt einen mit save() geschriebenen Cache"""
+        with np.load(path, allow_pickle=False) as data:
+            # Ältere Caches: gleiche Dämpfung für alle Antennen eines Punkts
+            if "building_atten" in data:
+                building_atten = data["building_atten"]
+            else:
+                building_atten = np.repeat(
+                    data["building_attenuation_db"][:, None], len(data["antenna_ids"]), axis=1
+                )
+            return cls(
+                xyz=data["xyz"],
+                building_index=data["building_index"],
+                building_ids=data["building_ids"].tolist(),
+                antenna_ids=data["antenna_ids"],
+                erp_watts=data["erp_watts"],
+                e2_unit=data["e2_unit"],
+                critical_tilt=data["critical_tilt"],
+                critical_azimuth=data["critical_azimuth"],
+                distance=data["distance"],
+                h_atten=data["h_atten"],
+                v_atten=data["v_atten"],
+                has_los=data["has_los"],
+                num_buildings_blocking=data["num_buildings_blocking"],
+                building_attenuation_db=data["building_attenuation_db"],
+                building_atten=building_atten,
+                los_checked=data["los_checked"],
+                antenna_geometry=data["antenna_geometry"],
+                antenna_types=data["antenna_types"].tolist(),
+                threshold_vm=float(data["threshold_vm"]),
+                omen_file=str(data["omen_file"]),
+            )
+
+    def geometry_changes(self, antenna_system: AntennaSystem) -> List[str]:
+        """
+        Prüft, ob ein (revidiertes) Antennensystem nur die ERP ändert.
+
+        Returns:
+            Liste der Abweichungen (leer = Cache gültig)
+        """
+        cached_ids = self.antenna_ids.tolist()
+        system_ids = sorted(ant.id for ant in antenna_system.antennas)
+        if sorted(cached_ids) != system_ids:
+            return [f"Antennen-IDs {sorted(cached_ids)} → {system_ids}"]
+
+        antennas = _antennas_by_id(antenna_system, self.antenna_ids)
+        geometry = _antenna_geometry(antennas)
+        changes = []
+
+        for col, ant in enumerate(antennas):
+            if not np.allclose(geometry[col], self.antenna_geometry[col], atol=1e-6, equal_nan=True):
+                changes.append(f"Antenne {ant.id}: Position/Azimut/Tilt geändert")
+            if f"{ant.antenna_type}|{ant.frequency_band}" != self.antenna_types[col]:
+                changes.append(f"Antenne {ant.id}: Typ/Band geändert")
+
+        return changes
+
+    def results_for_erp(
+        self,
+        erp_watts: Optional[Dict[int, float]] = None,
+        threshold_vm: Optional[float] = None,
+    ) -> ResultTable:
+        """
+        Berechnet die ResultTable für geänderte ERP-Werte.
+
+        Args:
+            erp_watts: antenna.id -> ERP [W] (nicht enthaltene Antennen unverändert)
+            threshold_vm: Schwellwert (None = Schwellwert der Analyse)
+
+        Returns:
+            ResultTable inkl. Gebäudedämpfung der Analyse
+        """
+        erp = self.scenario_erp(erp_watts)
+
+        e_contrib = np.sqrt(self.e2_unit * erp)
+        e_field_free = np.sqrt(np.sum(e_contrib**2, axis=1))
+
+        results = ResultTable(
+            xyz=self.xyz,
+            building_index=self.building_index,
+            building_ids=self.building_ids,
+            antenna_ids=self.antenna_ids,
+            e_total=e_field_free.copy(),
+            e_contrib=e_contrib,
+            critical_tilt=self.critical_tilt,
+            critical_azimuth=self.critical_azimuth,
+            distance=self.distance,
+            h_atten=self.h_atten,
+            v_atten=self.v_atten,
+            has_los=self.has_los,
+            num_buildings_blocking=self.num_buildings_blocking,
+            building_attenuation_db=self.building_attenuation_db,
+            e_field_free=e_field_free,
+            threshold_vm=self.threshold_vm if threshold_vm is None else threshold_vm,
+        )
+        results.apply_building_attenuation(self.building_atten)
+
+        return results
+
+    def scenario_erp(self, erp_watts: Optional[Dict[int, float]] = None) -> np.ndarray:
+        """(A,) ERP-Vektor in Spaltenreihenfolge mit den Änderungen aus erp_watts"""
+        erp = self.erp_watts.copy()
+        for col, ant_id in enumerate(self.antenna_ids.tolist()):
+            if erp_watts and ant_id in erp_watts:
+                erp[col] = max(float(erp_watts[ant_id]), 0.0)
+        return erp
+
+    def unchecked_candidates(self, results: ResultTable) -> np.ndarray:
+        """Maske der Punkte über dem Schwellwert, deren LOS nie geprüft wurde"""
+        return ~self.los_checked & (results.e_field_free >= results.threshold_vm)
+
+
+def _antennas_by_id(antenna_system: AntennaSystem, antenna_ids) -> list:
+    """Antennen in der Reihenfolge von antenna_ids"""
+    by_id = {ant.id: ant for ant in antenna_system.antennas}
+    return [by_id[ant_id] for ant_id in np.asarray(antenna_ids).tolist()]
+
+
+def _antenna_geometry(antennas) -> np.ndarray:
+    """(A, 8) E, N, H, Azimut, Tilt von/bis, Azimut von/bis (NaN = kein Bereich)"""
+    return np.array([
+        [
+            ant.position.e, ant.position.n, ant.position.h,
+            ant.azimuth_deg, ant.tilt_from_deg, ant.tilt_to_deg,
+            np.nan if ant.azimuth_from_deg is None else ant.azimuth_from_deg,
+            np.nan if ant.azimuth_to_deg is None else ant.azimuth_to_deg,
+        ]
+        for ant in antennas
+    ], dtype=float).reshape(-1, 8)
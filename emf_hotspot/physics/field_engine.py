@@ -0,0 +1,342 @@
+"""
+Vektorisierte Batch-Feldberechnung (N Punkte × A Antennen).
+
+Ersetzt die Punkt-für-Punkt-Schleife aus summation.py durch reine
+NumPy-Broadcast-Operationen. Die Ergebnisse entsprechen der skalaren
+Referenz calculate_total_e_field_at_point() (gleiche Formeln, gleiche
+Worst-Case-Tilt-Regeln). Die Tilt-Suche läuft über vorberechnete
+Tilt-Hüllkurven (tilt_envelope.py), d.h. bis auf deren Elevationsraster.
+Antennen mit Azimut-Bereich in der StDB verwenden analog eine Azimut-
+Hüllkurve (azimuth_envelope.py) für die Worst-Case-H-Dämpfung.
+Adaptive Antennen können optional mit Strahlschwenk gerechnet werden
+(2D-Hüllkurve aus adaptive_envelope.py, ersetzt Tilt- und Azimut-Lookup).
+
+Abstand, absoluter Azimut und Elevation hängen nur von der Antennenposition
+ab. Antennen am gleichen Mast (typisch: ein Eintrag pro Band und Sektor)
+werden nach Position gruppiert; die Winkel werden pro Gruppe einmal
+berechnet und die relativen Winkel pro Antenne durch Subtraktion gebildet.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+
+from ..config import AGW_LIMIT_VM, ANTENNA_POSITION_TOLERANCE_M
+from ..models import (
+    Antenna,
+    AntennaContribution,
+    AntennaPattern,
+    AntennaSystem,
+    FacadePoint,
+    FacadePointArray,
+    HotspotResult,
+)
+from ..geometry.angles import calculate_point_angles_batch
+from ..loaders.pattern_loader_ods import get_pattern_for_antenna
+from .propagation import calculate_e_field_with_pattern_batch
+from .tilt_envelope import TiltEnvelope, build_tilt_envelopes
+from .azimuth_envelope import AzimuthEnvelope, build_azimuth_envelopes
+from .adaptive_envelope import AdaptiveEnvelope
+
+
+# Punkte pro Block (begrenzt die (N, Tilts)-Zwischenarrays)
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+@dataclass
+class FieldBatch:
+    """Ergebnis einer Batch-Berechnung für N Punkte und A Antennen"""
+    antenna_ids: np.ndarray  # (A,) Antennen-IDs in Spaltenreihenfolge
+    e_total: np.ndarray  # (N,) Gesamtfeldstärke [V/m] (Leistungsaddition)
+    e_contrib: np.ndarray  # (N, A) Einzelbeiträge [V/m]
+    critical_tilt: np.ndarray  # (N, A) Worst-Case-Tilt [°]
+    critical_azimuth: np.ndarray  # (N, A) Worst-Case-Azimut [°]
+    distance: np.ndarray  # (N, A) 3D-Abstand [m]
+    h_atten: np.ndarray  # (N, A) H-Dämpfung [dB]
+    v_atten: np.ndarray  # (N, A) V-Dämpfung [dB]
+
+    def __len__(self) -> int:
+        return len(self.e_total)
+
+    def take(self, rows) -> "FieldBatch":
+        """Teilmenge der Zeilen (Index-Array oder boolesche Maske)"""
+        return FieldBatch(
+            antenna_ids=self.antenna_ids,
+            e_total=self.e_total[rows],
+            e_contrib=self.e_contrib[rows],
+            critical_tilt=self.critical_tilt[rows],
+            critical_azimuth=self.critical_azimuth[rows],
+            distance=self.distance[rows],
+            h_atten=self.h_atten[rows],
+            v_atten=self.v_atten[rows],
+        )
+
+    @classmethod
+    def concatenate(cls, batches: List["FieldBatch"]) -> "FieldBatch":
+        """Hängt Batches mit gleicher Antennenreihenfolge aneinander (mind. einer)"""
+        return cls(
+            antenna_ids=batches[0].antenna_ids,
+            e_total=np.concatenate([b.e_total for b in batches]),
+            e_contrib=np.concatenate([b.e_contrib for b in batches]),
+            critical_tilt=np.concatenate([b.critical_tilt for b in batches]),
+            critical_azimuth=np.concatenate([b.critical_azimuth for b in batches]),
+            distance=np.concatenate([b.distance for b in batches]),
+            h_atten=np.concatenate([b.h_atten for b in batches]),
+            v_atten=np.concatenate([b.v_atten for b in batches]),
+        )
+
+
+def points_to_array(
+    points: Union[FacadePointArray, Sequence[FacadePoint], np.ndarray],
+) -> np.ndarray:
+    """
+    Wandelt Punkte in ein (N, 3)-Array [E, N, H] um.
+
+    Akzeptiert FacadePointArray, eine Liste von FacadePoint oder bereits ein Array.
+    """
+    if isinstance(points, FacadePointArray):
+        return points.xyz
+
+    if isinstance(points, np.ndarray):
+        return np.asarray(points, dtype=float).reshape(-1, 3)
+
+    return np.array([[p.x, p.y, p.z] for p in points], dtype=float).reshape(-1, 3)
+
+
+def group_antennas_by_position(
+    antennas: Sequence[Antenna],
+    tolerance_m: float = ANTENNA_POSITION_TOLERANCE_M,
+) -> List[List[int]]:
+    """
+    Gruppiert Antennen mit (innerhalb tolerance_m) gleicher Position.
+
+    Die erste Antenne einer Gruppe liefert die Position, von der aus
+    Abstand und Winkel für die ganze Gruppe berechnet werden.
+
+    Returns:
+        Liste von Gruppen, je Liste der Indizes in antennas
+    """
+    groups: List[List[int]] = []
+    reference_positions = []
+
+    for index, antenna in enumerate(antennas):
+        position = antenna.position.to_array()
+        for group, reference in zip(groups, reference_positions):
+            if np.linalg.norm(position - reference) <= tolerance_m:
+                group.append(index)
+                break
+        else:
+            groups.append([index])
+            reference_positions.append(position)
+
+    return groups
+
+
+def _antenna_field_batch(
+    points_xyz: np.ndarray,
+    antenna: Antenna,
+    pattern: AntennaPattern,
+    tilt_envelope: TiltEnvelope,
+    building_attenuation_db,
+    azimuth_envelope: Optional[AzimuthEnvelope] = None,
+    adaptive_envelope: Optional[AdaptiveEnvelope] = None,
+    angles: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Beitrag einer Antenne an allen Punkten eines Blocks.
+
+    Args:
+        angles: (distance, azimuth, elevation) der Punkte von der Antennenposition
+                aus, falls bereits für die Positionsgruppe berechnet (None = berechnen)
+
+    Returns:
+        (e_field, critical_tilt, critical_azimuth, distance, h_atten, v_atten) - je (N,)
+    """
+    if angles is None:
+        angles = calculate_point_angles_batch(antenna.position, points_xyz)
+    distance, azimuth, elevation = angles
+
+    if adaptive_envelope is not None:
+        # Strahlschwenk: 2D-Lookup über (relativer Azimut, Elevation)
+        rel_azimuth = azimuth - antenna.azimuth_deg
+        h_atten, v_atten, azimuth_offset, critical_tilt = adaptive_envelope.lookup(
+            rel_azimuth, elevation
+        )
+        critical_azimuth = (antenna.azimuth_deg + azimuth_offset) % 360.0
+    else:
+        # Worst-Case-Tilt: Tabellen-Lookup statt Schleife über den Tilt-Bereich
+        v_atten, critical_tilt = tilt_envelope.lookup(elevation)
+
+        if azimuth_envelope is not None:
+            # Worst-Case-Azimut: Tabellen-Lookup über den absoluten Punkt-Azimut
+            h_atten, critical_azimuth = azimuth_envelope.lookup(azimuth)
+        else:
+            # Relativer Azimut [-180, 180] (tilt-unabhängig)
+            rel_azimuth = ((azimuth - antenna.azimuth_deg + 180) % 360) - 180
+            critical_azimuth = np.full(len(points_xyz), float(antenna.azimuth_deg))
+
+            if pattern:
+                h_atten = pattern.get_h_attenuation(rel_azimuth)
+            else:
+                h_atten = np.zeros(len(points_xyz))
+
+    e_field = calculate_e_field_with_pattern_batch(
+        erp_watts=antenna.erp_watts,
+        distance_m=distance,
+        h_attenuation_db=h_atten,
+        v_attenuation_db=v_atten,
+        building_attenuation_db=building_attenuation_db,
+    )
+
+    return e_field, critical_tilt, critical_azimuth, distance, h_atten, v_atten
+
+
+def calculate_field_batch(
+    points: Union[Sequence[FacadePoint], np.ndarray],
+    antenna_system: AntennaSystem,
+    patterns: dict[Tuple[str, str], AntennaPattern],
+    building_attenuation_db=0.0,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    tilt_envelopes: Optional[Dict[int, TiltEnvelope]] = None,
+    azimuth_envelopes: Optional[Dict[int, AzimuthEnvelope]] = None,
+    adaptive_envelopes: Optional[Dict[int, AdaptiveEnvelope]] = None,
+) -> FieldBatch:
+    """
+    Berechnet die E-Feldstärke aller Antennen an allen Punkten.
+
+    Args:
+        points: (N, 3)-Array [E, N, H] oder Liste von FacadePoint
+        antenna_system: System mit allen Antennen
+        patterns: Dictionary der Antennendiagramme
+        building_attenuation_db: Gebäudedämpfung [dB], Skalar oder Array (N,)
+        chunk_size: Punkte pro Block (Speicherbegrenzung)
+        tilt_envelopes: Vorberechnete Tilt-Hüllkurven (antenna.id -> TiltEnvelope),
+                        werden bei None aus den Diagrammen erstellt
+        azimuth_envelopes: Vorberechnete Azimut-Hüllkurven (antenna.id -> AzimuthEnvelope,
+                           nur Antennen mit Azimut-Bereich), bei None neu erstellt
+        adaptive_envelopes: Strahlschwenk-Hüllkurven adaptiver Antennen
+                            (antenna.id -> AdaptiveEnvelope), None = kein Strahlschwenk
+
+    Returns:
+        FieldBatch mit (N, A)-Beitragsmatrix und (N,)-Gesamtfeldstärke
+    """
+    points_xyz = points_to_array(points)
+    antennas = antenna_system.antennas
+    n_points = len(points_xyz)
+    n_antennas = len(antennas)
+
+    building_attenuation_db = np.asarray(building_attenuation_db, dtype=float)
+    per_point_attenuation = building_attenuation_db.ndim > 0
+
+    e_contrib = np.zeros((n_points, n_antennas))
+    critical_tilt = np.zeros((n_points, n_antennas))
+    critical_azimuth = np.zeros((n_points, n_antennas))
+    distance = np.zeros((n_points, n_antennas))
+    h_atten = np.zeros((n_points, n_antennas))
+    v_atten = np.zeros((n_points, n_antennas))
+
+    antenna_patterns = [
+        get_pattern_for_antenna(patterns, ant.antenna_type, ant.frequency_band)
+        for ant in antennas
+    ]
+    position_groups = group_antennas_by_position(antennas)
+
+    if tilt_envelopes is None:
+        tilt_envelopes = build_tilt_envelopes(antenna_system, patterns)
+    if azimuth_envelopes is None:
+        azimuth_envelopes = build_azimuth_envelopes(antenna_system, patterns)
+    if adaptive_envelopes is None:
+        adaptive_envelopes = {}
+
+    for start in range(0, n_points, max(1, chunk_size)):
+        stop = min(start + chunk_size, n_points)
+        chunk = points_xyz[start:stop]
+        chunk_attenuation = (
+            building_attenuation_db[start:stop] if per_point_attenuation
+            else building_attenuation_db
+        )
+
+        for group in position_groups:
+            # Abstand und Winkel einmal pro Mastposition
+            angles = calculate_point_angles_batch(antennas[group[0]].position, chunk)
+
+            for col in group:
+                antenna = antennas[col]
+                (
+                    e_contrib[start:stop, col],
+                    critical_tilt[start:stop, col],
+                    critical_azimuth[start:stop, col],
+                    distance[start:stop, col],
+                    h_atten[start:stop, col],
+                    v_atten[start:stop, col],
+                ) = _antenna_field_batch(
+                    chunk, antenna, antenna_patterns[col], tilt_envelopes[antenna.id],
+                    chunk_attenuation, azimuth_envelopes.get(antenna.id),
+                    adaptive_envelopes.get(antenna.id), angles,
+                )
+
+    # Leistungsaddition: E_total = sqrt(Σ E_i²)
+    e_total = np.sqrt(np.sum(e_contrib**2, axis=1))
+
+    return FieldBatch(
+        antenna_ids=np.array([ant.id for ant in antennas]),
+        e_total=e_total,
+        e_contrib=e_contrib,
+        critical_tilt=critical_tilt,
+        critical_azimuth=critical_azimuth,
+        distance=distance,
+        h_atten=h_atten,
+        v_atten=v_atten,
+    )
+
+
+def batch_to_results(
+    points: Sequence[FacadePoint],
+    batch: FieldBatch,
+    indices: Union[Sequence[int], np.ndarray, None] = None,
+) -> List[HotspotResult]:
+    """
+    Wandelt (ausgewählte Zeilen) eines FieldBatch in HotspotResult-Objekte um.
+
+    Args:
+        points: Die berechneten Punkte (gleiche Reihenfolge wie im Batch)
+        batch: Ergebnis von calculate_field_batch()
+        indices: Optional - nur diese Zeilen umwandeln (Default: alle)
+
+    Returns:
+        Liste von HotspotResult
+    """
+    if indices is None:
+        indices = range(len(batch))
+
+    antenna_ids = batch.antenna_ids.tolist()
+    results = []
+
+    for i in indices:
+        point = points[i]
+        e_total = float(batch.e_total[i])
+
+        contributions = [
+            AntennaContribution(
+                antenna_id=antenna_id,
+                e_field_vm=float(batch.e_contrib[i, col]),
+                critical_tilt_deg=float(batch.critical_tilt[i, col]),
+                distance_m=float(batch.distance[i, col]),
+                h_attenuation_db=float(batch.h_atten[i, col]),
+                v_attenuation_db=float(batch.v_atten[i, col]),
+                critical_azimuth_deg=float(batch.critical_azimuth[i, col]),
+            )
+            for col, antenna_id in enumerate(antenna_ids)
+        ]
+
+        results.append(HotspotResult(
+            building_id=point.building_id,
+            x=point.x,
+            y=point.y,
+            z=point.z,
+            e_field_vm=e_total,
+            exceeds_limit=(e_total >= AGW_LIMIT_VM),
+            contributions=contributions,
+        ))
+
+    return results
@@ -108,6 +108,46 @@ def calculate_e_field_with_pattern(
     return np.sqrt(E_FIELD_CONSTANT * erp_watts / gamma_total) / distance_m
 
 
+def calculate_e_field_with_pattern_batch(
+    erp_watts: float,
+    distance_m: np.ndarray,
+    h_attenuation_db: np.ndarray,
+    v_attenuation_db: np.ndarray,
+    building_attenuation_db=0.0,
+) -> np.ndarray:
+    """
+    Vektorisierte Variante von calculate_e_field_with_pattern().
+
+    Gleiche Formel und Sonderfälle (Mindestabstand, ERP <= 0, negative
+    Dämpfungen werden ignoriert), aber für Arrays beliebiger Form.
+
+    Args:
+        erp_watts: Equivalent Radiated Power [W]
+        distance_m: Abstände [m]
+        h_attenuation_db: Horizontaldämpfungen [dB]
+        v_attenuation_db: Vertikaldämpfungen [dB]
+        building_attenuation_db: Gebäudedämpfung [dB] (Skalar oder Array)
+
+    Returns:
+        E-Feldstärken [V/m] (gleiche Form wie distance_m)
+    """
+    distance_m = np.maximum(distance_m, MIN_DISTANCE_M)
+
+    if erp_watts <= 0:
+        return np.zeros_like(distance_m, dtype=float)
+
+    gamma_h = np.where(h_attenuation_db > 0, 10.0 ** (h_attenuation_db / 10.0), 1.0)
+    gamma_v = np.where(v_attenuation_db > 0, 10.0 ** (v_attenuation_db / 10.0), 1.0)
+    building_attenuation_db = np.asarray(building_attenuation_db, dtype=float)
+    gamma_building = np.where(
+        building_attenuation_db > 0, 10.0 ** (building_attenuation_db / 10.0), 1.0
+    )
+
+    gamma_total = gamma_h * gamma_v * gamma_building
+
+    return np.sqrt(E_FIELD_CONSTANT * erp_watts / gamma_total) / distance_m
+
+
 def power_density_from_e_field(e_field_vm: float) -> float:
     """
     Berechnet Leistungsdichte aus E-Feldstärke.
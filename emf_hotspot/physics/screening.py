@@ -0,0 +1,133 @@
+"""
+Gebäude-Screening mit konservativen Obergrenzen vor der Feldberechnung.
+
+Pro Gebäude wird aus der Bounding-Box (AABB aller Wand- und Dachflächen)
+eine Obergrenze der Feldstärke bestimmt (physics.field_bounds: kleinster
+Abstand, minimale H/V-Dämpfung über den Winkelbereich, Tilt-Hüllkurve).
+Gebäude, deren Grenze unter fraction × Schwellwert bleibt, können den
+Schwellwert an keinem Punkt erreichen und werden nur grob abgetastet
+(oder bei reinen Hotspot-Ausgaben ganz übersprungen).
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
+
+from ..config import AGW_LIMIT_VM, SCREENING_FRACTION
+from ..models import AntennaPattern, AntennaSystem, Building
+from ..geometry.adaptive_sampling import (
+    FacadeLattice,
+    filter_lattice_by_distance,
+    lattice_all_facades,
+    lattice_all_roofs,
+)
+from .field_bounds import FieldUpperBound
+from .tilt_envelope import TiltEnvelope
+from .adaptive_envelope import AdaptiveEnvelope
+
+
+@dataclass
+class BuildingScreening:
+    """Ergebnis des Gebäude-Screenings"""
+    threshold_vm: float  # Schwellwert [V/m]
+    fraction: float  # Gebäude unter fraction × threshold_vm gelten als unkritisch
+    upper_bound_vm: Dict[str, float] = field(default_factory=dict)  # building.id -> Obergrenze [V/m]
+
+    @property
+    def limit_vm(self) -> float:
+        return self.fraction * self.threshold_vm
+
+    @property
+    def below_limit(self) -> Set[str]:
+        """IDs der Gebäude, deren Obergrenze unter fraction × threshold_vm liegt"""
+        return {
+            building_id for building_id, bound in self.upper_bound_vm.items()
+            if bound < self.limit_vm
+        }
+
+
+def building_bounding_boxes(buildings: List[Building]) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """
+    AABB aller Wand- und Dachflächen pro Gebäude.
+
+    Returns:
+        (box_min, box_max, building_ids) - nur Gebäude mit Flächen
+    """
+    box_min = []
+    box_max = []
+    building_ids = []
+
+    for building in buildings:
+        surfaces = building.wall_surfaces + building.roof_surfaces
+        if not surfaces:
+            continue
+
+        vertices = np.concatenate([np.asarray(s.vertices, dtype=float).reshape(-1, 3) for s in surfaces])
+        box_min.append(vertices.min(axis=0))
+        box_max.append(vertices.max(axis=0))
+        building_ids.append(building.id)
+
+    if not building_ids:
+        return np.zeros((0, 3)), np.zeros((0, 3)), []
+
+    return np.array(box_min), np.array(box_max), building_ids
+
+
+def screen_buildings(
+    buildings: List[Building],
+    antenna_system: AntennaSystem,
+    patterns: dict[Tuple[str, str], AntennaPattern],
+    threshold_vm: float = AGW_LIMIT_VM,
+    fraction: float = SCREENING_FRACTION,
+    tilt_envelopes: Optional[Dict[int, TiltEnvelope]] = None,
+    adaptive_envelopes: Optional[Dict[int, AdaptiveEnvelope]] = None,
+) -> BuildingScreening:
+    """
+    Berechnet die Feldstärke-Obergrenze (Freiraum) für jedes Gebäude.
+
+    Args:
+        buildings: Liste von Building
+        antenna_system: System mit allen Antennen
+        patterns: Dictionary der Antennendiagramme
+        threshold_vm: Schwellwert [V/m]
+        fraction: Anteil des Schwellwerts, unter dem ein Gebäude unkritisch ist
+        tilt_envelopes: Vorberechnete Tilt-Hüllkurven (None = neu erstellen)
+        adaptive_envelopes: Strahlschwenk-Hüllkurven adaptiver Antennen (None = kein Strahlschwenk)
+
+    Returns:
+        BuildingScreening mit Obergrenze pro Gebäude
+    """
+    screening = BuildingScreening(threshold_vm=threshold_vm, fraction=fraction)
+
+    box_min, box_max, building_ids = building_bounding_boxes(buildings)
+    if not building_ids:
+        return screening
+
+    upper_bound = FieldUpperBound(antenna_system, patterns, tilt_envelopes, adaptive_envelopes)
+    bounds = upper_bound.for_boxes(box_min, box_max)
+    screening.upper_bound_vm = dict(zip(building_ids, bounds.tolist()))
+
+    return screening
+
+
+def count_raster_points(
+    buildings: List[Building],
+    resolution_m: float,
+    center_e: float,
+    center_n: float,
+    radius_m: float,
+) -> int:
+    """
+    Anzahl Fassaden- und Dachpunkte im Radius bei voller Auflösung.
+
+    Dient zur Angabe, wie viele Punkte das Screening eingespart hat.
+    """
+    lattice = FacadeLattice.concatenate([
+        part
+        for building in buildings
+        for part in (
+            lattice_all_facades(building.wall_surfaces, resolution_m, building.id),
+            lattice_all_roofs(building.roof_surfaces, resolution_m, building.id),
+        )
+    ])
+    return len(filter_lattice_by_distance(lattice, center_e, center_n, radius_m))
@@ -0,0 +1,123 @@
+"""
+Zusammenfassen gleichwertiger Antennen zu gemeinsamen Quellen.
+
+Antennen mit gleicher Position, gleicher Ausrichtung (Azimut, Tilt- und
+Azimut-Bereich), gleichem Diagramm (antenna_type, frequency_band) und
+gleichem Betriebsmodus strahlen mit identischer Richtcharakteristik. Bei
+inkohärenter Leistungsaddition gilt für solche Antennen
+
+    E_i² = ERP_i · u,   Σ E_i² = (Σ ERP_i) · u
+
+d.h. sie lassen sich exakt zu einer Quelle mit der ERP-Summe
+zusammenfassen. Die Feldberechnung läuft über die Quellen (kleineres A in
+der N × A-Matrix); expand() teilt die Beiträge danach wieder im
+Verhältnis E_i = E_Quelle · sqrt(ERP_i / ERP_Quelle) auf die
+ursprünglichen Antennen-IDs auf.
+"""
+
+from dataclasses import dataclass, replace
+from typing import Dict, List, Tuple
+import numpy as np
+
+from ..models import Antenna, AntennaSystem
+from .field_engine import FieldBatch
+
+
+@dataclass
+class SourcePlan:
+    """Zuordnung der Antennen eines Systems zu gemeinsamen Quellen"""
+    antenna_system: AntennaSystem  # Ursprüngliches System
+    sources: AntennaSystem  # System mit einer Antenne pro Quelle (ERP = Summe)
+    source_column: np.ndarray  # (A,) Quellen-Spalte pro ursprünglicher Antenne
+    erp_share: np.ndarray  # (A,) ERP_i / ERP_Quelle (0, wenn die Quelle keine ERP hat)
+
+    @property
+    def is_identity(self) -> bool:
+        """True, wenn keine Antennen zusammengefasst wurden"""
+        return len(self.sources.antennas) == len(self.antenna_system.antennas)
+
+    @property
+    def merged_groups(self) -> List[List[int]]:
+        """Antennen-IDs der zusammengefassten Quellen (nur Gruppen mit >1 Antenne)"""
+        groups: Dict[int, List[int]] = {}
+        for antenna, column in zip(self.antenna_system.antennas, self.source_column.tolist()):
+            groups.setdefault(column, []).append(antenna.id)
+        return [ids for ids in groups.values() if len(ids) > 1]
+
+    def expand(self, batch: FieldBatch) -> FieldBatch:
+        """
+        Teilt ein FieldBatch der Quellen auf die ursprünglichen Antennen auf.
+
+        Tilt, Azimut, Abstand und Dämpfungen sind innerhalb einer Quelle
+        identisch und werden übernommen; die Beiträge werden mit
+        sqrt(ERP-Anteil) skaliert.
+        """
+        if self.is_identity:
+            return batch
+
+        columns = self.source_column
+        e_contrib = batch.e_contrib[:, columns] * np.sqrt(self.erp_share)
+
+        return FieldBatch(
+            antenna_ids=np.array([ant.id for ant in self.antenna_system.antennas]),
+            e_total=np.sqrt(np.sum(e_contrib**2, axis=1)),
+            e_contrib=e_contrib,
+            critical_tilt=batch.critical_tilt[:, columns],
+            critical_azimuth=batch.critical_azimuth[:, columns],
+            distance=batch.distance[:, columns],
+            h_atten=batch.h_atten[:, columns],
+            v_atten=batch.v_atten[:, columns],
+        )
+
+
+def _source_key(antenna: Antenna) -> Tuple:
+    """Merkmale, die bei zusammengefassten Antennen übereinstimmen müssen"""
+    return (
+        antenna.position.e, antenna.position.n, antenna.position.h,
+        antenna.azimuth_deg,
+        antenna.tilt_deg, antenna.tilt_from_deg, antenna.tilt_to_deg,
+        antenna.azimuth_from_deg, antenna.azimuth_to_deg,
+        antenna.antenna_type, antenna.frequency_band,
+        antenna.is_adaptive, antenna.sub_arrays,
+    )
+
+
+def plan_sources(antenna_system: AntennaSystem) -> SourcePlan:
+    """
+    Fasst gleichwertige Antennen zu Quellen zusammen.
+
+    Die Quelle übernimmt ID und Geometrie der ersten Antenne ihrer Gruppe
+    (Hüllkurven können daher weiterhin pro antenna.id des ursprünglichen
+    Systems erstellt werden). Die Reihenfolge der Quellen folgt dem
+    ersten Auftreten im System.
+
+    Returns:
+        SourcePlan
+    """
+    antennas = antenna_system.antennas
+    columns: Dict[Tuple, int] = {}
+    members: List[List[int]] = []
+    source_column = np.zeros(len(antennas), dtype=np.intp)
+
+    for index, antenna in enumerate(antennas):
+        key = _source_key(antenna)
+        if key not in columns:
+            columns[key] = len(members)
+            members.append([])
+        members[columns[key]].append(index)
+        source_column[index] = columns[key]
+
+    sources = []
+    erp_share = np.zeros(len(antennas))
+    for group in members:
+        erp_total = float(sum(antennas[i].erp_watts for i in group))
+        sources.append(replace(antennas[group[0]], erp_watts=erp_total))
+        for i in group:
+            erp_share[i] = antennas[i].erp_watts / erp_total if erp_total > 0 else 0.0
+
+    return SourcePlan(
+        antenna_system=antenna_system,
+        sources=replace(antenna_system, antennas=sources),
+        source_column=source_column,
+        erp_share=erp_share,
+    )
@@ -17,6 +17,9 @@ from ..models import (
 from ..geometry.angles import calculate_relative_angles
 from ..loaders.pattern_loader_ods import get_pattern_for_antenna
 from .propagation import calculate_e_field_with_pattern
+from .azimuth_envelope import azimuth_search_values, has_azimuth_range
+from .adaptive_envelope import adaptive_antenna_model
+from .field_engine import calculate_field_batch, batch_to_results
 
 
 def sum_e_fields(e_fields: List[float]) -> float:
@@ -43,15 +46,21 @@ def calculate_total_e_field_at_point(
     antenna_system: AntennaSystem,
     patterns: dict[Tuple[str, str], AntennaPattern],
     building_attenuation_db: float = 0.0,
+    beam_sweep: bool = False,
 ) -> HotspotResult:
     """
     Berechnet die Gesamt-E-Feldstärke an einem Punkt von allen Antennen.
 
+    Skalare Referenz-Implementierung. Für viele Punkte calculate_field_batch()
+    verwenden (gleiche Ergebnisse, vektorisiert).
+
     Args:
         point: Zielpunkt auf der Fassade
         antenna_system: System mit allen Antennen
         patterns: Dictionary der Antennendiagramme
         building_attenuation_db: Optionale Gebäudedämpfung [dB]
+        beam_sweep: Adaptive Antennen mit Strahlschwenk rechnen (Schleife über
+                    alle Schwenkrichtungen, vgl. adaptive_envelope.py)
 
     Returns:
         HotspotResult mit Gesamtfeldstärke und Einzelbeiträgen
@@ -85,14 +94,17 @@ def calculate_total_e_field_at_point(
         else:
             tilt_range = range(tilt_from, tilt_to + 1)
 
+        # Abstand und Winkel hängen nicht vom Tilt ab: einmal berechnen,
+        # die relative Elevation pro Tilt durch Subtraktion bilden
+        distance, rel_azimuth, point_elevation = calculate_relative_angles(
+            antenna_pos=antenna.position,
+            point_pos=point_pos,
+            antenna_azimuth=antenna.azimuth_deg,
+            antenna_tilt=0.0,
+        )
+
         for tilt in tilt_range:
-            # Relative Winkel für diesen Tilt berechnen
-            distance, rel_azimuth, rel_elevation = calculate_relative_angles(
-                antenna_pos=antenna.position,
-                point_pos=point_pos,
-                antenna_azimuth=antenna.azimuth_deg,
-                antenna_tilt=tilt,
-            )
+            rel_elevation = point_elevation - tilt
 
             # V-Dämpfung aus Diagramm holen
             if pattern:
@@ -109,7 +121,27 @@ def calculate_total_e_field_at_point(
                 critical_elevation = rel_elevation
 
         # Verwende kritischen Tilt für H-Dämpfung und E-Feld-Berechnung
-        if pattern:
+        worst_azimuth = antenna.azimuth_deg
+        if pattern and beam_sweep and antenna.is_adaptive:
+            # Strahlschwenk: Loop über alle Schwenkrichtungen (Azimut × Elevation)
+            point_elevation = critical_elevation + critical_tilt
+            h_atten, v_atten, azimuth_offset, critical_tilt = adaptive_antenna_model(
+                antenna, pattern
+            ).worst_case_steering(critical_azimuth, point_elevation)
+            worst_azimuth = (antenna.azimuth_deg + azimuth_offset) % 360.0
+        elif pattern and has_azimuth_range(antenna):
+            # Worst-Case-Azimut-Suche: Loop über den Azimut-Bereich der StDB
+            # (der relative Azimut hängt nicht vom Tilt ab)
+            point_azimuth = critical_azimuth + antenna.azimuth_deg
+            h_atten = float('inf')
+            for azimuth in azimuth_search_values(antenna):
+                rel_azimuth = ((point_azimuth - azimuth + 180) % 360) - 180
+                h_candidate = pattern.get_h_attenuation(rel_azimuth)
+                if h_candidate < h_atten:
+                    h_atten = h_candidate
+                    worst_azimuth = azimuth
+            v_atten = min_v_attenuation
+        elif pattern:
             h_atten = pattern.get_h_attenuation(critical_azimuth)
             v_atten = min_v_attenuation
         else:
@@ -133,6 +165,7 @@ def calculate_total_e_field_at_point(
             distance_m=critical_distance,
             h_attenuation_db=h_atten,
             v_attenuation_db=v_atten,
+            critical_azimuth_deg=float(worst_azimuth),
         )
         contributions.append(contribution)
 
@@ -171,18 +204,15 @@ def calculate_hotspots(
     Returns:
         Liste von HotspotResults mit E >= threshold
     """
-    hotspots = []
-
-    for point in points:
-        result = calculate_total_e_field_at_point(
-            point=point,
-            antenna_system=antenna_system,
-            patterns=patterns,
-            building_attenuation_db=building_attenuation_db,
-        )
+    batch = calculate_field_batch(
+        points,
+        antenna_system,
+        patterns,
+        building_attenuation_db=building_attenuation_db,
+    )
 
-        if result.e_field_vm >= threshold_vm:
-            hotspots.append(result)
+    hotspot_indices = np.flatnonzero(batch.e_total >= threshold_vm)
+    hotspots = batch_to_results(points, batch, hotspot_indices)
 
     return hotspots
 
@@ -198,15 +228,11 @@ def calculate_all_points(
 
     Nützlich für Visualisierung aller E-Werte.
     """
-    results = []
-
-    for point in points:
-        result = calculate_total_e_field_at_point(
-            point=point,
-            antenna_system=antenna_system,
-            patterns=patterns,
-            building_attenuation_db=building_attenuation_db,
-        )
-        results.append(result)
+    batch = calculate_field_batch(
+        points,
+        antenna_system,
+        patterns,
+        building_attenuation_db=building_attenuation_db,
+    )
 
-    return results
+    return batch_to_results(points, batch)
@@ -3,11 +3,19 @@ Parallele Version der E-Feld-Berechnung mit multiprocessing.
 
 Performance-Optimierung: Verwendet alle verfügbaren CPU-Kerne für die
 Berechnung der E-Feldstärken an allen Messpunkten.
+
+Punktkoordinaten, Diagramm-Tabellen (LUTs), Tilt-, Azimut- und Strahlschwenk-Hüllkurven liegen in
+einem multiprocessing.shared_memory-Block, den jeder Worker einmalig im
+Pool-Initializer einbindet. Die Worker bearbeiten Indexbereiche und
+schreiben Gesamtfeldstärke und Einzelbeiträge direkt in gemeinsame
+Ausgabe-Arrays. Pro Aufgabe wird nur (start, stop) übertragen - keine
+Punkt- oder Ergebnisobjekte.
 """
 
-from typing import List, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 import multiprocessing as mp
-from functools import partial
+from multiprocessing import shared_memory
+import numpy as np
 
 from ..models import (
     AntennaPattern,
@@ -15,33 +23,480 @@ from ..models import (
     FacadePoint,
     HotspotResult,
 )
-from .summation import calculate_total_e_field_at_point
+from ..geometry.angles import calculate_point_angles_batch
+from ..loaders.pattern_loader_ods import get_pattern_for_antenna
+from .field_engine import (
+    DEFAULT_CHUNK_SIZE,
+    FieldBatch,
+    _antenna_field_batch,
+    batch_to_results,
+    calculate_field_batch,
+    group_antennas_by_position,
+    points_to_array,
+)
+from .tilt_envelope import TiltEnvelope, build_tilt_envelopes
+from .azimuth_envelope import AzimuthEnvelope, build_azimuth_envelopes
+from .adaptive_envelope import AdaptiveEnvelope
+
+
+# Ausgabe-Spalten (je (N, A)), in dieser Reihenfolge im Ausgabeblock
+_OUTPUT_COLUMNS = ("e_contrib", "critical_tilt", "critical_azimuth", "distance", "h_atten", "v_atten")
+
+# Zustand pro Worker-Prozess (gesetzt durch _init_worker)
+_worker_state: Dict[str, object] = {}
+
+
+class _SharedArrays:
+    """
+    Mehrere NumPy-Arrays in einem gemeinsamen SharedMemory-Block.
+
+    Der Hauptprozess erzeugt den Block mit create(), Worker binden ihn
+    über attach() mit Name und Layout ein (keine Kopie der Daten).
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, layout: List[Tuple[str, int, tuple, str]]):
+        self.shm = shm
+        self.layout = layout
+        self.arrays = {
+            name: np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+            for name, offset, shape, dtype in layout
+        }
+
+    @classmethod
+    def create(cls, specs: Dict[str, Tuple[tuple, str]]) -> "_SharedArrays":
+        """Legt einen Block für {name: (shape, dtype)} an (mit Nullen gefüllt)."""
+        layout = []
+        offset = 0
+        for name, (shape, dtype) in specs.items():
+            layout.append((name, offset, tuple(shape), dtype))
+            nbytes = int(np.prod(shape, dtype=np.int64)) * np.dtype(dtype).itemsize
+            offset += (nbytes + 63) // 64 * 64  # 64-Byte-Ausrichtung
+
+        shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        shared = cls(shm, layout)
+        for array in shared.arrays.values():
+            array.fill(0)
+        return shared
+
+    @classmethod
+    def attach(cls, name: str, layout: List[Tuple[str, int, tuple, str]]) -> "_SharedArrays":
+        """Bindet einen bestehenden Block ein."""
+        return cls(shared_memory.SharedMemory(name=name), layout)
+
+    def release(self, unlink: bool = False) -> None:
+        """Gibt die Views frei und schliesst (optional: löscht) den Block."""
+        self.arrays = {}
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+def _share_inputs(
+    points_xyz: np.ndarray,
+    building_attenuation_db: np.ndarray,
+    antenna_patterns: Sequence[Optional[AntennaPattern]],
+    envelopes: Sequence[TiltEnvelope],
+    azimuth_envelopes: Sequence[Optional[AzimuthEnvelope]],
+    adaptive_envelopes: Sequence[Optional[AdaptiveEnvelope]],
+) -> Tuple[
+    _SharedArrays, List[int], List[int], List[Tuple[float, float]],
+    List[int], List[float], List[int], List[Tuple[float, float, float]],
+]:
+    """
+    Kopiert Punkte, Diagramm-LUTs, Tilt-, Azimut- und Strahlschwenk-Hüllkurven
+    in einen Shared-Block.
+
+    Gleiche Diagramme/Hüllkurven (Objektidentität) werden nur einmal abgelegt.
+
+    Returns:
+        (Block, Diagramm-Index pro Antenne (-1 = kein Diagramm),
+         Hüllkurven-Index pro Antenne, (elevation_min, resolution) pro Hüllkurve,
+         Azimut-Hüllkurven-Index pro Antenne (-1 = fester Azimut),
+         resolution pro Azimut-Hüllkurve,
+         Strahlschwenk-Index pro Antenne (-1 = kein Strahlschwenk),
+         (azimuth_resolution, elevation_min, elevation_resolution) pro Strahlschwenk-Hüllkurve)
+    """
+    unique_patterns: List[AntennaPattern] = []
+    pattern_index = []
+    for pattern in antenna_patterns:
+        if pattern is None:
+            pattern_index.append(-1)
+            continue
+        if pattern.h_lut is None or pattern.v_lut is None:
+            pattern.compile_lut()
+        if not any(pattern is p for p in unique_patterns):
+            unique_patterns.append(pattern)
+        pattern_index.append(next(i for i, p in enumerate(unique_patterns) if p is pattern))
+
+    unique_envelopes: List[TiltEnvelope] = []
+    envelope_index = []
+    for envelope in envelopes:
+        if not any(envelope is e for e in unique_envelopes):
+            unique_envelopes.append(envelope)
+        envelope_index.append(next(i for i, e in enumerate(unique_envelopes) if e is envelope))
+
+    unique_azimuth_envelopes: List[AzimuthEnvelope] = []
+    azimuth_index = []
+    for envelope in azimuth_envelopes:
+        if envelope is None:
+            azimuth_index.append(-1)
+            continue
+        if not any(envelope is e for e in unique_azimuth_envelopes):
+            unique_azimuth_envelopes.append(envelope)
+        azimuth_index.append(next(i for i, e in enumerate(unique_azimuth_envelopes) if e is envelope))
+
+    unique_adaptive_envelopes: List[AdaptiveEnvelope] = []
+    adaptive_index = []
+    for envelope in adaptive_envelopes:
+        if envelope is None:
+            adaptive_index.append(-1)
+            continue
+        if not any(envelope is e for e in unique_adaptive_envelopes):
+            unique_adaptive_envelopes.append(envelope)
+        adaptive_index.append(next(i for i, e in enumerate(unique_adaptive_envelopes) if e is envelope))
+
+    specs = {
+        "points": (points_xyz.shape, "float64"),
+        "building_attenuation": (building_attenuation_db.shape, "float64"),
+    }
+    for i, pattern in enumerate(unique_patterns):
+        specs[f"h_lut_{i}"] = (pattern.h_lut.shape, "float64")
+        specs[f"v_lut_{i}"] = (pattern.v_lut.shape, "float64")
+    for i, envelope in enumerate(unique_envelopes):
+        specs[f"env_v_{i}"] = (envelope.v_attenuation_db.shape, "float64")
+        specs[f"env_tilt_{i}"] = (envelope.critical_tilt_deg.shape, "float64")
+    for i, envelope in enumerate(unique_azimuth_envelopes):
+        specs[f"az_h_{i}"] = (envelope.h_attenuation_db.shape, "float64")
+        specs[f"az_crit_{i}"] = (envelope.critical_azimuth_deg.shape, "float64")
+    for i, envelope in enumerate(unique_adaptive_envelopes):
+        specs[f"aa_h_{i}"] = (envelope.h_attenuation_db.shape, "float64")
+        specs[f"aa_v_{i}"] = (envelope.v_attenuation_db.shape, "float64")
+        specs[f"aa_az_{i}"] = (envelope.critical_azimuth_deg.shape, "float64")
+        specs[f"aa_tilt_{i}"] = (envelope.critical_tilt_deg.shape, "float64")
 
+    shared = _SharedArrays.create(specs)
+    arrays = shared.arrays
+    arrays["points"][...] = points_xyz
+    arrays["building_attenuation"][...] = building_attenuation_db
+    for i, pattern in enumerate(unique_patterns):
+        arrays[f"h_lut_{i}"][...] = pattern.h_lut
+        arrays[f"v_lut_{i}"][...] = pattern.v_lut
+    for i, envelope in enumerate(unique_envelopes):
+        arrays[f"env_v_{i}"][...] = envelope.v_attenuation_db
+        arrays[f"env_tilt_{i}"][...] = envelope.critical_tilt_deg
+    for i, envelope in enumerate(unique_azimuth_envelopes):
+        arrays[f"az_h_{i}"][...] = envelope.h_attenuation_db
+        arrays[f"az_crit_{i}"][...] = envelope.critical_azimuth_deg
+    for i, envelope in enumerate(unique_adaptive_envelopes):
+        arrays[f"aa_h_{i}"][...] = envelope.h_attenuation_db
+        arrays[f"aa_v_{i}"][...] = envelope.v_attenuation_db
+        arrays[f"aa_az_{i}"][...] = envelope.critical_azimuth_deg
+        arrays[f"aa_tilt_{i}"][...] = envelope.critical_tilt_deg
 
-def _calculate_point_worker(
-    point: FacadePoint,
+    envelope_grid = [(e.elevation_min_deg, e.resolution_deg) for e in unique_envelopes]
+    azimuth_grid = [e.resolution_deg for e in unique_azimuth_envelopes]
+    adaptive_grid = [
+        (e.azimuth_resolution_deg, e.elevation_min_deg, e.elevation_resolution_deg)
+        for e in unique_adaptive_envelopes
+    ]
+    return (
+        shared, pattern_index, envelope_index, envelope_grid,
+        azimuth_index, azimuth_grid, adaptive_index, adaptive_grid,
+    )
+
+
+def _share_system_inputs(
+    points_xyz: np.ndarray,
+    building_attenuation_db,
     antenna_system: AntennaSystem,
     patterns: dict[Tuple[str, str], AntennaPattern],
-    building_attenuation_db: float,
-) -> HotspotResult:
+    tilt_envelopes: Optional[Dict[int, TiltEnvelope]] = None,
+    azimuth_envelopes: Optional[Dict[int, AzimuthEnvelope]] = None,
+    adaptive_envelopes: Optional[Dict[int, AdaptiveEnvelope]] = None,
+) -> Tuple[_SharedArrays, tuple]:
+    """
+    Legt den Eingabeblock für ein Antennensystem an (fehlende Hüllkurven
+    werden hier erstellt).
+
+    Returns:
+        (Block, Argumente für _init_worker() ab antennas bis adaptive_grid)
+    """
+    antennas = antenna_system.antennas
+
+    if tilt_envelopes is None:
+        tilt_envelopes = build_tilt_envelopes(antenna_system, patterns)
+    if azimuth_envelopes is None:
+        azimuth_envelopes = build_azimuth_envelopes(antenna_system, patterns)
+    if adaptive_envelopes is None:
+        adaptive_envelopes = {}
+
+    antenna_patterns = [
+        get_pattern_for_antenna(patterns, ant.antenna_type, ant.frequency_band)
+        for ant in antennas
+    ]
+
+    inputs, *indices = _share_inputs(
+        points_xyz,
+        np.asarray(building_attenuation_db, dtype=float),
+        antenna_patterns,
+        [tilt_envelopes[ant.id] for ant in antennas],
+        [azimuth_envelopes.get(ant.id) for ant in antennas],
+        [adaptive_envelopes.get(ant.id) for ant in antennas],
+    )
+    return inputs, (antennas, *indices)
+
+
+def _init_worker(
+    input_name: str,
+    input_layout: list,
+    output_name: str,
+    output_layout: list,
+    antennas: list,
+    pattern_index: List[int],
+    envelope_index: List[int],
+    envelope_grid: List[Tuple[float, float]],
+    azimuth_index: List[int],
+    azimuth_grid: List[float],
+    adaptive_index: List[int],
+    adaptive_grid: List[Tuple[float, float, float]],
+    chunk_size: int,
+) -> None:
     """
-    Worker-Funktion für multiprocessing.
+    Pool-Initializer: bindet die Shared-Blöcke einmalig pro Worker ein.
+
+    Diagramme und Hüllkurven werden als leichte Objekte rekonstruiert,
+    deren Tabellen direkt auf den Shared-Speicher zeigen.
+    """
+    inputs = _SharedArrays.attach(input_name, input_layout)
+    outputs = _SharedArrays.attach(output_name, output_layout)
+
+    for array in inputs.arrays.values():
+        array.flags.writeable = False
+
+    empty = np.empty(0)
+    patterns = {}
+    envelopes = {}
+    azimuth_envelopes = {}
+    adaptive_envelopes = {}
+    antenna_patterns = []
+    antenna_envelopes = []
+    antenna_azimuth_envelopes = []
+    antenna_adaptive_envelopes = []
+
+    for antenna, p_idx, e_idx, a_idx, s_idx in zip(
+        antennas, pattern_index, envelope_index, azimuth_index, adaptive_index
+    ):
+        if p_idx >= 0 and p_idx not in patterns:
+            patterns[p_idx] = AntennaPattern(
+                antenna_type=antenna.antenna_type,
+                frequency_band=antenna.frequency_band,
+                h_angles=empty,
+                h_gains=empty,
+                v_angles=empty,
+                v_gains=empty,
+                h_lut=inputs.arrays[f"h_lut_{p_idx}"],
+                v_lut=inputs.arrays[f"v_lut_{p_idx}"],
+            )
+        if e_idx not in envelopes:
+            elevation_min, resolution = envelope_grid[e_idx]
+            envelopes[e_idx] = TiltEnvelope(
+                elevation_min_deg=elevation_min,
+                resolution_deg=resolution,
+                v_attenuation_db=inputs.arrays[f"env_v_{e_idx}"],
+                critical_tilt_deg=inputs.arrays[f"env_tilt_{e_idx}"],
+            )
+        if a_idx >= 0 and a_idx not in azimuth_envelopes:
+            azimuth_envelopes[a_idx] = AzimuthEnvelope(
+                resolution_deg=azimuth_grid[a_idx],
+                h_attenuation_db=inputs.arrays[f"az_h_{a_idx}"],
+                critical_azimuth_deg=inputs.arrays[f"az_crit_{a_idx}"],
+            )
+        if s_idx >= 0 and s_idx not in adaptive_envelopes:
+            azimuth_resolution, elevation_min, elevation_resolution = adaptive_grid[s_idx]
+            adaptive_envelopes[s_idx] = AdaptiveEnvelope(
+                azimuth_resolution_deg=azimuth_resolution,
+                elevation_min_deg=elevation_min,
+                elevation_resolution_deg=elevation_resolution,
+                h_attenuation_db=inputs.arrays[f"aa_h_{s_idx}"],
+                v_attenuation_db=inputs.arrays[f"aa_v_{s_idx}"],
+                critical_azimuth_deg=inputs.arrays[f"aa_az_{s_idx}"],
+                critical_tilt_deg=inputs.arrays[f"aa_tilt_{s_idx}"],
+            )
+        antenna_patterns.append(patterns.get(p_idx))
+        antenna_envelopes.append(envelopes[e_idx])
+        antenna_azimuth_envelopes.append(azimuth_envelopes.get(a_idx))
+        antenna_adaptive_envelopes.append(adaptive_envelopes.get(s_idx))
+
+    _worker_state.update(
+        inputs=inputs,
+        outputs=outputs,
+        antennas=antennas,
+        patterns=antenna_patterns,
+        envelopes=antenna_envelopes,
+        azimuth_envelopes=antenna_azimuth_envelopes,
+        adaptive_envelopes=antenna_adaptive_envelopes,
+        position_groups=group_antennas_by_position(antennas),
+        chunk_size=chunk_size,
+    )
+
+
+def _calculate_range_worker(index_range: Tuple[int, int]) -> int:
+    """
+    Worker-Funktion: berechnet die Punkte [start, stop) und schreibt die
+    Ergebnisse in die gemeinsamen Ausgabe-Arrays.
+
+    Returns:
+        Anzahl berechneter Punkte
+    """
+    start, stop = index_range
+    inputs = _worker_state["inputs"].arrays
+    outputs = _worker_state["outputs"].arrays
+    chunk_size = _worker_state["chunk_size"]
+
+    attenuation = inputs["building_attenuation"]
+    per_point_attenuation = attenuation.ndim > 0
+
+    for chunk_start in range(start, stop, chunk_size):
+        chunk_stop = min(chunk_start + chunk_size, stop)
+        chunk = inputs["points"][chunk_start:chunk_stop]
+        chunk_attenuation = (
+            attenuation[chunk_start:chunk_stop] if per_point_attenuation
+            else float(attenuation)
+        )
+
+        _fill_chunk_columns(chunk, chunk_attenuation, {
+            name: outputs[name][chunk_start:chunk_stop] for name in _OUTPUT_COLUMNS
+        })
+
+        # Leistungsaddition: E_total = sqrt(Σ E_i²)
+        e_contrib = outputs["e_contrib"][chunk_start:chunk_stop]
+        outputs["e_total"][chunk_start:chunk_stop] = np.sqrt(np.sum(e_contrib**2, axis=1))
+
+    return stop - start
+
+
+def _fill_chunk_columns(
+    chunk: np.ndarray,
+    chunk_attenuation,
+    columns: Dict[str, np.ndarray],
+) -> None:
+    """
+    Berechnet die Beiträge aller Antennen für einen Punktblock im Worker.
 
     Args:
-        point: Einzelner Fassadenpunkt
+        chunk: (M, 3) Punktkoordinaten
+        chunk_attenuation: Gebäudedämpfung [dB], Skalar oder (M,)
+        columns: {Spaltenname: (M, A)-Ziel} für eine Teilmenge von _OUTPUT_COLUMNS
+    """
+    antennas = _worker_state["antennas"]
+
+    for group in _worker_state["position_groups"]:
+        # Abstand und Winkel einmal pro Mastposition
+        angles = calculate_point_angles_batch(antennas[group[0]].position, chunk)
+
+        for col in group:
+            values = _antenna_field_batch(
+                chunk, antennas[col], _worker_state["patterns"][col],
+                _worker_state["envelopes"][col], chunk_attenuation,
+                _worker_state["azimuth_envelopes"][col],
+                _worker_state["adaptive_envelopes"][col], angles,
+            )
+            for name, value in zip(_OUTPUT_COLUMNS, values):
+                if name in columns:
+                    columns[name][:, col] = value
+
+
+def calculate_field_batch_parallel(
+    points: Union[Sequence[FacadePoint], np.ndarray],
+    antenna_system: AntennaSystem,
+    patterns: dict[Tuple[str, str], AntennaPattern],
+    building_attenuation_db=0.0,
+    n_workers: int = None,
+    range_size: int = None,
+    tilt_envelopes: Optional[Dict[int, TiltEnvelope]] = None,
+    azimuth_envelopes: Optional[Dict[int, AzimuthEnvelope]] = None,
+    adaptive_envelopes: Optional[Dict[int, AdaptiveEnvelope]] = None,
+) -> FieldBatch:
+    """
+    Parallele Variante von calculate_field_batch() mit Shared Memory.
+
+    Args:
+        points: (N, 3)-Array [E, N, H] oder Liste von FacadePoint
         antenna_system: System mit allen Antennen
         patterns: Dictionary der Antennendiagramme
-        building_attenuation_db: Gebäudedämpfung [dB]
+        building_attenuation_db: Gebäudedämpfung [dB], Skalar oder Array (N,)
+        n_workers: Anzahl paralleler Worker (None = CPU-Kerne)
+        range_size: Punkte pro Aufgabe (None = automatisch)
+        tilt_envelopes: Vorberechnete Tilt-Hüllkurven (None = neu erstellen)
+        azimuth_envelopes: Vorberechnete Azimut-Hüllkurven (None = neu erstellen)
+        adaptive_envelopes: Strahlschwenk-Hüllkurven adaptiver Antennen (None = kein Strahlschwenk)
 
     Returns:
-        HotspotResult für diesen Punkt
+        FieldBatch (identisch zur seriellen Berechnung)
     """
-    return calculate_total_e_field_at_point(
-        point=point,
-        antenna_system=antenna_system,
-        patterns=patterns,
-        building_attenuation_db=building_attenuation_db,
+    points_xyz = np.ascontiguousarray(points_to_array(points))
+    antennas = antenna_system.antennas
+    n_points = len(points_xyz)
+    n_antennas = len(antennas)
+
+    if n_workers is None:
+        n_workers = mp.cpu_count()
+
+    # Für sehr wenige Punkte ist seriell schneller (Overhead vermeiden)
+    if n_workers <= 1 or n_points < n_workers * 10:
+        return calculate_field_batch(
+            points_xyz, antenna_system, patterns,
+            building_attenuation_db=building_attenuation_db,
+            tilt_envelopes=tilt_envelopes,
+            azimuth_envelopes=azimuth_envelopes,
+            adaptive_envelopes=adaptive_envelopes,
+        )
+
+    # Automatische Aufgabengrösse: ~4 Aufgaben pro Worker (Lastausgleich)
+    if range_size is None:
+        range_size = -(-n_points // (n_workers * 4))
+    range_size = max(1, range_size)
+
+    inputs, antenna_args = _share_system_inputs(
+        points_xyz, building_attenuation_db, antenna_system, patterns,
+        tilt_envelopes, azimuth_envelopes, adaptive_envelopes,
     )
+    output_specs = {"e_total": ((n_points,), "float64")}
+    output_specs.update({name: ((n_points, n_antennas), "float64") for name in _OUTPUT_COLUMNS})
+
+    try:
+        outputs = _SharedArrays.create(output_specs)
+        try:
+            ranges = [
+                (start, min(start + range_size, n_points))
+                for start in range(0, n_points, range_size)
+            ]
+
+            with mp.Pool(
+                processes=n_workers,
+                initializer=_init_worker,
+                initargs=(
+                    inputs.shm.name, inputs.layout,
+                    outputs.shm.name, outputs.layout,
+                    *antenna_args,
+                    min(range_size, DEFAULT_CHUNK_SIZE),
+                ),
+            ) as pool:
+                computed = sum(pool.imap_unordered(_calculate_range_worker, ranges))
+
+            if computed != n_points:
+                raise RuntimeError(
+                    f"Parallele Berechnung unvollständig: {computed}/{n_points} Punkte"
+                )
+
+            # Ergebnisse aus dem Shared-Block kopieren (Block wird freigegeben)
+            columns = {name: array.copy() for name, array in outputs.arrays.items()}
+        finally:
+            outputs.release(unlink=True)
+    finally:
+        inputs.release(unlink=True)
+
+    return FieldBatch(antenna_ids=np.array([ant.id for ant in antennas]), **columns)
 
 
 def calculate_all_points_parallel(
@@ -54,8 +509,10 @@ def calculate_all_points_parallel(
     """
     Berechnet E-Feldstärke für alle Punkte parallel.
 
-    Verwendet multiprocessing.Pool um die Berechnung auf mehrere CPU-Kerne zu verteilen.
-    Jeder Punkt wird unabhängig berechnet, daher ideal für Parallelisierung.
+    Verwendet multiprocessing.Pool mit Shared Memory (siehe
+    calculate_field_batch_parallel). Jeder Worker bearbeitet
+    zusammenhängende Indexbereiche. Für sehr wenige Punkte wird
+    seriell gerechnet.
 
     Args:
         points: Liste aller Fassadenpunkte
@@ -70,31 +527,13 @@ def calculate_all_points_parallel(
     if not points:
         return []
 
-    # Bestimme Anzahl Worker (Standard: Anzahl CPU-Kerne)
-    if n_workers is None:
-        n_workers = mp.cpu_count()
-
-    # Für sehr wenige Punkte ist seriell schneller (Overhead vermeiden)
-    if len(points) < n_workers * 10:
-        # Fallback auf serielle Berechnung
-        from .summation import calculate_all_points
-        return calculate_all_points(
-            points, antenna_system, patterns, building_attenuation_db
-        )
-
-    # Worker-Funktion mit festen Parametern vorbereiten
-    worker = partial(
-        _calculate_point_worker,
-        antenna_system=antenna_system,
-        patterns=patterns,
+    batch = calculate_field_batch_parallel(
+        points, antenna_system, patterns,
         building_attenuation_db=building_attenuation_db,
+        n_workers=n_workers,
     )
 
-    # Parallele Berechnung mit Pool
-    with mp.Pool(processes=n_workers) as pool:
-        results = pool.map(worker, points)
-
-    return results
+    return batch_to_results(points, batch)
 
 
 def calculate_all_points_parallel_chunksize(
@@ -106,10 +545,7 @@ def calculate_all_points_parallel_chunksize(
     chunksize: int = None,
 ) -> List[HotspotResult]:
     """
-    Parallele Berechnung mit optimiertem Chunksize.
-
-    Für viele Punkte ist es effizienter, sie in Chunks zu verarbeiten,
-    um Overhead zu reduzieren.
+    Parallele Berechnung mit vorgegebener Aufgabengrösse.
 
     Args:
         points: Liste aller Fassadenpunkte
@@ -117,7 +553,7 @@ def calculate_all_points_parallel_chunksize(
         patterns: Dictionary der Antennendiagramme
         building_attenuation_db: Gebäudedämpfung [dB]
         n_workers: Anzahl paralleler Worker (None = CPU-Kerne)
-        chunksize: Punkte pro Chunk (None = automatisch)
+        chunksize: Punkte pro Aufgabe (None = automatisch)
 
     Returns:
         Liste von HotspotResults
@@ -125,23 +561,11 @@ def calculate_all_points_parallel_chunksize(
     if not points:
         return []
 
-    if n_workers is None:
-        n_workers = mp.cpu_count()
-
-    # Automatischer Chunksize: Punkte gleichmäßig auf Worker verteilen
-    if chunksize is None:
-        chunksize = max(1, len(points) // (n_workers * 4))
-
-    # Worker-Funktion mit festen Parametern
-    worker = partial(
-        _calculate_point_worker,
-        antenna_system=antenna_system,
-        patterns=patterns,
+    batch = calculate_field_batch_parallel(
+        points, antenna_system, patterns,
         building_attenuation_db=building_attenuation_db,
+        n_workers=n_workers,
+        range_size=chunksize,
     )
 
-    # Parallele Berechnung mit optimiertem Chunksize
-    with mp.Pool(processes=n_workers) as pool:
-        results = pool.map(worker, points, chunksize=chunksize)
-
-    return results
+    return batch_to_results(points, batch)
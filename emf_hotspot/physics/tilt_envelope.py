@@ -0,0 +1,155 @@
+"""
+Vorberechnete Tilt-Hüllkurven für die Worst-Case-Tilt-Suche.
+
+Der Tilt verschiebt nur die relative Elevation (rel = elevation - tilt).
+Die Worst-Case-V-Dämpfung über den Tilt-Bereich ist daher ein
+Sliding-Window-Minimum über das V-Diagramm und hängt nur von der
+absoluten Elevation des Punktes ab. Pro Antenne/Diagramm-Paar wird
+diese Funktion einmal auf einem Elevationsraster tabelliert; die Suche
+kostet danach O(1) pro Punkt statt O(Tilt-Bereich).
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+import numpy as np
+
+from ..config import TILT_ENVELOPE_RESOLUTION_DEG, TILT_STEP_DEG
+from ..models import Antenna, AntennaPattern, AntennaSystem
+from ..loaders.pattern_loader_ods import get_pattern_for_antenna
+
+
+@dataclass
+class TiltEnvelope:
+    """Minimale V-Dämpfung über den Tilt-Bereich als Funktion der Elevation"""
+    elevation_min_deg: float  # Elevation des ersten Tabelleneintrags
+    resolution_deg: float  # Rasterweite der Tabelle
+    v_attenuation_db: np.ndarray  # (M,) Worst-Case-V-Dämpfung [dB]
+    critical_tilt_deg: np.ndarray  # (M,) Tilt, der das Minimum liefert [°]
+
+    def lookup(self, elevation_deg) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Worst-Case-V-Dämpfung und kritischer Tilt für beliebige Elevationen.
+
+        Die Dämpfung wird linear zwischen den Rasterpunkten interpoliert,
+        der Tilt vom nächstgelegenen Rasterpunkt übernommen.
+
+        Args:
+            elevation_deg: Absolute Elevation(en) [-90, 90]°
+
+        Returns:
+            (v_attenuation_db, critical_tilt_deg) - gleiche Form wie Eingabe
+        """
+        last = len(self.v_attenuation_db) - 1
+        position = (np.asarray(elevation_deg, dtype=float) - self.elevation_min_deg) / self.resolution_deg
+        position = np.clip(position, 0.0, last)
+
+        lower = np.minimum(position.astype(np.intp), last - 1)
+        fraction = position - lower
+        upper = lower + 1
+
+        v_atten = (
+            self.v_attenuation_db[lower] * (1.0 - fraction)
+            + self.v_attenuation_db[upper] * fraction
+        )
+        nearest = np.where(fraction < 0.5, lower, upper)
+
+        return v_atten, self.critical_tilt_deg[nearest]
+
+
+def tilt_search_values(antenna: Antenna, tilt_step_deg: float = TILT_STEP_DEG) -> np.ndarray:
+    """
+    Tilt-Werte der Worst-Case-Suche.
+
+    Schrittweite 1° (Standard): ganzzahliger Bereich [int(tilt_from), int(tilt_to)]
+    wie in calculate_total_e_field_at_point(). Kleinere Schrittweiten tasten
+    [tilt_from, tilt_to] inkl. Endpunkten ab. Ohne Bereich nur tilt_deg.
+    """
+    if tilt_step_deg >= 1.0:
+        tilt_from = int(antenna.tilt_from_deg)
+        tilt_to = int(antenna.tilt_to_deg)
+
+        if tilt_from == tilt_to:
+            return np.array([antenna.tilt_deg], dtype=float)
+
+        return np.arange(tilt_from, tilt_to + 1, dtype=float)
+
+    if antenna.tilt_from_deg == antenna.tilt_to_deg:
+        return np.array([antenna.tilt_deg], dtype=float)
+
+    n_steps = int(round((antenna.tilt_to_deg - antenna.tilt_from_deg) / tilt_step_deg))
+    return np.linspace(antenna.tilt_from_deg, antenna.tilt_to_deg, max(n_steps, 1) + 1)
+
+
+def build_tilt_envelope(
+    antenna: Antenna,
+    pattern: Optional[AntennaPattern],
+    resolution_deg: float = TILT_ENVELOPE_RESOLUTION_DEG,
+    tilt_step_deg: float = TILT_STEP_DEG,
+) -> TiltEnvelope:
+    """
+    Tabelliert die Worst-Case-V-Dämpfung einer Antenne über [-90, 90]°.
+
+    Args:
+        antenna: Antenne (liefert den Tilt-Bereich)
+        pattern: Antennendiagramm (None = keine Dämpfung)
+        resolution_deg: Elevationsraster der Tabelle
+        tilt_step_deg: Schrittweite im Tilt-Bereich
+
+    Returns:
+        TiltEnvelope
+    """
+    tilts = tilt_search_values(antenna, tilt_step_deg)
+    n_rows = int(round(180.0 / resolution_deg)) + 1
+    elevations = -90.0 + resolution_deg * np.arange(n_rows)
+
+    if pattern is None:
+        return TiltEnvelope(
+            elevation_min_deg=-90.0,
+            resolution_deg=resolution_deg,
+            v_attenuation_db=np.zeros(n_rows),
+            critical_tilt_deg=np.full(n_rows, tilts[0]),
+        )
+
+    # (M, T): V-Dämpfung jeder Elevation für jeden Tilt, Minimum über T
+    v_by_tilt = pattern.get_v_attenuation(elevations[:, None] - tilts[None, :])
+    best = np.argmin(v_by_tilt, axis=1)  # Bei Gleichstand der erste Tilt
+
+    return TiltEnvelope(
+        elevation_min_deg=-90.0,
+        resolution_deg=resolution_deg,
+        v_attenuation_db=v_by_tilt[np.arange(n_rows), best],
+        critical_tilt_deg=tilts[best],
+    )
+
+
+def build_tilt_envelopes(
+    antenna_system: AntennaSystem,
+    patterns: dict[Tuple[str, str], AntennaPattern],
+    resolution_deg: float = TILT_ENVELOPE_RESOLUTION_DEG,
+    tilt_step_deg: float = TILT_STEP_DEG,
+) -> Dict[int, TiltEnvelope]:
+    """
+    Erstellt die Tilt-Hüllkurven für alle Antennen eines Systems.
+
+    Antennen mit gleichem Diagramm und gleichem Tilt-Bereich teilen sich
+    eine Tabelle.
+
+    Returns:
+        Dictionary: antenna.id -> TiltEnvelope
+    """
+    envelopes = {}
+    shared = {}
+
+    for antenna in antenna_system.antennas:
+        pattern = get_pattern_for_antenna(
+            patterns, antenna.antenna_type, antenna.frequency_band
+        )
+        tilts = tilt_search_values(antenna, tilt_step_deg)
+        key = (id(pattern), tuple(tilts))
+
+        if key not in shared:
+            shared[key] = build_tilt_envelope(antenna, pattern, resolution_deg, tilt_step_deg)
+
+        envelopes[antenna.id] = shared[key]
+
+    return envelopes
@@ -0,0 +1,242 @@
+"""
+Volumetrisches 3D-Feldgitter um einen Standort.
+
+Statt nur Fassadenpunkte wird die E-Feldstärke auf einem regelmässigen
+E/N/H-Gitter berechnet (siehe docu/PERFORMANCE_ROADMAP.md, Phase 2.1).
+Das Gitter wird blockweise über die Batch-Engine ausgewertet; pro Block
+werden nur dessen Koordinaten erzeugt und nur die Gesamtfeldstärke
+behalten, so dass auch Millionen von Voxeln keine (N, A)-Matrizen über
+das ganze Gitter benötigen. Parallel rechnet ein einziger Pool pro Volumen
+die Blöcke; Diagramme und Hüllkurven liegen einmal im Shared Memory, die
+Worker erzeugen die Koordinaten ihrer Blöcke selbst und schreiben die
+Gesamtfeldstärke direkt in ein gemeinsames Ergebnis-Array.
+
+Das Ergebnis lässt sich direkt als pyvista ImageData exportieren
+(Iso-Fläche 5 V/m in ParaView: Contour-Filter auf E_field_Vm).
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+import multiprocessing as mp
+import numpy as np
+
+from ..config import VOLUME_BLOCK_SIZE, VOLUME_HEIGHT_M, VOLUME_RESOLUTION_M
+from ..models import AntennaPattern, AntennaSystem
+from .field_engine import DEFAULT_CHUNK_SIZE, calculate_field_batch
+from .tilt_envelope import TiltEnvelope, build_tilt_envelopes
+from .adaptive_envelope import AdaptiveEnvelope
+
+
+@dataclass
+class VolumeGrid:
+    """E-Feldstärke auf einem regelmässigen E/N/H-Gitter"""
+    origin: Tuple[float, float, float]  # Koordinate des ersten Voxels (E, N, H) [m]
+    spacing_m: float  # Gitterabstand in allen Richtungen [m]
+    dimensions: Tuple[int, int, int]  # Anzahl Punkte (nx, ny, nz)
+    e_field: np.ndarray  # (nx, ny, nz) Gesamtfeldstärke [V/m], float32
+
+    def __len__(self) -> int:
+        return int(np.prod(self.dimensions))
+
+    def points_for_range(self, start: int, stop: int) -> np.ndarray:
+        """
+        Koordinaten der Gitterpunkte [start, stop) als (M, 3)-Array.
+
+        Reihenfolge wie VTK-ImageData: E läuft am schnellsten, dann N, dann H.
+        """
+        nx, ny, _ = self.dimensions
+        flat = np.arange(start, stop)
+        i = flat % nx
+        j = (flat // nx) % ny
+        k = flat // (nx * ny)
+        return np.column_stack([
+            self.origin[0] + i * self.spacing_m,
+            self.origin[1] + j * self.spacing_m,
+            self.origin[2] + k * self.spacing_m,
+        ])
+
+
+def create_volume_grid(
+    antenna_system: AntennaSystem,
+    radius_m: float,
+    resolution_m: float = VOLUME_RESOLUTION_M,
+    height_m: float = VOLUME_HEIGHT_M,
+) -> VolumeGrid:
+    """
+    Legt ein leeres Gitter um die Basisposition an.
+
+    Horizontal ±radius_m um den Mast, vertikal von der Basishöhe
+    (Terrain am Mast) bis height_m darüber.
+    """
+    base = antenna_system.base_position
+    n_horizontal = int(np.floor(2 * radius_m / resolution_m)) + 1
+    n_vertical = int(np.floor(height_m / resolution_m)) + 1
+    dimensions = (n_horizontal, n_horizontal, n_vertical)
+
+    return VolumeGrid(
+        origin=(base.e - radius_m, base.n - radius_m, base.h),
+        spacing_m=resolution_m,
+        dimensions=dimensions,
+        e_field=np.zeros(dimensions, dtype=np.float32, order="F"),
+    )
+
+
+def calculate_volume_grid(
+    antenna_system: AntennaSystem,
+    patterns: dict[Tuple[str, str], AntennaPattern],
+    radius_m: float,
+    resolution_m: float = VOLUME_RESOLUTION_M,
+    height_m: float = VOLUME_HEIGHT_M,
+    block_size: int = VOLUME_BLOCK_SIZE,
+    parallel: bool = False,
+    n_workers: Optional[int] = None,
+    tilt_envelopes: Optional[Dict[int, TiltEnvelope]] = None,
+    adaptive_envelopes: Optional[Dict[int, AdaptiveEnvelope]] = None,
+) -> VolumeGrid:
+    """
+    Berechnet die E-Feldstärke (Freiraum, ohne Gebäudedämpfung) im Volumen.
+
+    Args:
+        antenna_system: System mit allen Antennen
+        patterns: Dictionary der Antennendiagramme
+        radius_m: Horizontale Halbbreite des Gitters um den Mast [m]
+        resolution_m: Gitterabstand [m]
+        height_m: Vertikale Ausdehnung ab Basishöhe [m]
+        block_size: Gitterpunkte pro Block (Speicherbegrenzung)
+        parallel: Blöcke auf einen Prozess-Pool verteilen
+        n_workers: Anzahl Worker (None = CPU-Kerne)
+        tilt_envelopes: Vorberechnete Tilt-Hüllkurven (None = neu erstellen)
+        adaptive_envelopes: Strahlschwenk-Hüllkurven adaptiver Antennen (None = kein Strahlschwenk)
+
+    Returns:
+        VolumeGrid mit (nx, ny, nz)-Feldstärke
+    """
+    grid = create_volume_grid(antenna_system, radius_m, resolution_m, height_m)
+    n_points = len(grid)
+
+    if tilt_envelopes is None:
+        tilt_envelopes = build_tilt_envelopes(antenna_system, patterns)
+
+    if parallel:
+        if n_workers is None:
+            n_workers = mp.cpu_count()
+
+        # Für sehr wenige Punkte ist seriell schneller (Overhead vermeiden)
+        if n_workers > 1 and n_points >= n_workers * 10:
+            _calculate_volume_parallel(
+                grid, antenna_system, patterns, block_size, n_workers,
+                tilt_envelopes, adaptive_envelopes,
+            )
+            return grid
+
+    # Flache Sicht in VTK-Reihenfolge (E am schnellsten) auf das Ergebnis
+    e_flat = grid.e_field.reshape(-1, order="F")
+
+    for start in range(0, n_points, max(1, block_size)):
+        stop = min(start + block_size, n_points)
+        block_xyz = grid.points_for_range(start, stop)
+
+        batch = calculate_field_batch(
+            block_xyz, antenna_system, patterns, tilt_envelopes=tilt_envelopes,
+            adaptive_envelopes=adaptive_envelopes,
+        )
+
+        e_flat[start:stop] = batch.e_total
+
+    return grid
+
+
+def _calculate_volume_parallel(
+    grid: VolumeGrid,
+    antenna_system: AntennaSystem,
+    patterns: dict[Tuple[str, str], AntennaPattern],
+    block_size: int,
+    n_workers: int,
+    tilt_envelopes: Dict[int, TiltEnvelope],
+    adaptive_envelopes: Optional[Dict[int, AdaptiveEnvelope]],
+) -> None:
+    """
+    Füllt grid.e_field mit einem Pool und einem Eingabeblock für das ganze Volumen.
+
+    Aufgaben sind Indexbereiche [start, stop) von höchstens block_size
+    Gitterpunkten (ca. 4 Aufgaben pro Worker für den Lastausgleich).
+    """
+    from .summation_parallel import _SharedArrays, _share_system_inputs
+
+    n_points = len(grid)
+    range_size = max(1, min(block_size, -(-n_points // (n_workers * 4))))
+
+    # Keine Punkte im Eingabeblock: die Worker erzeugen die Koordinaten selbst
+    inputs, antenna_args = _share_system_inputs(
+        np.zeros((0, 3)), 0.0, antenna_system, patterns,
+        tilt_envelopes, None, adaptive_envelopes,
+    )
+    try:
+        outputs = _SharedArrays.create({"e_total": ((n_points,), "float32")})
+        try:
+            ranges = [
+                (start, min(start + range_size, n_points))
+                for start in range(0, n_points, range_size)
+            ]
+            volume = VolumeGrid(grid.origin, grid.spacing_m, grid.dimensions, np.zeros(0, dtype=np.float32))
+
+            with mp.Pool(
+                processes=n_workers,
+                initializer=_init_volume_worker,
+                initargs=(
+                    volume,
+                    inputs.shm.name, inputs.layout,
+                    outputs.shm.name, outputs.layout,
+                    *antenna_args,
+                    min(range_size, DEFAULT_CHUNK_SIZE),
+                ),
+            ) as pool:
+                computed = sum(pool.imap_unordered(_volume_range_worker, ranges))
+
+            if computed != n_points:
+                raise RuntimeError(
+                    f"Parallele Volumenberechnung unvollständig: {computed}/{n_points} Punkte"
+                )
+
+            # Flache Sicht in VTK-Reihenfolge (E am schnellsten) auf das Ergebnis
+            grid.e_field.reshape(-1, order="F")[...] = outputs.arrays["e_total"]
+        finally:
+            outputs.release(unlink=True)
+    finally:
+        inputs.release(unlink=True)
+
+
+def _init_volume_worker(volume: VolumeGrid, *worker_args) -> None:
+    """Pool-Initializer: wie summation_parallel._init_worker(), plus Gittergeometrie."""
+    from .summation_parallel import _init_worker, _worker_state
+
+    _init_worker(*worker_args)
+    _worker_state["volume"] = volume
+
+
+def _volume_range_worker(index_range: Tuple[int, int]) -> int:
+    """
+    Berechnet die Gesamtfeldstärke der Gitterpunkte [start, stop).
+
+    Returns:
+        Anzahl berechneter Punkte
+    """
+    from .summation_parallel import _fill_chunk_columns, _worker_state
+
+    start, stop = index_range
+    volume = _worker_state["volume"]
+    e_total = _worker_state["outputs"].arrays["e_total"]
+    chunk_size = _worker_state["chunk_size"]
+    n_antennas = len(_worker_state["antennas"])
+
+    for chunk_start in range(start, stop, chunk_size):
+        chunk_stop = min(chunk_start + chunk_size, stop)
+        chunk = volume.points_for_range(chunk_start, chunk_stop)
+
+        e_contrib = np.zeros((len(chunk), n_antennas))
+        _fill_chunk_columns(chunk, 0.0, {"e_contrib": e_contrib})
+
+        # Leistungsaddition: E_total = sqrt(Σ E_i²)
+        e_total[chunk_start:chunk_stop] = np.sqrt(np.sum(e_contrib**2, axis=1))
+
+    return stop - start
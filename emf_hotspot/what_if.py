@@ -0,0 +1,204 @@
+"""
+ERP-Szenarien ("what-if") auf Basis einer bestehenden Analyse.
+
+Liest den Feldcache (feldcache.npz) einer Analyse, setzt geänderte
+ERP-Werte pro Antenne ein (einzeln per --erp oder aus einem revidierten
+StDB/OMEN-XLS) und exportiert Gesamtfeld, Hotspots und die CSV/GeoJSON-
+Ausgaben neu - ohne Gebäude zu laden oder Fassaden abzutasten.
+
+Beispiel:
+    python -m emf_hotspot what-if output/Musterstrasse_1 --erp 1=800 --erp 3=1200
+    python -m emf_hotspot what-if output/Musterstrasse_1 --omen stdb_revidiert.xls
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .models import ResultTable
+from .loaders.omen_loader import load_omen_data
+from .physics.field_cache import FIELD_CACHE_FILENAME, FieldCache
+from .utils import error_and_exit
+from .output.csv_export import export_hotspots_csv, export_summary_csv
+from .output.visualization import (
+    export_to_geojson,
+    export_hotspots_for_geoadmin,
+    export_hotspots_kml,
+)
+
+
+def run_what_if(
+    analysis_dir: Path,
+    erp_watts: Optional[Dict[int, float]] = None,
+    omen_file: Optional[Path] = None,
+    output_dir: Optional[Path] = None,
+    threshold_vm: Optional[float] = None,
+) -> ResultTable:
+    """
+    Berechnet ein ERP-Szenario aus dem Feldcache einer Analyse.
+
+    Args:
+        analysis_dir: Ausgabeverzeichnis der Analyse (mit feldcache.npz)
+        erp_watts: antenna.id -> neue ERP [W] (hat Vorrang vor omen_file)
+        omen_file: Revidiertes OMEN-XLS (gleiche Antennen, nur ERP geändert)
+        output_dir: Zielverzeichnis (default: <analysis_dir>/what-if)
+        threshold_vm: Schwellwert (None = Schwellwert der Analyse)
+
+    Returns:
+        ResultTable des Szenarios
+    """
+    analysis_dir = Path(analysis_dir)
+    cache_file = analysis_dir / FIELD_CACHE_FILENAME
+    if not cache_file.exists():
+        error_and_exit(
+            f"Kein Feldcache gefunden: {cache_file}\n"
+            f"Bitte zuerst eine vollständige Analyse für diesen Standort ausführen."
+        )
+
+    print("=" * 60)
+    print("EMF-Hotspot-Finder: ERP-Szenario")
+    print("=" * 60)
+
+    cache = FieldCache.load(cache_file)
+    print(f"  Feldcache: {cache_file} ({len(cache)} Punkte, {len(cache.antenna_ids)} Antennen)")
+
+    # Antennensystem (für Antennen-Features der geo.admin-Exporte)
+    system_file = Path(omen_file) if omen_file else Path(cache.omen_file)
+    if not system_file.exists():
+        error_and_exit(f"OMEN-Datei nicht gefunden: {system_file}")
+    antenna_system = load_omen_data(system_file)
+
+    changes = cache.geometry_changes(antenna_system)
+    if changes:
+        error_and_exit(
+            "Das Antennensystem unterscheidet sich nicht nur in der ERP:\n  "
+            + "\n  ".join(changes)
+            + "\nBitte eine vollständige Analyse ausführen."
+        )
+
+    scenario = {ant.id: ant.erp_watts for ant in antenna_system.antennas}
+    scenario.update(erp_watts or {})
+
+    unknown = sorted(set(scenario) - set(cache.antenna_ids.tolist()))
+    if unknown:
+        error_and_exit(f"Unbekannte Antennen-IDs: {unknown}")
+
+    for ant in antenna_system.antennas:
+        ant.erp_watts = max(float(scenario[ant.id]), 0.0)
+
+    # ERP-Vergleich
+    old_erp = cache.erp_watts
+    new_erp = cache.scenario_erp(scenario)
+    print(f"\n  {'Antenne':>8}  {'ERP alt [W]':>12}  {'ERP neu [W]':>12}")
+    for ant_id, old, new in zip(cache.antenna_ids.tolist(), old_erp.tolist(), new_erp.tolist()):
+        marker = "  ←" if abs(new - old) > 1e-9 else ""
+        print(f"  {ant_id:>8}  {old:>12.1f}  {new:>12.1f}{marker}")
+
+    baseline = cache.results_for_erp(threshold_vm=threshold_vm)
+    results = cache.results_for_erp(scenario, threshold_vm=threshold_vm)
+    hotspots = results[results.exceeds_limit]
+
+    print(f"\n  Hotspots (E >= {results.threshold_vm} V/m): "
+          f"{int(baseline.exceeds_limit.sum())} → {len(hotspots)}")
+    if results:
+        print(f"  Maximale Feldstärke: {float(baseline.e_total.max()):.2f} → "
+              f"{float(results.e_total.max()):.2f} V/m")
+
+    unchecked = int(cache.unchecked_candidates(results).sum())
+    if unchecked:
+        print(f"  WARNUNG: {unchecked} Punkte liegen neu über dem Schwellwert und wurden "
+              f"nicht auf LOS geprüft (ungedämpft, konservativ).")
+        print("           Für exakte Gebäudedämpfung die Analyse mit der neuen ERP wiederholen.")
+
+    # Exporte
+    output_dir = Path(output_dir) if output_dir else analysis_dir / "what-if"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    print(f"\n  Exportiere Szenario nach: {output_dir}")
+
+    export_hotspots_csv(results, output_dir / "alle_punkte.csv", include_contributions=True)
+    export_hotspots_csv(hotspots, output_dir / "hotspots.csv", include_contributions=True)
+    export_summary_csv(results, output_dir / "zusammenfassung.csv")
+    export_to_geojson(results, output_dir / "ergebnisse.geojson")
+    export_hotspots_for_geoadmin(
+        results,
+        antenna_system,
+        output_dir / "hotspots_geoadmin.geojson",
+        threshold_vm=results.threshold_vm,
+    )
+    export_hotspots_kml(
+        results,
+        antenna_system,
+        output_dir / "hotspots_geoadmin.kml",
+        threshold_vm=results.threshold_vm,
+    )
+
+    print("\n" + "=" * 60)
+    print("Szenario abgeschlossen!")
+    print("=" * 60)
+
+    return results
+
+
+def _parse_erp_overrides(values: List[str]) -> Dict[int, float]:
+    """Parst ["1=800", "3=1200"] zu {1: 800.0, 3: 1200.0}"""
+    overrides = {}
+    for value in values or []:
+        try:
+            ant_id, erp = value.split("=", 1)
+            overrides[int(ant_id)] = float(erp)
+        except ValueError:
+            error_and_exit(f"Ungültige ERP-Angabe '{value}' (erwartet: ANTENNE=WATT, z.B. 1=800)")
+    return overrides
+
+
+def main(argv: Optional[List[str]] = None):
+    """CLI-Einstiegspunkt für 'what-if'."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="emf_hotspot what-if",
+        description="ERP-Szenario: Hotspots für geänderte ERP-Werte aus dem Feldcache einer Analyse",
+    )
+    parser.add_argument(
+        "analysis_dir",
+        type=Path,
+        help=f"Ausgabeverzeichnis einer Analyse (enthält {FIELD_CACHE_FILENAME})",
+    )
+    parser.add_argument(
+        "--erp",
+        action="append",
+        default=[],
+        metavar="ANTENNE=WATT",
+        help="Neue ERP für eine Antenne, z.B. --erp 1=800 (mehrfach möglich)",
+    )
+    parser.add_argument(
+        "--omen",
+        type=Path,
+        default=None,
+        help="Revidiertes OMEN-XLS (gleiche Antennengeometrie, ERP-Werte werden übernommen)",
+    )
+    parser.add_argument(
+        "-o", "--output-dir",
+        type=Path,
+        default=None,
+        help="Zielverzeichnis (default: <analysis_dir>/what-if)",
+    )
+    parser.add_argument(
+        "-t", "--threshold",
+        type=float,
+        default=None,
+        help="Schwellwert für Hotspots in V/m (default: wie Analyse)",
+    )
+
+    args = parser.parse_args(argv)
+
+    run_what_if(
+        analysis_dir=args.analysis_dir,
+        erp_watts=_parse_erp_overrides(args.erp),
+        omen_file=args.omen,
+        output_dir=args.output_dir,
+        threshold_vm=args.threshold,
+    )
+
+
+if __name__ == "__main__":
+    main()